@@ -0,0 +1,143 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import argparse
+import os
+
+import openpyxl
+
+from scheduler.excel.excel_scheduler import load_table, update_table
+from scheduler.project_scheduler_constants import (
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, CONF_ENGINE, CONF_PERIOD, CONF_HORIZON_START, CONF_HORIZON_END, 
+    CONF_MAX_PERIODS, CONF_EFFORT_SCALE
+)
+from scheduler.project_portfolio import PortfolioScheduler
+
+from utils.app_config import AppConfig
+
+from utils.logger import create_logger
+
+logger = create_logger(__name__)
+
+def update_excel_portfolio(file_paths, output_dir = None):
+    """
+    Update the schedules of several Excel files that share resource pools in a single run (see PortfolioScheduler).
+
+    The project name of each file is its name without extension. Each project's Start Dates, End Dates and Used 
+    Resources are written back to its own file.
+
+    Args:
+        file_paths ([str]): Paths to the Excel files containing the schedules to be updated.
+        output_dir (str, optional): Directory of the output Excel files. Defaults to updating the input files.
+
+    Returns:
+        dict: Output path of each project, by name.
+
+    Raises:
+        ValueError: If two files have the same project name.
+    """
+    config = AppConfig()
+
+    names = [os.path.splitext(os.path.basename(file_path))[0] for file_path in file_paths]
+
+    if len(set(names)) < len(names):
+        raise ValueError(f"Portfolio files must have different names: {names}")
+
+    workbooks = {}
+    projects = {}
+
+    # Load every workbook once, as update_excel_schedule does
+    for name, file_path in zip(names, file_paths):
+        wb = openpyxl.load_workbook(file_path, data_only=True)
+        wb_formulas = openpyxl.load_workbook(file_path, data_only=False)
+
+        workbooks[name] = wb_formulas
+        projects[name] = (
+            load_table(wb['Schedule'], 'T_Schedule'),
+            load_table(wb['Available Resources'], 'T_Available_Resources'),
+            load_table(wb_formulas['Used Resources'], 'T_Used_Resources')
+        )
+
+    engine = config[CONF_ENGINE] if CONF_ENGINE in config else ENGINE_PANDAS
+    period = config[CONF_PERIOD] if CONF_PERIOD in config else 5
+
+    portfolio = PortfolioScheduler(projects, engine=engine, period_days_available=period)
+
+    results = portfolio.run(
+        horizon_start=config[CONF_HORIZON_START] if CONF_HORIZON_START in config else None,
+        horizon_end=config[CONF_HORIZON_END] if CONF_HORIZON_END in config else None,
+        max_periods=config[CONF_MAX_PERIODS] if CONF_MAX_PERIODS in config else None,
+        effort_scale=config[CONF_EFFORT_SCALE] if CONF_EFFORT_SCALE in config else None)
+
+    output_paths = {}
+
+    for name, file_path in zip(names, file_paths):
+        tasks_df, used_resources_df = results[name]
+        wb_formulas = workbooks[name]
+
+        update_table(wb_formulas['Schedule'], 'T_Schedule', tasks_df, columns=[TASK_START_DATE, TASK_END_DATE])
+        update_table(wb_formulas['Used Resources'], 'T_Used_Resources', used_resources_df)
+
+        output_paths[name] = os.path.join(output_dir, os.path.basename(file_path)) if output_dir else file_path
+
+        wb_formulas.save(output_paths[name])
+        logger.info(f"Project {name} updated in {output_paths[name]}")
+
+    return output_paths
+
+if __name__ == "__main__":
+    """
+    Update the schedules of several Excel files that share resource pools in a single run.
+
+    Usage:
+    python excel_portfolio.py -i <input_file> [<input_file> ...] [-od <output_dir>] [-p <period>] [-e <engine>] [-hs <date>] [-he <date>] [-mp <periods>] [-fs <scale>]
+
+    Arguments:
+    -i, --input: Paths to the Excel files containing the schedules. The project name is the file name without extension.
+    -od, --outputdir: Directory of the output Excel files. Defaults to updating the input files.
+    -p, --period: Number of useful resource days between dates. Possible values: integer value or 'auto'. Default: 5.
+    -e, --engine: Scheduling engine. Possible values: 'pandas', 'matrix' or 'event'. Default: pandas.
+    -hs, --horizonstart: Planning horizon start. Dates before it are not processed. Default: no limit.
+    -he, --horizonend: Planning horizon end. Dates after it are not processed. Default: no limit.
+    -mp, --maxperiods: Maximum number of dates to process. Default: no limit.
+    -fs, --effortscale: Matrix engines only. Handle effort as integer units of 1/scale person-day (e.g. 1000). Default: floats.
+
+    Example:
+
+        python excel_portfolio.py -i alpha.xlsx beta.xlsx -od updated -e matrix
+
+    """
+    parser = argparse.ArgumentParser(description="Update the schedules of several Excel files that share resource pools in a single run.")
+    parser.add_argument('-i', '--input', nargs='+', help="Paths to the Excel files containing the schedules.")
+    parser.add_argument('-od', '--outputdir', default=None, help="Directory of the output Excel files. Defaults to updating the input files.")
+    parser.add_argument('-p', '--period', default=5, help="Number of useful resource days between dates. Possible values: integer value or 'auto'. Default: 5.")
+    parser.add_argument('-e', '--engine', default=ENGINE_PANDAS, help="Scheduling engine. Possible values: 'pandas', 'matrix' or 'event'. Default: pandas.")
+    parser.add_argument('-hs', '--horizonstart', default=None, help="Planning horizon start. Dates before it are not processed. Default: no limit.")
+    parser.add_argument('-he', '--horizonend', default=None, help="Planning horizon end. Dates after it are not processed. Default: no limit.")
+    parser.add_argument('-mp', '--maxperiods', default=None, type=int, help="Maximum number of dates to process. Default: no limit.")
+    parser.add_argument('-fs', '--effortscale', default=None, type=int, help="Matrix engines only. Handle effort as integer units of 1/scale person-day (e.g. 1000). Default: floats.")
+
+    args = parser.parse_args()
+    config = AppConfig()
+
+    config.load_args(args)
+
+    update_excel_portfolio(config["input"], config["outputdir"])
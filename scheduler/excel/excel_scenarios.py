@@ -0,0 +1,117 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+
+import openpyxl
+
+from scheduler.excel.excel_scheduler import load_table
+from scheduler.project_scheduler_constants import ENGINE_PANDAS, CONF_ENGINE, CONF_PERIOD, CONF_SCENARIOS, CONF_WORKERS
+from scheduler.project_scenario_runner import ScenarioRunner
+
+from utils.app_config import AppConfig
+from utils.json_utils import load_json_value
+
+from utils.logger import create_logger
+
+logger = create_logger(__name__)
+
+def load_scenarios(scenarios):
+    """
+    Load a list of scenarios.
+
+    Args:
+        scenarios (list, str): List of scenarios, list in JSON format or path to a JSON file with the list.
+
+    Returns:
+        list of dict: The scenarios (see ScenarioRunner).
+    """
+    return load_json_value(scenarios)
+
+def run_excel_scenarios(file_path, scenarios, output_path, workers = None):
+    """
+    Run what-if scenarios over the schedule of an Excel file, parsed once, and save the End Dates comparison table.
+
+    Args:
+        file_path (str): Path to the Excel file containing the schedule.
+        scenarios (list, str): List of scenarios, list in JSON format or path to a JSON file with the list.
+        output_path (str): Path to the output Excel file with the comparison table.
+        workers (int, optional): Number of worker processes. Default: scenarios run in the current process.
+
+    Returns:
+        pd.DataFrame: The comparison table (see ScenarioRunner.run).
+    """
+    config = AppConfig()
+
+    # Load the workbook once, as update_excel_schedule does
+    wb = openpyxl.load_workbook(file_path, data_only=True)
+    wb_formulas = openpyxl.load_workbook(file_path, data_only=False)
+
+    tasks_df = load_table(wb['Schedule'], 'T_Schedule')
+    available_resources_df = load_table(wb['Available Resources'], 'T_Available_Resources')
+    used_resources_df = load_table(wb_formulas['Used Resources'], 'T_Used_Resources')
+
+    engine = config[CONF_ENGINE] if CONF_ENGINE in config else ENGINE_PANDAS
+    period = config[CONF_PERIOD] if CONF_PERIOD in config else 5
+
+    runner = ScenarioRunner(tasks_df, available_resources_df, used_resources_df, engine=engine, period_days_available=period)
+    comparison = runner.run(load_scenarios(scenarios), workers=workers)
+
+    comparison.to_excel(output_path, index=False)
+    logger.info(f"Scenario comparison saved to {output_path}")
+
+    return comparison
+
+if __name__ == "__main__":
+    """
+    Compare the End Dates of what-if scenarios of the schedule in an Excel file.
+
+    Usage:
+    python excel_scenarios.py -i <input_file> -s <scenarios> -o <output_file> [-w <workers>] [-p <period>] [-e <engine>]
+
+    Arguments:
+    -i, --input: Path to the Excel file containing the schedule.
+    -s, --scenarios: List of scenarios in JSON format or path to a JSON file with the list (see ScenarioRunner).
+    -o, --output: Path to the output Excel file with the End Dates of each scenario.
+    -w, --workers: Number of worker processes. Default: scenarios run in the current process.
+    -p, --period: Number of useful resource days between dates. Possible values: integer value or 'auto'. Default: 5.
+    -e, --engine: Scheduling engine. Possible values: 'pandas', 'matrix' or 'event'. Default: pandas.
+
+    Example:
+
+        python excel_scenarios.py -i schedule.xlsx -s scenarios.json -o scenarios.xlsx -w 4
+
+    """
+    parser = argparse.ArgumentParser(description="Compare the End Dates of what-if scenarios of the schedule in an Excel file.")
+    parser.add_argument('-i', '--input', help="Path to the Excel file containing the schedule.")
+    parser.add_argument('-s', '--scenarios', help="List of scenarios in JSON format or path to a JSON file with the list.")
+    parser.add_argument('-o', '--output', help="Path to the output Excel file with the End Dates of each scenario.")
+    parser.add_argument('-w', '--workers', default=None, type=int, help="Number of worker processes. Default: scenarios run in the current process.")
+    parser.add_argument('-p', '--period', default=5, help="Number of useful resource days between dates. Possible values: integer value or 'auto'. Default: 5.")
+    parser.add_argument('-e', '--engine', default=ENGINE_PANDAS, help="Scheduling engine. Possible values: 'pandas', 'matrix' or 'event'. Default: pandas.")
+
+    args = parser.parse_args()
+    config = AppConfig()
+
+    config.load_args(args)
+
+    run_excel_scenarios(config["input"], config[CONF_SCENARIOS], config["output"], workers=config[CONF_WORKERS])
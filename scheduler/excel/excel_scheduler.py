@@ -21,6 +21,7 @@
 # SOFTWARE.
 
 import argparse
+import os
 import pandas as pd
 import openpyxl
 from copy import copy
@@ -28,9 +29,14 @@ from copy import copy
 from openpyxl.utils import range_boundaries
 from openpyxl.utils import get_column_letter
 
-from scheduler.project_scheduler_constants import TASK_END_DATE, TASK_GOAL, TASK_START_DATE, USED_RESOURCE_GOAL
+from scheduler.project_scheduler_constants import TASK_END_DATE, TASK_GOAL, TASK_START_DATE, USED_RESOURCE_GOAL, CONF_ENGINE, ENGINE_PANDAS, CONF_HORIZON_START, CONF_HORIZON_END, CONF_MAX_PERIODS, CONF_EFFORT_SCALE, \
+    CONF_RESOLUTION_CUTOFF, CONF_COARSE_RESOLUTION, RESOLUTION_MONTH, CONF_PERIOD, CONF_WORKERS, CONF_STATE, CONF_CHECKPOINT, \
+    CONF_TIME_BUDGET, CONF_HOLIDAYS
 from scheduler.project_resource_manager import ProjectResourceManager
 from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_schedule_state import ScheduleState
+from scheduler.project_schedule_options import ScheduleOptions
+from scheduler.project_core import load_holidays
 
 from utils.app_config import AppConfig
 from utils.date_utils import safe_to_datetime
@@ -177,7 +183,8 @@ def update_excel_schedule(file_path, output_path):
 
         # Initialize the ResourceManager and TaskManager
         resource_manager = ProjectResourceManager(available_resources_df, used_resources_df, tasks_df)
-        task_manager = TaskManager(tasks_df, resource_manager)
+        period = config[CONF_PERIOD] if CONF_PERIOD in config else 5
+        task_manager = TaskManager(tasks_df, resource_manager, period_days_available=period)
 
         # Define the dates you want to update the schedule for
         dates = [
@@ -185,7 +192,32 @@ def update_excel_schedule(file_path, output_path):
         ]
 
         # Update the task schedule
-        updated_tasks_df = task_manager.update_task_schedule(dates)
+        engine = config[CONF_ENGINE] if CONF_ENGINE in config else ENGINE_PANDAS
+        horizon_start = config[CONF_HORIZON_START] if CONF_HORIZON_START in config else None
+        horizon_end = config[CONF_HORIZON_END] if CONF_HORIZON_END in config else None
+        max_periods = config[CONF_MAX_PERIODS] if CONF_MAX_PERIODS in config else None
+        effort_scale = config[CONF_EFFORT_SCALE] if CONF_EFFORT_SCALE in config else None
+        resolution_cutoff = config[CONF_RESOLUTION_CUTOFF] if CONF_RESOLUTION_CUTOFF in config else None
+        coarse_resolution = config[CONF_COARSE_RESOLUTION] if CONF_COARSE_RESOLUTION in config else RESOLUTION_MONTH
+        workers = config[CONF_WORKERS] if CONF_WORKERS in config else None
+        state_path = config[CONF_STATE] if CONF_STATE in config else None
+        checkpoint_path = config[CONF_CHECKPOINT] if CONF_CHECKPOINT in config else None
+        time_budget = config[CONF_TIME_BUDGET] if CONF_TIME_BUDGET in config else None
+
+        # Previous run state for incremental re-scheduling
+        previous_state = None
+        if state_path:
+            previous_state = ScheduleState.load(state_path) if os.path.exists(state_path) else ScheduleState()
+
+        options = ScheduleOptions(
+            engine=engine, horizon_start=horizon_start, horizon_end=horizon_end, max_periods=max_periods, 
+            effort_scale=effort_scale, resolution_cutoff=resolution_cutoff, coarse_resolution=coarse_resolution, workers=workers,
+            previous_state=previous_state, checkpoint_path=checkpoint_path, time_budget=time_budget)
+
+        updated_tasks_df = task_manager.update_task_schedule(dates, options)
+
+        if state_path:
+            task_manager.schedule_state.save(state_path)
 
         # Update the 'T_Schedule' with updated tasks DataFrame
         update_table(tasks_sheet_final, 'T_Schedule', updated_tasks_df, columns=[TASK_START_DATE, TASK_END_DATE])
@@ -205,15 +237,30 @@ if __name__ == "__main__":
     Update the schedule in an Excel file.
 
     Usage:
-    python excel_scheduler.py -i <input_file> -o <output_file> [-p <period>] [-v <holidays>] [-d] [-c <conffile>]
+    python excel_scheduler.py -i <input_file> -o <output_file> [-p <period>] [-v <holidays>] [-d] [-c <conffile>] [-e <engine>] [-hs <date>] [-he <date>] [-mp <periods>] [-fs <scale>] [-rc <date>] [-cr <resolution>] [-w <workers>] [-st <state_file>] [-ck <checkpoint_file>] [-tb <seconds>]
 
     Arguments:
     -i, --input: Path to the Excel file containing the schedule to be updated.
     -o, --output: Path to the output Excel file. Defaults to the same as the input if not specified.
-    -p, --period: Number of useful resource days between dates. Possible values: integer value or 'auto'. Default: 5.
+    -p, --period: Number of useful resource days between dates. Possible values: integer value or 'auto' (working days 
+        between each date and the next one, excluding weekends and holidays). Default: 5.
     -v, --holidays: List of bank holidays in JSON format or path to a JSON file with the list. Default: Empty list.
     -d, --dayfirst: Set if the dates in the Excel file are in 'DD/MM/YYYY' format. Default is True.
     -c, --conffile: Provide a file with arguments coming from a json file as a dictionary.
+    -e, --engine: Scheduling engine. Possible values: 'pandas', 'matrix' or 'event' (matrix engine skipping dates where nothing can be allocated). Default: pandas.
+    -hs, --horizonstart: Planning horizon start. Dates before it are not processed. Default: no limit.
+    -he, --horizonend: Planning horizon end. Dates after it are not processed. Default: no limit.
+    -mp, --maxperiods: Maximum number of dates to process. Default: no limit.
+    -fs, --effortscale: Matrix engines only. Handle effort as integer units of 1/scale person-day (e.g. 1000). Default: floats.
+    -rc, --resolutioncutoff: Matrix engines only. Dates after it are merged into monthly (or quarterly) periods. Default: no merge.
+    -cr, --coarseresolution: Resolution of the merged periods. Possible values: 'month' or 'quarter'. Default: month.
+    -w, --workers: Matrix engines only. Schedule independent partitions of the tasks on this number of processes. Default: no partitions.
+    -st, --state: Matrix engines only. JSON file with the state of the previous run. Only the tasks affected by the changes 
+        since that run are re-planned, and the file is updated. Default: full run.
+    -ck, --checkpoint: Matrix engines only. Checkpoint file (.npz) saved during the run. An interrupted run is resumed 
+        from it. Default: no checkpoints.
+    -tb, --timebudget: Matrix engines only. Maximum seconds of the allocation loop. The dates not processed within it are 
+        estimated with a capacity burn-down, and the estimated tasks logged. Default: no limit.
 
     
     Example:
@@ -234,6 +281,17 @@ if __name__ == "__main__":
     parser.add_argument('-v', '--holidays', default=[], help="List of bank holidays in JSON format or path to a JSON file with the list. Default: Empty list.")     
     parser.add_argument('-d', '--dayfirst', default=True, action='store_true', help="Set if the dates in the Excel file are in 'DD/MM/YYYY' format. Default is True.")
     parser.add_argument('-c', '--conffile', default="", action='store_true', help="Provide a file with arguments coming from a json file as a dictionary.")
+    parser.add_argument('-e', '--engine', default=ENGINE_PANDAS, help="Scheduling engine. Possible values: 'pandas', 'matrix' or 'event'. Default: pandas.")
+    parser.add_argument('-hs', '--horizonstart', default=None, help="Planning horizon start. Dates before it are not processed. Default: no limit.")
+    parser.add_argument('-he', '--horizonend', default=None, help="Planning horizon end. Dates after it are not processed. Default: no limit.")
+    parser.add_argument('-mp', '--maxperiods', default=None, type=int, help="Maximum number of dates to process. Default: no limit.")
+    parser.add_argument('-fs', '--effortscale', default=None, type=int, help="Matrix engines only. Handle effort as integer units of 1/scale person-day (e.g. 1000). Default: floats.")
+    parser.add_argument('-rc', '--resolutioncutoff', default=None, help="Matrix engines only. Dates after it are merged into monthly (or quarterly) periods. Default: no merge.")
+    parser.add_argument('-cr', '--coarseresolution', default=RESOLUTION_MONTH, help="Resolution of the merged periods. Possible values: 'month' or 'quarter'. Default: month.")
+    parser.add_argument('-w', '--workers', default=None, type=int, help="Matrix engines only. Schedule independent partitions of the tasks on this number of processes. Default: no partitions.")
+    parser.add_argument('-st', '--state', default=None, help="Matrix engines only. JSON file with the state of the previous run, updated after the run. Only the task partitions with changes are re-planned; tasks sharing a resources row (e.g. a single TOTAL or '*' row) form one partition. Default: full run.")
+    parser.add_argument('-ck', '--checkpoint', default=None, help="Matrix engines only. Checkpoint file (.npz) saved during the run, to resume an interrupted run. Default: no checkpoints.")
+    parser.add_argument('-tb', '--timebudget', default=None, type=float, help="Matrix engines only. Maximum seconds of the allocation loop; the dates after it are estimated. Default: no limit.")
     parser.add_argument('-l', '--log', default="INFO", help="Set the logging level. Default is INFO.")
     parser.add_argument('-ic', '--infocolumn', default=f"=INDEX(T_Schedule[{{infocolumn}}], MATCH([{TASK_GOAL}], T_Schedule[{TASK_GOAL}], 0),1)", help="Set the info columns values. Default is INDEX(T_Schedule[{attr}], MATCH([{TASK_GOAL}], T_Schedule[{TASK_GOAL}], 0),1).")
 
@@ -241,6 +299,7 @@ if __name__ == "__main__":
     config = AppConfig()
 
     config.load_args(args)
+    config[CONF_HOLIDAYS] = load_holidays(config[CONF_HOLIDAYS])
 
     logger.info(f"Starting the update process for {config["input"]}")
     update_excel_schedule(config["input"], config["output"])
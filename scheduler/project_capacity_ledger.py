@@ -0,0 +1,246 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+
+from scheduler.project_scheduler_constants import USED_RESOURCE_GOAL, ACCUMULATED_SYNONYMS, ALL_TAG
+from scheduler.project_used_resource_manager import match_pattern
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+class CapacityNode:
+    """
+    Node of the capacity ledger: a responsibility path (one value per responsibility column, then the Goal).
+
+    Attributes:
+        children (dict): Child nodes by the value of the next column. Wildcards ('*', 'TOTAL') are stored as '*'.
+        patterns (dict): Original value of each child (a regexp or a wildcard), used to match update filters.
+        matches (dict): Children matched by each update filter value, calculated the first time the value is used.
+        available (np.ndarray): Available resources of each date (minimum of the available rows of the path), or None.
+        used (np.ndarray): Used resources (used rows of the path x dates).
+        row (int): Row of the node in the remaining resources matrix if it has available resources, else None.
+    """
+
+    __slots__ = ("children", "patterns", "matches", "available", "used", "row")
+
+    def __init__(self, date_count):
+        self.children = {}
+        self.patterns = {}
+        self.matches = {}
+        self.available = None
+        self.used = np.zeros((0, date_count))
+        self.row = None
+
+class CapacityLedger:
+    """
+    Available and used resources stored as a trie keyed by the responsibility path (responsibility columns in the
+    available resources order, then the Goal), with the same semantics as ProjectResourceManager.goal_resources_mask
+    and ProjectUsedResourceManager.update_used_resources:
+
+    - remaining: an available row constrains a responsibility when each of its values is a wildcard or equal to the 
+      responsibility value. Its remaining resources are its available resources minus the used resources rows with
+      the same path.
+    - update: a usage is added to the used rows whose values are wildcards, equal values or regexp matching the usage.
+
+    Both walk the trie from the root, following only the matching children of each level, instead of masking the whole
+    DataFrames. The remaining resources (available minus used) of the paths with available resources are kept in a 
+    matrix, and the rows constraining each responsibility are calculated once: a query is a minimum over those rows, and 
+    an update recalculates the cells of the paths it reaches.
+
+    The used resources DataFrame is still updated by ProjectUsedResourceManager: the ledger keeps the same values and is
+    rebuilt by ProjectResourceManager when they are changed by other means (see ProjectResourceManager.capacity_ledger).
+
+    Attributes:
+        levels (list of str): Columns of the path: responsibility columns, then the Goal.
+        dates (dict): Position of each date column.
+        root (CapacityNode): Root of the trie.
+        remaining_matrix (np.ndarray): Remaining resources (paths with available resources x dates).
+        constraining_rows (dict): Rows of remaining_matrix constraining each responsibility (responsibility values tuple -> rows).
+        source (tuple): State of the resources the ledger is synchronized with (see ProjectResourceManager.capacity_ledger).
+    """
+
+    def __init__(self, available_resources_df, used_info_df, used_values, responsible_attr_names, dates):
+        """
+        Builds the trie from the available and used resources.
+
+        Args:
+            available_resources_df (pd.DataFrame): Available resources.
+            used_info_df (pd.DataFrame): Columns of the used resources that are not dates (see ProjectUsedResourceManager.info_df).
+            used_values (np.ndarray): Used resources of each date (used resources rows x dates).
+            responsible_attr_names (list of str): Responsibility columns.
+            dates (list of str): Date columns.
+        """
+        self.levels = list(responsible_attr_names) + [USED_RESOURCE_GOAL]
+        self.dates = {date: position for position, date in enumerate(dates)}
+        self.root = CapacityNode(len(self.dates))
+        self.source = None
+
+        available_values = available_resources_df[list(dates)].to_numpy(dtype=float).reshape(available_resources_df.shape[0], len(dates))
+
+        for path, values in zip(available_resources_df[self.levels].itertuples(index=False), available_values):
+            node = self._node(path)
+            node.available = values.copy() if node.available is None else np.minimum(node.available, values)
+
+        for path, values in zip(used_info_df[self.levels].itertuples(index=False), used_values):
+            node = self._node(path)
+            node.used = np.vstack([node.used, values])
+
+        available_nodes = []
+        self._collect_available_nodes(self.root, available_nodes)
+
+        for row, node in enumerate(available_nodes):
+            node.row = row
+
+        self.remaining_matrix = np.array([node.available - node.used.sum(axis=0) for node in available_nodes]).reshape(len(available_nodes), len(dates))
+        self.constraining_rows = {}
+
+        logger.debug(f"Capacity ledger built: {available_resources_df.shape[0]} available and {used_info_df.shape[0]} used rows.")
+
+    @staticmethod
+    def path_key(value):
+        """
+        Key of a responsibility value in the trie: wildcards are stored as '*'.
+
+        Args:
+            value: Responsibility value.
+
+        Returns:
+            The key of the value.
+        """
+        return ALL_TAG if value in ACCUMULATED_SYNONYMS else value
+
+    def _node(self, path):
+        node = self.root
+
+        for value in path:
+            key = CapacityLedger.path_key(value)
+
+            if key not in node.children:
+                node.children[key] = CapacityNode(len(self.dates))
+                node.patterns[key] = value
+                node.matches = {}
+
+            node = node.children[key]
+
+        return node
+
+    def _collect_available_nodes(self, node, available_nodes):
+        if node.available is not None:
+            available_nodes.append(node)
+
+        for child in node.children.values():
+            self._collect_available_nodes(child, available_nodes)
+
+    def remaining(self, current_date, **filters):
+        """
+        Calculates the resources available for a responsibility and date, as ProjectResourceManager.obtain_goal_resources.
+
+        Args:
+            current_date (str): The date column.
+            **filters (dict): Responsibility values. All the responsibility columns are required.
+
+        Returns:
+            float: The minimum remaining resources of the available rows constraining the responsibility (0 if none).
+        """
+        position = self.dates[current_date]
+        rows = self.responsibility_rows(**filters)
+
+        if rows.size == 0:
+            return 0
+
+        return max(self.remaining_matrix[rows, position].min(), 0)
+
+    def responsibility_rows(self, **filters):
+        """
+        Obtains the rows of remaining_matrix constraining a responsibility, calculating them the first time it is used.
+
+        Args:
+            **filters (dict): Responsibility values. All the responsibility columns are required.
+
+        Returns:
+            np.ndarray: Rows of the available resources paths constraining the responsibility.
+        """
+        key = tuple(filters[level] for level in self.levels[:-1])
+
+        try:
+            hash(key)
+        except TypeError:
+            return self._responsibility_rows(key)
+
+        if key not in self.constraining_rows:
+            self.constraining_rows[key] = self._responsibility_rows(key)
+
+        return self.constraining_rows[key]
+
+    def _responsibility_rows(self, key):
+        nodes = [self.root]
+
+        # The Goal of the available rows is not a filter: every Goal of the matched paths constrains the responsibility
+        for value in key:
+            keys = {ALL_TAG}
+
+            # Missing values never match a row
+            if value == value:
+                keys.add(CapacityLedger.path_key(value))
+
+            nodes = [node.children[child_key] for node in nodes for child_key in keys if child_key in node.children]
+
+        return np.array([goal_node.row for node in nodes for goal_node in node.children.values() if goal_node.row is not None], dtype=int)
+
+    def update(self, current_date, resources_used, **filters):
+        """
+        Adds a usage to the used rows matching the filters, as ProjectUsedResourceManager.update_used_resources.
+
+        Args:
+            current_date (str): The date column.
+            resources_used (float): Resources to add.
+            **filters (dict): Responsibility values and Goal of the usage. Missing columns match any row value.
+        """
+        position = self.dates[current_date]
+        nodes = [self.root]
+
+        for level in self.levels:
+            if level not in filters:
+                nodes = [child for node in nodes for child in node.children.values()]
+                continue
+
+            value = filters[level]
+            nodes = [child for node in nodes for child in self._matching_children(node, value)]
+
+        for node in nodes:
+            node.used[:, position] += resources_used
+
+            if node.row is not None:
+                self.remaining_matrix[node.row, position] = node.available[position] - node.used[:, position].sum()
+
+    def _matching_children(self, node, value):
+        try:
+            value_key = (type(value), value)
+            hash(value_key)
+        except TypeError:
+            return [node.children[key] for key, pattern in node.patterns.items() if match_pattern(pattern, value)]
+
+        if value_key not in node.matches:
+            node.matches[value_key] = [node.children[key] for key, pattern in node.patterns.items() if match_pattern(pattern, value)]
+
+        return node.matches[value_key]
@@ -0,0 +1,93 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+DEFAULT_CHECKPOINT_INTERVAL = 10
+
+def save_checkpoint(path, fingerprint, state, next_position, processed):
+    """
+    Save a checkpoint of a matrix engine run as a compressed NumPy file.
+
+    The file is written to a temporary file first and then renamed, so a crash while saving keeps the previous checkpoint.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        fingerprint (str): Fingerprint of the run inputs (see partition_fingerprint).
+        state (dict): State of the engine (see MatrixScheduleEngine.checkpoint_state).
+        next_position (int): Date position to resume from.
+        processed (list of int): Column indexes of the dates processed so far.
+    """
+    temporary_path = f"{path}.tmp"
+
+    with open(temporary_path, 'wb') as file:
+        np.savez_compressed(
+            file, fingerprint=np.array(fingerprint), next_position=np.array(next_position, dtype=np.int64),
+            processed=np.array(processed, dtype=np.int64), **state)
+
+    os.replace(temporary_path, path)
+
+    logger.debug(f"Checkpoint saved to {path}: next date position {next_position}")
+
+def load_checkpoint(path, fingerprint):
+    """
+    Load the checkpoint of a run, if it exists and was saved by a run with the same inputs.
+
+    Args:
+        path (str): Path of the checkpoint file.
+        fingerprint (str): Fingerprint of the run inputs.
+
+    Returns:
+        dict: State of the engine, with next_position (int) and processed (list of int), or None if there is no valid 
+            checkpoint.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        checkpoint = {name: data[name] for name in data.files}
+
+    if str(checkpoint.pop("fingerprint")) != fingerprint:
+        logger.warning(f"Checkpoint {path} was saved with different inputs. Starting from the beginning.")
+        return None
+
+    checkpoint["next_position"] = int(checkpoint["next_position"])
+    checkpoint["processed"] = checkpoint["processed"].tolist()
+
+    logger.info(f"Resuming from checkpoint {path}: date position {checkpoint['next_position']}")
+
+    return checkpoint
+
+def remove_checkpoint(path):
+    """
+    Remove the checkpoint of a finished run.
+
+    Args:
+        path (str): Path of the checkpoint file.
+    """
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,711 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import datetime
+import json
+import math
+import re
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST, CONF_HOLIDAYS
+from utils.json_utils import load_json_value
+
+from scheduler.project_scheduler_constants import (
+    ACCUMULATED_SYNONYMS, ALL_TAG, USED_RESOURCE_NA, CONF_PERIOD_AUTO, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+from scheduler.project_task_dependencies import TaskDependencyGraph
+from scheduler.project_fixed_point import to_fixed_point, from_fixed_point, resource_scale, resource_days_multiple, check_effort_scale
+
+DATE_FORMAT = '%d/%m/%Y'
+
+def parse_date(value, dayfirst = None):
+    """
+    Parse a date without pandas.
+
+    Accepted values are date and datetime objects, and strings in day/month/year (month/day/year if dayfirst is False) 
+    or ISO year-month-day format, with '/' or '-' separators and an optional time.
+
+    Args:
+        value: The value to parse.
+        dayfirst (bool, optional): Parse dates with the day first. Default: the dayfirst setting (True if not set).
+
+    Returns:
+        datetime.datetime: The date, or None if the value is not a valid date.
+    """
+    if isinstance(value, datetime.datetime):
+        return value
+
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+
+    if not isinstance(value, str):
+        return None
+
+    if dayfirst is None:
+        dayfirst = AppConfig()[CONF_DAYFIRST] if CONF_DAYFIRST in AppConfig() else True
+
+    day_formats = ['%d/%m/%Y', '%d-%m-%Y'] if dayfirst else ['%m/%d/%Y', '%m-%d-%Y']
+
+    for date_format in day_formats + ['%Y-%m-%d', '%Y/%m/%d']:
+        for time_format in ['', ' %H:%M:%S', 'T%H:%M:%S']:
+            try:
+                return datetime.datetime.strptime(value.strip(), date_format + time_format)
+            except ValueError:
+                continue
+
+    return None
+
+def load_holidays(holidays):
+    """
+    Load a list of bank holidays.
+
+    Args:
+        holidays (list, str): List of dates (date objects or strings), list in JSON format or path to a JSON file with the list.
+
+    Returns:
+        list of datetime.date: The holidays.
+
+    Raises:
+        ValueError: If the value is not a list or any entry is not a valid date.
+    """
+    holidays = load_json_value(holidays)
+
+    if holidays is None:
+        return []
+
+    if not isinstance(holidays, (list, tuple)):
+        raise ValueError(f"Holidays must be a list of dates: {holidays!r}")
+
+    dates = [parse_date(holiday) for holiday in holidays]
+    invalid = [holiday for holiday, date in zip(holidays, dates) if date is None]
+
+    if invalid:
+        raise ValueError(f"Invalid holiday dates: {invalid}")
+
+    return [date.date() for date in dates]
+
+def configured_holidays():
+    """
+    Bank holidays of the configuration (CONF_HOLIDAYS). The setting is parsed on first use and stored back as dates.
+
+    Returns:
+        list of datetime.date: The holidays.
+
+    Raises:
+        ValueError: If the setting is not a list of valid dates (see load_holidays).
+    """
+    config = AppConfig()
+
+    if CONF_HOLIDAYS not in config:
+        return []
+
+    holidays = config[CONF_HOLIDAYS]
+
+    if isinstance(holidays, list) and all(type(holiday) is datetime.date for holiday in holidays):
+        return holidays
+
+    holidays = load_holidays(holidays)
+    config[CONF_HOLIDAYS] = holidays
+
+    return holidays
+
+def to_number(value, default):
+    """
+    Convert a value to float, as the DataFrame flow does with pd.to_numeric(errors='coerce').
+
+    Args:
+        value: The value to convert.
+        default (float): Value for empty, 'N/A' or non-numeric values.
+
+    Returns:
+        float: The number.
+    """
+    if value is None or isinstance(value, bool):
+        return default
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+
+    return default if math.isnan(number) else number
+
+class TaskRecord:
+    """
+    A task of the schedule.
+
+    Attributes:
+        task_id (str): Task ID.
+        goal (str): Goal of the task (unique in the schedule).
+        priority (float): Priority (lower values first).
+        remaining (float): Remaining work in person-days.
+        resources_max (float): Maximum resources per day (inf if not limited).
+        restriction (str or datetime, optional): ID of the task that must be completed first, or the date from which 
+            the task can start.
+        start_date (optional): Start Date.
+        end_date (optional): End Date.
+        blocked_days (float): Business days added to the End Date.
+        responsibility (dict): Value of each responsibility column.
+        info (dict): Other columns (kept for the DataFrame adapters).
+    """
+
+    __slots__ = ("task_id", "goal", "priority", "remaining", "resources_max", "restriction", "start_date", "end_date", 
+                 "blocked_days", "responsibility", "info")
+
+    def __init__(self, task_id, goal, priority, remaining, responsibility, resources_max = None, restriction = None, 
+                 start_date = None, end_date = None, blocked_days = 0, info = None):
+        self.task_id = task_id
+        self.goal = goal
+        self.priority = priority
+        self.remaining = remaining
+        self.responsibility = responsibility
+        self.resources_max = resources_max
+        self.restriction = restriction
+        self.start_date = start_date
+        self.end_date = end_date
+        self.blocked_days = blocked_days
+        self.info = info if info is not None else {}
+
+    def __repr__(self):
+        return f"TaskRecord({self.task_id!r}, remaining={self.remaining}, start={self.start_date}, end={self.end_date})"
+
+class CapacityRecord:
+    """
+    A row of the available or used resources: resources of a responsibility (and Goal) on each date.
+
+    Attributes:
+        responsibility (dict): Value of each responsibility column (wildcards and regexp allowed, see 
+            ProjectUsedResourceManager).
+        goal (str): Goal ('*' for all the goals, or accumulated used resources).
+        values (dict): Resources of each date (date labels in '%d/%m/%Y' format once loaded by the CoreScheduler).
+        info (dict): Other columns (kept for the DataFrame adapters).
+    """
+
+    __slots__ = ("responsibility", "goal", "values", "info")
+
+    def __init__(self, responsibility, goal, values, info = None):
+        self.responsibility = responsibility
+        self.goal = goal
+        self.values = values
+        self.info = info if info is not None else {}
+
+    def __repr__(self):
+        return f"CapacityRecord({self.responsibility!r}, goal={self.goal!r})"
+
+class CoreScheduler:
+    """
+    Pandas-free scheduler for small and medium schedules, with the same semantics as TaskManager, 
+    ProjectResourceManager and ProjectUsedResourceManager with the matrix engines.
+
+    Tasks and resources are plain records (TaskRecord, CapacityRecord). They are validated and normalized as 
+    TaskManager does (remaining and resources max converted to numbers, End Dates of unfinished tasks removed, tasks 
+    sorted by priority), the used resources rows of the tasks and the accumulated rows are added as 
+    ProjectUsedResourceManagerInitializer does, and the allocation loop runs on the MatrixScheduleEngine. 
+    The results are written back to the records. DataFrame adapters are in project_core_dataframes.
+
+    Attributes:
+        tasks (list of TaskRecord): Tasks, sorted by priority.
+        available (list of CapacityRecord): Available resources rows.
+        used (list of CapacityRecord): Used resources rows, including the rows added for the tasks and accumulated rows.
+        responsible_attr_names ([str]): Responsibility columns.
+        period_days_available (int or str): Number of days to consider for the available resources, or 'auto'.
+        dates ([str]): Date labels of the available resources.
+        schedule_summary (dict): Summary of the last update (see TaskManager._store_schedule_summary).
+    """
+
+    def __init__(self, tasks, available, used, responsible_attr_names = None, period_days_available = 5):
+        """
+        Initialize the scheduler.
+
+        Args:
+            tasks (list of TaskRecord): Tasks of the schedule.
+            available (list of CapacityRecord): Available resources rows.
+            used (list of CapacityRecord): Used resources rows.
+            responsible_attr_names ([str], optional): Responsibility columns. Default: the ones of the first available row.
+            period_days_available (int or str): Number of days to consider for the available resources, or 'auto'. 
+                Default is 5.
+
+        Raises:
+            ValueError: If the period is not valid, the tasks are not valid (see check_tasks), or the available and 
+                used resources do not have the same dates.
+        """
+        if period_days_available != CONF_PERIOD_AUTO:
+            period_days_available = to_number(period_days_available, None)
+
+            if period_days_available is None or not period_days_available > 0:
+                raise ValueError(f"Invalid period: {period_days_available}. Possible values: number of days or '{CONF_PERIOD_AUTO}'")
+
+        if responsible_attr_names is None:
+            responsible_attr_names = list(available[0].responsibility) if available else []
+
+        self.responsible_attr_names = list(responsible_attr_names)
+        self.period_days_available = period_days_available
+        self.schedule_summary = None
+
+        for record in list(available) + list(used):
+            record.values = {self._date_label(date): value for date, value in record.values.items()}
+
+        self.available = list(available)
+        self.dates = list(self.available[0].values) if self.available else []
+
+        available_dates = set().union(*[record.values for record in self.available])
+        used_dates = set().union(*[record.values for record in used])
+
+        if available_dates != used_dates:
+            raise ValueError(
+                f"Mismatch between date columns names in available and used resources. "
+                f"Used not in available: {used_dates - available_dates}. Available not in used: {available_dates - used_dates}")
+
+        for record in self.available:
+            record.values = {date: to_number(value, 0) for date, value in record.values.items()}
+
+        self.check_tasks(tasks)
+
+        for task in tasks:
+            if isinstance(task.task_id, (int, float, np.integer, np.floating)):
+                task.task_id = str(task.task_id)
+
+            task.remaining = to_number(task.remaining, 0)
+            task.resources_max = to_number(task.resources_max, float('inf'))
+            task.blocked_days = to_number(task.blocked_days, 0)
+
+            if task.restriction == '':
+                task.restriction = None
+
+            # Clean End Dates of unfinished tasks
+            if task.remaining > 0:
+                task.end_date = None
+
+        # Same order as the DataFrame sort by priority (NaN priorities last)
+        priorities = np.array([to_number(task.priority, np.nan) for task in tasks], dtype=float)
+        self.tasks = [tasks[position] for position in np.argsort(priorities, kind='quicksort')]
+
+        self.used = self._initialize_used(list(used), tasks)
+
+    @staticmethod
+    def _date_label(date):
+        """Format a date label as '%d/%m/%Y', as ProjectResourceManager does with the date columns."""
+        value = parse_date(date)
+        return value.strftime(DATE_FORMAT) if value is not None else date
+
+    @staticmethod
+    def check_tasks(tasks):
+        """
+        Check the tasks for inconsistencies, as TaskManager.check_task_schedule does: missing IDs or Goals, duplicated 
+        IDs or Goals, and invalid or negative remaining work, resources max or priorities.
+
+        Args:
+            tasks (list of TaskRecord): Tasks to check.
+
+        Raises:
+            ValueError: If any inconsistency is found.
+        """
+        def is_empty(value):
+            return value is None or value == '' or (isinstance(value, float) and math.isnan(value))
+
+        def is_invalid(value, allow_empty = True):
+            if is_empty(value) or str(value) == 'N/A':
+                return not allow_empty
+            return to_number(value, None) is None or to_number(value, None) < 0
+
+        checks = [
+            ("Missing values found in ID Column", lambda task: task.task_id == ''),
+            ("Missing values found in Goal Column", lambda task: task.goal == ''),
+            ("Invalid or negative values found in task remaining", lambda task: is_invalid(task.remaining)),
+            ("Invalid or negative values found in task resources max", lambda task: is_invalid(task.resources_max)),
+            ("Invalid or negative values found in task priority", lambda task: is_invalid(task.priority)),
+        ]
+
+        for message, check in checks:
+            invalid = [str(task.task_id) for task in tasks if check(task)]
+
+            if invalid:
+                raise ValueError(f"{message} in task schedule: {', '.join(invalid)}")
+
+        for attr in ["task_id", "goal"]:
+            values = [getattr(task, attr) for task in tasks]
+            duplicated = sorted({str(value) for value in values if values.count(value) > 1})
+
+            if duplicated:
+                raise ValueError(f"Duplicated {'IDs' if attr == 'task_id' else 'Goals'} found in task schedule: {', '.join(duplicated)}")
+
+    def _initialize_used(self, used, tasks):
+        """
+        Add the used resources rows of the tasks with remaining work and the accumulated rows of each responsibility, 
+        and calculate the accumulated values not set, as ProjectUsedResourceManagerInitializer does.
+
+        Args:
+            used (list of CapacityRecord): Used resources rows.
+            tasks (list of TaskRecord): Tasks, in their original order.
+
+        Returns:
+            list of CapacityRecord: The used resources rows.
+        """
+        dates = sorted(set().union(*[record.values for record in used]), key=self.dates.index) if used else list(self.dates)
+        info_columns = list(dict.fromkeys(column for record in used for column in record.info))
+
+        for record in used:
+            record.values = {date: to_number(record.values.get(date), 0) for date in dates}
+
+        def has_row(goal, responsibility):
+            return any(
+                record.goal == goal and all(record.responsibility.get(attr) == responsibility.get(attr) for attr in self.responsible_attr_names)
+                for record in used)
+
+        new_rows = []
+
+        for task in tasks:
+            if task.remaining > 0 and not has_row(task.goal, task.responsibility):
+                if 'infocolumn' in AppConfig():
+                    info = {attr: AppConfig()["infocolumn"].format_map({"infocolumn": attr}) for attr in info_columns}
+                else:
+                    info = {attr: task.info.get(attr) for attr in info_columns}
+
+                new_rows.append(CapacityRecord(dict(task.responsibility), task.goal, {date: 0.0 for date in dates}, info))
+
+        responsibilities = []
+        for record in self.available:
+            responsibility = {attr: record.responsibility.get(attr) for attr in self.responsible_attr_names}
+            if responsibility not in responsibilities:
+                responsibilities.append(responsibility)
+
+        wildcard_rows = [
+            CapacityRecord(responsibility, ALL_TAG, {date: None for date in dates}, {info: USED_RESOURCE_NA for info in info_columns})
+            for responsibility in responsibilities if not has_row(ALL_TAG, responsibility)
+        ]
+
+        used = used + new_rows + wildcard_rows
+
+        # Accumulated values not set: sum of the rows with the same (non accumulated) responsibility values
+        accumulated_values = {}
+
+        for index, record in enumerate(used):
+            if record.goal not in ACCUMULATED_SYNONYMS or all(value is not None for value in record.values.values()):
+                continue
+
+            filters = {attr: value for attr, value in record.responsibility.items() if value not in ACCUMULATED_SYNONYMS}
+            matching = [
+                other for other in used 
+                if all(other.responsibility.get(attr) == value for attr, value in filters.items())
+            ]
+
+            accumulated_values[index] = {
+                date: sum(other.values[date] or 0 for other in matching) if value is None else value
+                for date, value in record.values.items()
+            }
+
+        for index, values in accumulated_values.items():
+            used[index].values = values
+
+        return used
+
+    def available_rows(self, responsibility):
+        """
+        Select the available resources rows that constrain a responsibility (see ProjectResourceManager.goal_resources_mask).
+
+        Args:
+            responsibility (dict): Value of each responsibility column.
+
+        Returns:
+            np.ndarray: Positions of the available resources rows.
+        """
+        return np.array([
+            position for position, record in enumerate(self.available)
+            if all(record.responsibility.get(attr) in ACCUMULATED_SYNONYMS or record.responsibility.get(attr) == responsibility.get(attr)
+                   for attr in self.responsible_attr_names)
+        ], dtype=np.int64)
+
+    def available_used_rows(self):
+        """
+        Obtain the used resources rows consumed by each available resources row (see 
+        ProjectResourceManager.available_used_rows): '*' values select the accumulated rows.
+
+        Returns:
+            list of np.ndarray: Used resources rows of each available resources row.
+        """
+        def matches(available_value, used_value):
+            if available_value in ACCUMULATED_SYNONYMS:
+                return used_value in ACCUMULATED_SYNONYMS
+            return used_value == available_value
+
+        return [
+            np.array([
+                position for position, used_record in enumerate(self.used)
+                if matches(record.goal, used_record.goal) and all(
+                    matches(record.responsibility.get(attr), used_record.responsibility.get(attr)) for attr in self.responsible_attr_names)
+            ], dtype=np.int64)
+            for record in self.available
+        ]
+
+    def task_used_rows(self, task):
+        """
+        Select the used resources rows updated when a task is allocated (see 
+        ProjectUsedResourceManager.match_resources_mask): rows values are wildcards or regexp.
+
+        Args:
+            task (TaskRecord): The task.
+
+        Returns:
+            np.ndarray: Positions of the used resources rows.
+        """
+        def matches(pattern, value):
+            if pattern in ACCUMULATED_SYNONYMS or value == pattern:
+                return True
+
+            try:
+                return isinstance(value, str) and bool(re.match(str(pattern), value))
+            except re.error:
+                return False
+
+        return np.array([
+            position for position, record in enumerate(self.used)
+            if matches(record.goal, task.goal) and all(
+                matches(record.responsibility.get(attr), task.responsibility.get(attr)) for attr in self.responsible_attr_names)
+        ], dtype=np.int64)
+
+    def period_days(self, dates):
+        """
+        Calculate the number of days to consider for the available resources of each date (see TaskManager.period_days).
+
+        Args:
+            dates ([str]): Date labels.
+
+        Returns:
+            np.ndarray: Period days of each date.
+        """
+        if self.period_days_available != CONF_PERIOD_AUTO:
+            return np.full(len(dates), self.period_days_available, dtype=float)
+
+        if len(dates) == 0:
+            return np.zeros(0)
+
+        date_values = np.array([parse_date(date) for date in dates], dtype='datetime64[D]')
+
+        spacing = date_values[-1] - date_values[-2] if date_values.size > 1 else np.timedelta64(7, 'D')
+        next_dates = np.append(date_values[1:], date_values[-1:] + spacing)
+
+        holiday_values = np.array(configured_holidays(), dtype='datetime64[D]')
+
+        return np.abs(np.busday_count(date_values, next_dates, holidays=holiday_values)).astype(float)
+
+    def update_task_schedule(self, dates = None, engine = ENGINE_MATRIX, effort_scale = None):
+        """
+        Update the task schedule, as TaskManager.update_task_schedule does with the matrix engines.
+
+        Dates before today are discarded, and the used resources of the dates from today are cleaned before scheduling.
+
+        Args:
+            dates ([str], optional): Dates to be processed. Default: the dates of the available resources.
+            engine (str): 'matrix' (default) or 'event' (see TaskManager.update_task_schedule).
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+
+        Returns:
+            list of TaskRecord: The updated tasks, sorted by priority.
+
+        Raises:
+            ValueError: If the engine or the effort scale are not valid, or a date is missing in the resources.
+        """
+        if engine not in [ENGINE_MATRIX, ENGINE_EVENT]:
+            raise ValueError(f"Invalid scheduling engine for the core scheduler: {engine}. Possible values: {ENGINE_MATRIX}, {ENGINE_EVENT}")
+
+        if effort_scale is not None:
+            check_effort_scale(effort_scale)
+
+        dates = [self._date_label(date) for date in (self.dates if dates is None else dates)]
+
+        for date in dates:
+            if date not in self.dates:
+                raise ValueError(f"Invalid or missing date column: {date}")
+
+        now = datetime.datetime.now()
+        date_values = [parse_date(date) for date in dates]
+        date_indexes = [index for index, value in enumerate(date_values) if value is None or value >= now]
+
+        self.schedule_summary = {
+            "dates": len(dates),
+            "past_dates": len(dates) - len(date_indexes),
+            "horizon_dates": len(date_indexes)
+        }
+
+        # Clean used resources for dates after today
+        for record in self.used:
+            for date in record.values:
+                value = parse_date(date)
+                if value is not None and value >= now:
+                    record.values[date] = 0.0
+
+        engine_instance = MatrixScheduleEngine(**self.engine_inputs(dates, date_indexes, effort_scale))
+        processed = engine_instance.run(range(len(date_indexes)), event_driven=engine == ENGINE_EVENT)
+
+        self._store_engine(engine_instance, dates, date_indexes)
+
+        processed_dates = [dates[date_indexes[column]] for column in processed]
+
+        self.schedule_summary.update({
+            "processed_dates": len(processed_dates),
+            "first_date": processed_dates[0] if processed_dates else None,
+            "last_date": processed_dates[-1] if processed_dates else None,
+            "completed": bool(engine_instance.dependencies.completed.all())
+        })
+
+        logger.info(f"Schedule summary: {self.schedule_summary}")
+
+        return self.tasks
+
+    def engine_inputs(self, dates, date_indexes, effort_scale = None):
+        """
+        Build the MatrixScheduleEngine arguments from the records (see TaskManager.matrix_engine_inputs).
+
+        Args:
+            dates ([str]): Date labels.
+            date_indexes ([int]): Indexes of the dates to be processed.
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+
+        Returns:
+            dict: MatrixScheduleEngine keyword arguments.
+        """
+        period_days = self.period_days(dates)[date_indexes] if date_indexes else np.zeros(0)
+
+        if effort_scale is not None:
+            period_days = np.rint(period_days)
+
+        column_dates = [dates[index] for index in date_indexes]
+        scale = resource_scale(effort_scale, resource_days_multiple(period_days)) if effort_scale is not None else None
+
+        available = np.array([[record.values[date] for date in column_dates] for record in self.available], dtype=float)
+        used = np.array([[record.values[date] for date in column_dates] for record in self.used], dtype=float)
+
+        available = available.reshape(len(self.available), len(column_dates))
+        used = used.reshape(len(self.used), len(column_dates))
+
+        if scale is not None:
+            available = to_fixed_point(available, scale)
+            used = to_fixed_point(used, scale)
+
+        # Groups in the order of the DataFrame groupby (priority, responsibility key)
+        keys = [
+            (task.priority, json.dumps({attr: task.responsibility.get(attr) for attr in self.responsible_attr_names}))
+            for task in self.tasks
+        ]
+        group_keys = sorted({key for key in keys if not math.isnan(to_number(key[0], np.nan))})
+        group_numbers = {key: group for group, key in enumerate(group_keys)}
+
+        group_tasks = [[] for _ in group_keys]
+        for position, key in enumerate(keys):
+            if key in group_numbers:
+                group_tasks[group_numbers[key]].append(position)
+
+        group_tasks = [np.array(tasks, dtype=np.int64) for tasks in group_tasks]
+        group_rows = [self.available_rows(self.tasks[tasks[0]].responsibility) for tasks in group_tasks]
+
+        # Task ID restrictions are handled by the dependency graph, date restrictions by the engine
+        task_ids = [task.task_id for task in self.tasks]
+        known_ids = set(task_ids)
+
+        restrictions = [
+            task.restriction if task.restriction is not None and (task.restriction in known_ids or parse_date(task.restriction) is None) 
+            else None
+            for task in self.tasks
+        ]
+
+        restriction_dates = np.array([
+            parse_date(task.restriction) or np.datetime64('NaT') if task.restriction is not None else np.datetime64('NaT')
+            for task in self.tasks
+        ], dtype='datetime64[ns]')
+
+        return dict(
+            remaining=np.array([task.remaining for task in self.tasks], dtype=float),
+            resources_max=np.array([task.resources_max for task in self.tasks], dtype=float),
+            dependencies=TaskDependencyGraph(task_ids, restrictions),
+            restriction_dates=restriction_dates,
+            has_start_date=np.array([task.start_date is not None for task in self.tasks], dtype=bool),
+            group_tasks=group_tasks,
+            group_rows=group_rows,
+            row_used=self.available_used_rows(),
+            task_used=[self.task_used_rows(task) for task in self.tasks],
+            available=available,
+            used=used,
+            date_values=np.array([parse_date(date) for date in column_dates], dtype='datetime64[ns]'),
+            period_days_available=period_days,
+            effort_scale=effort_scale)
+
+    def _store_engine(self, engine, dates, date_indexes):
+        """
+        Write the results of a MatrixScheduleEngine run back to the task and used resources records 
+        (see TaskManager._store_matrix_engine).
+
+        Args:
+            engine (MatrixScheduleEngine): The engine after running.
+            dates ([str]): Date labels.
+            date_indexes ([int]): Indexes of the processed dates.
+        """
+        engine_used = (
+            engine.used if engine.effort_scale is None else 
+            from_fixed_point(engine.used, resource_scale(engine.effort_scale, engine.resource_days))
+        )
+
+        for row, record in enumerate(self.used):
+            for column, date_index in enumerate(date_indexes):
+                record.values[dates[date_index]] = float(engine_used[row, column])
+
+        remaining = engine.remaining if engine.effort_scale is None else from_fixed_point(engine.remaining, engine.effort_scale)
+        holidays = configured_holidays()
+
+        for position in np.flatnonzero(engine.allocated):
+            task = self.tasks[position]
+            task.remaining = float(remaining[position])
+
+            if engine.start_indexes[position] >= 0:
+                task.start_date = dates[date_indexes[engine.start_indexes[position]]]
+
+            if engine.end_indexes[position] >= 0:
+                end_date = dates[date_indexes[engine.end_indexes[position]]]
+                task.end_date = calculate_end_date_with_block(end_date, task.blocked_days, holidays) if task.blocked_days > 0 else end_date
+
+def calculate_end_date_with_block(start_date, block_days, holidays = []):
+    """
+    Calculate the end date considering blocked days, excluding weekends and holidays 
+    (see TaskManager.calculate_end_date_with_block).
+
+    Args:
+        start_date (datetime.date or str): The date from which to start counting.
+        block_days (int): Number of business days to block.
+        holidays (list of datetime.date or str): Dates that are holidays.
+
+    Returns:
+        datetime.date: The calculated end date.
+    """
+    current_date = parse_date(start_date).date()
+    days_added = 0
+
+    while days_added < block_days:
+        current_date += datetime.timedelta(days=1)
+        if current_date.weekday() < 5 and current_date not in holidays:
+            days_added += 1
+
+    return current_date
@@ -0,0 +1,123 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pandas as pd
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_REMAINING, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_START_DATE, TASK_END_DATE,
+    TASK_BLOCKED_DAYS, USED_RESOURCE_GOAL
+)
+from scheduler.project_core import CoreScheduler, TaskRecord, CapacityRecord, parse_date
+
+TASK_RECORD_COLUMNS = {
+    TASK_ID: "task_id", TASK_GOAL: "goal", TASK_PRIORITY: "priority", TASK_REMAINING: "remaining", 
+    TASK_RESOURCES_MAX: "resources_max", TASK_RESTRICTION: "restriction", TASK_START_DATE: "start_date", 
+    TASK_END_DATE: "end_date", TASK_BLOCKED_DAYS: "blocked_days"
+}
+
+def _value(value):
+    """Missing values (NaN, NaT) as None."""
+    return None if not isinstance(value, (list, dict)) and pd.isna(value) else value
+
+def core_from_dataframes(tasks_df, available_resources_df, used_resources_df, period_days_available = 5):
+    """
+    Build a CoreScheduler from the tasks, available resources and used resources DataFrames.
+
+    Args:
+        tasks_df (pd.DataFrame): Tasks (see TaskManager).
+        available_resources_df (pd.DataFrame): Available resources (see ProjectResourceManager).
+        used_resources_df (pd.DataFrame): Used resources (see ProjectUsedResourceManager).
+        period_days_available (int or str): Number of days to consider for the available resources, or 'auto'.
+
+    Returns:
+        CoreScheduler: The scheduler.
+
+    Raises:
+        ValueError: If responsibility columns of the available resources are missing in the tasks or used resources.
+    """
+    responsible_attr_names = [
+        col for col in available_resources_df.columns if col != USED_RESOURCE_GOAL and parse_date(col) is None
+    ]
+
+    for name, df in [("used resources", used_resources_df), ("tasks", tasks_df)]:
+        missing = [col for col in responsible_attr_names if col not in df.columns]
+
+        if missing:
+            raise ValueError(f"Missing responsibility columns in {name}: {', '.join(missing)}")
+
+    tasks = [
+        TaskRecord(
+            responsibility={attr: _value(row[attr]) for attr in responsible_attr_names},
+            info={col: row[col] for col in tasks_df.columns if col not in TASK_RECORD_COLUMNS and col not in responsible_attr_names},
+            **{attr: _value(row[col]) for col, attr in TASK_RECORD_COLUMNS.items() if col in tasks_df.columns}
+        )
+        for _, row in tasks_df.iterrows()
+    ]
+
+    def capacity_records(df):
+        date_columns = [col for col in df.columns if parse_date(col) is not None]
+
+        return [
+            CapacityRecord(
+                {attr: _value(row[attr]) for attr in responsible_attr_names}, row[USED_RESOURCE_GOAL], 
+                {col: _value(row[col]) for col in date_columns},
+                {col: row[col] for col in df.columns if col not in date_columns + responsible_attr_names + [USED_RESOURCE_GOAL]})
+            for _, row in df.iterrows()
+        ]
+
+    return CoreScheduler(
+        tasks, capacity_records(available_resources_df), capacity_records(used_resources_df), responsible_attr_names, 
+        period_days_available)
+
+def core_to_dataframes(scheduler, tasks_df, used_resources_df):
+    """
+    Write the results of a CoreScheduler to copies of the tasks and used resources DataFrames.
+
+    Args:
+        scheduler (CoreScheduler): The scheduler after update_task_schedule.
+        tasks_df (pd.DataFrame): Tasks DataFrame the scheduler was built from.
+        used_resources_df (pd.DataFrame): Used resources DataFrame the scheduler was built from.
+
+    Returns:
+        tuple: Updated tasks DataFrame (in its original order) and used resources DataFrame (with the rows added for 
+            the tasks and the accumulated rows, and date columns formatted as '%d/%m/%Y').
+    """
+    tasks_df = tasks_df.copy()
+    records = {str(task.task_id): task for task in scheduler.tasks}
+    positions = [records[str(task_id)] for task_id in tasks_df[TASK_ID]]
+
+    for col in [TASK_REMAINING, TASK_START_DATE, TASK_END_DATE]:
+        attr = TASK_RECORD_COLUMNS[col]
+        tasks_df[col] = pd.Series([getattr(task, attr) for task in positions], index=tasks_df.index, dtype=object)
+
+    tasks_df[TASK_REMAINING] = tasks_df[TASK_REMAINING].astype(float)
+
+    columns = [CoreScheduler._date_label(col) for col in used_resources_df.columns]
+
+    used_df = pd.DataFrame([
+        {USED_RESOURCE_GOAL: record.goal, **record.responsibility, **record.info, **record.values} for record in scheduler.used
+    ])
+
+    return tasks_df, used_df[columns + [col for col in used_df.columns if col not in columns]]
@@ -0,0 +1,325 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+import multiprocessing
+import os
+import queue
+import uuid
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from scheduler.project_partition import schedule_partition
+
+DEFAULT_ADDRESS = ('127.0.0.1', 0)
+DEFAULT_TIMEOUT = 3600
+
+# Seconds a local worker waits for a job before checking its stop signal
+WORKER_POLL_INTERVAL = 0.1
+
+# Seconds to wait for each local worker to stop before terminating it
+SHUTDOWN_TIMEOUT = 10
+
+# Queues of the coordinator server process (one server process per coordinator)
+_jobs = queue.Queue()
+_results = queue.Queue()
+
+def _get_jobs():
+    return _jobs
+
+def _get_results():
+    return _results
+
+class ScheduleQueueManager(BaseManager):
+    """Manager serving the jobs and results queues of a ScheduleCoordinator to its workers."""
+
+ScheduleQueueManager.register("get_jobs", callable=_get_jobs)
+ScheduleQueueManager.register("get_results", callable=_get_results)
+
+class ScheduleCoordinator:
+    """
+    Coordinator of distributed partition scheduling.
+
+    The coordinator serves a jobs queue and a results queue with multiprocessing.managers. Workers (see 
+    run_schedule_worker) connect to it from local processes or other machines, take partitions of the tasks (see 
+    TaskManager.matrix_partitions), schedule them and send the results back, which are merged as they arrive. 
+
+    Usage:
+        with ScheduleCoordinator(('0.0.0.0', 50000), b'secret') as coordinator:
+            coordinator.start_local_workers(4)
+            task_manager.update_task_schedule(dates, engine=ENGINE_MATRIX, coordinator=coordinator)
+
+    Attributes:
+        address (tuple): Host and port the workers connect to (the actual port once started).
+        authkey (bytes): Authentication key shared with the workers.
+        timeout (float): Seconds to wait for each partition result.
+    """
+
+    def __init__(self, address = DEFAULT_ADDRESS, authkey = None, timeout = DEFAULT_TIMEOUT):
+        """
+        Initialize the coordinator. The server is not started until start is called.
+
+        Args:
+            address (tuple): Host and port to listen on. Default: a free port on localhost.
+            authkey (bytes, optional): Authentication key shared with the workers. Default: a random key 
+                (only local workers started with start_local_workers can connect).
+            timeout (float): Seconds to wait for each partition result. Default: 3600.
+
+        Raises:
+            ValueError: If the timeout is not positive.
+        """
+        if timeout <= 0:
+            raise ValueError(f"Invalid timeout: {timeout}. It must be positive.")
+
+        self.address = address
+        self.authkey = authkey if authkey is not None else os.urandom(32)
+        self.timeout = timeout
+
+        self.manager = None
+        self.local_workers = []
+        self.stop_events = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def start(self):
+        """Start the server of the jobs and results queues."""
+        self.manager = ScheduleQueueManager(address=self.address, authkey=self.authkey)
+        self.manager.start()
+        self.address = self.manager.address
+
+        self.jobs = self.manager.get_jobs()
+        self.results = self.manager.get_results()
+
+        logger.info(f"Schedule coordinator listening on {self.address[0]}:{self.address[1]}")
+
+    def start_local_workers(self, count):
+        """
+        Start worker processes in this machine, connected to the coordinator.
+
+        Args:
+            count (int): Number of workers.
+
+        Raises:
+            ValueError: If the coordinator is not started or the number of workers is not a positive integer.
+        """
+        if self.manager is None:
+            raise ValueError("The coordinator must be started before its workers.")
+
+        if not isinstance(count, (int, np.integer)) or count <= 0:
+            raise ValueError(f"Invalid number of workers: {count}. It must be a positive integer.")
+
+        for _ in range(count):
+            stop = multiprocessing.Event()
+            worker = multiprocessing.Process(target=run_schedule_worker, args=(self.address, self.authkey, stop), daemon=True)
+            worker.start()
+
+            self.local_workers.append(worker)
+            self.stop_events.append(stop)
+
+    def shutdown(self):
+        """
+        Stop the local workers and the server. Remote workers stop when the connection is closed.
+
+        Each local worker has its own stop signal, so remote workers sharing the jobs queue cannot take it. Local workers
+        that do not stop in SHUTDOWN_TIMEOUT seconds (e.g. in the middle of a partition) are terminated.
+        """
+        if self.manager is None:
+            return
+
+        for stop in self.stop_events:
+            stop.set()
+
+        for worker in self.local_workers:
+            worker.join(SHUTDOWN_TIMEOUT)
+
+            if worker.is_alive():
+                logger.warning(f"Schedule worker {worker.pid} did not stop in {SHUTDOWN_TIMEOUT} seconds. Terminating it.")
+                worker.terminate()
+                worker.join()
+
+        self.local_workers = []
+        self.stop_events = []
+        self.manager.shutdown()
+        self.manager = None
+
+    def run_partitions(self, partitions, available, used, column_count, event_driven = False):
+        """
+        Schedule partitions on the connected workers, sending each one its resources rows.
+
+        Partitions are queued from the largest to the smallest (by number of tasks). The used resources rows of each 
+        result are merged as soon as it arrives, and results are returned in partition order, so they do not depend 
+        on the workers.
+
+        Jobs and results are tagged with an id of the run: results of previous runs (e.g. still running when a run 
+        failed) are discarded. When a run fails, its pending jobs and the results received so far are removed from 
+        the queues.
+
+        Args:
+            partitions (list of dict): Partitions (see TaskManager.matrix_partitions).
+            available (np.ndarray): Available resources matrix.
+            used (np.ndarray): Used resources matrix. It is not modified.
+            column_count (int): Number of matrix columns to process.
+            event_driven (bool): Run the engines with event-driven time advance.
+
+        Returns:
+            tuple: Results of each partition (see schedule_partition), in partition order, and the updated used 
+                resources matrix.
+
+        Raises:
+            ValueError: If the coordinator is not started.
+            TimeoutError: If a result does not arrive in time.
+            RuntimeError: If a worker fails to schedule a partition.
+        """
+        if self.manager is None:
+            raise ValueError("The coordinator must be started before scheduling.")
+
+        used = used.copy()
+        order = sorted(range(len(partitions)), key=lambda partition: -len(partitions[partition]["tasks"]))
+        run_id = uuid.uuid4().hex
+
+        for partition in order:
+            self.jobs.put((
+                run_id, partition, partitions[partition], available[partitions[partition]["available_rows"]], 
+                used[partitions[partition]["used_rows"]], column_count, event_driven))
+
+        logger.info(f"{len(partitions)} partitions queued.")
+
+        results = [None] * len(partitions)
+        pending = len(partitions)
+
+        try:
+            while pending:
+                try:
+                    result_run_id, partition, result = self.results.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No partition result received in {self.timeout} seconds.")
+
+                if result_run_id != run_id:
+                    logger.debug(f"Result of partition {partition} of a previous run discarded.")
+                    continue
+
+                if isinstance(result, str):
+                    raise RuntimeError(f"Partition {partition} failed: {result}")
+
+                used[partitions[partition]["used_rows"]] = result.pop("used")
+                results[partition] = result
+                pending -= 1
+
+                logger.debug(f"Partition {partition} merged.")
+        except Exception:
+            self._drain_queues()
+            raise
+
+        return results, used
+
+    def _drain_queues(self):
+        """Remove the pending jobs and the received results from the queues, after a failed run."""
+        for pending_queue in [self.jobs, self.results]:
+            while True:
+                try:
+                    pending_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+def run_schedule_worker(address, authkey, stop = None):
+    """
+    Run a schedule worker: take partitions from the coordinator, schedule them and send the results back, until the 
+    coordinator stops it or closes the connection.
+
+    Args:
+        address (tuple): Host and port of the coordinator.
+        authkey (bytes): Authentication key of the coordinator.
+        stop (multiprocessing.Event, optional): Stop signal of a local worker (see ScheduleCoordinator.start_local_workers).
+            The jobs queue is polled every WORKER_POLL_INTERVAL seconds to check it.
+    """
+    manager = ScheduleQueueManager(address=tuple(address), authkey=authkey)
+    manager.connect()
+
+    jobs = manager.get_jobs()
+    results = manager.get_results()
+
+    logger.info(f"Schedule worker connected to {address[0]}:{address[1]}")
+
+    while stop is None or not stop.is_set():
+        try:
+            job = jobs.get() if stop is None else jobs.get(timeout=WORKER_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        except (EOFError, ConnectionError):
+            break
+
+        if job is None:
+            break
+
+        run_id, partition = job[:2]
+
+        try:
+            result = schedule_partition(*job[2:])
+        except Exception as e:
+            logger.error(f"Partition {partition} failed: {e}")
+            result = str(e)
+
+        try:
+            results.put((run_id, partition, result))
+        except (EOFError, ConnectionError):
+            logger.error(f"Connection to the coordinator lost. Result of partition {partition} not sent.")
+            break
+        except Exception as e:
+            # The result could not be sent (e.g. it cannot be pickled): report the failure, so the coordinator does not wait for it
+            logger.error(f"Result of partition {partition} not sent: {e}")
+            results.put((run_id, partition, f"Result not sent: {e}"))
+
+    logger.info("Schedule worker stopped.")
+
+if __name__ == "__main__":
+    """
+    Run a schedule worker connected to a coordinator (see ScheduleCoordinator).
+
+    Usage:
+    python project_distributed.py -a <host:port> -k <authkey>
+
+    Arguments:
+    -a, --address: Host and port of the coordinator.
+    -k, --authkey: Authentication key of the coordinator.
+
+    Example:
+
+        python project_distributed.py -a 192.168.1.10:50000 -k secret
+
+    """
+    parser = argparse.ArgumentParser(description="Run a schedule worker connected to a coordinator.")
+    parser.add_argument('-a', '--address', required=True, help="Host and port of the coordinator (host:port).")
+    parser.add_argument('-k', '--authkey', required=True, help="Authentication key of the coordinator.")
+
+    args = parser.parse_args()
+    host, port = args.address.rsplit(':', 1)
+
+    run_schedule_worker((host, int(port)), args.authkey.encode())
@@ -0,0 +1,124 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+
+# Default number of days of a period: used resources are updated with effort / period days (see TaskManager.allocate_resources)
+RESOURCE_DAYS = 5
+
+# Fixed-point value of an unlimited amount (e.g. tasks without Resources Max.). Small enough to be added without overflow.
+FIXED_POINT_INFINITY = np.iinfo(np.int64).max // 4
+
+def to_fixed_point(values, scale):
+    """
+    Convert values to int64 fixed-point units of 1 / scale, rounding to the nearest unit.
+
+    Infinite values are converted to +/- FIXED_POINT_INFINITY and missing values to 0.
+
+    Args:
+        values (array-like): Values to convert.
+        scale (int): Number of units per unit of value (e.g. 1000 for 1/1000 person-day).
+
+    Returns:
+        np.ndarray: The values in fixed-point units (int64).
+    """
+    values = np.asarray(values, dtype=float)
+
+    units = np.zeros(values.shape, dtype=np.int64)
+    finite = np.isfinite(values)
+
+    units[finite] = np.rint(values[finite] * scale).astype(np.int64)
+    units[values == np.inf] = FIXED_POINT_INFINITY
+    units[values == -np.inf] = -FIXED_POINT_INFINITY
+
+    return units
+
+def from_fixed_point(units, scale):
+    """
+    Convert int64 fixed-point units of 1 / scale back to floats.
+
+    Args:
+        units (array-like): Values in fixed-point units.
+        scale (int): Number of units per unit of value.
+
+    Returns:
+        np.ndarray: The float values (+/- inf for +/- FIXED_POINT_INFINITY).
+    """
+    units = np.asarray(units, dtype=np.int64)
+
+    values = units / scale
+    values[units >= FIXED_POINT_INFINITY] = np.inf
+    values[units <= -FIXED_POINT_INFINITY] = -np.inf
+
+    return values
+
+def resource_scale(effort_scale, resource_days = RESOURCE_DAYS):
+    """
+    Scale of the available and used resources for an effort scale.
+
+    Resources are stored in units of 1 / (effort_scale * resource_days) so that the used resources update 
+    (effort / period days) is exact when resource_days is a multiple of the period days (see resource_days_multiple). 
+    With periods of RESOURCE_DAYS days, one effort unit is one resource unit.
+
+    Args:
+        effort_scale (int): Number of effort units per person-day.
+        resource_days (int): Common multiple of the period days. Default is RESOURCE_DAYS.
+
+    Returns:
+        int: Number of resource units per person.
+    """
+    return effort_scale * int(resource_days)
+
+def resource_days_multiple(period_days):
+    """
+    Least common multiple of the period days, the resource days of resource_scale.
+
+    Args:
+        period_days (array-like): Days of each period. They must be integers.
+
+    Returns:
+        int: Least common multiple of the non-zero period days (RESOURCE_DAYS if there are none).
+
+    Raises:
+        ValueError: If a period has a non-integer or negative number of days.
+    """
+    period_days = np.atleast_1d(np.asarray(period_days, dtype=float))
+
+    if np.any(period_days < 0) or np.any(period_days != np.rint(period_days)):
+        raise ValueError(f"Invalid period days: {period_days}. Fixed-point effort needs a whole number of days per period.")
+
+    period_days = period_days[period_days > 0].astype(np.int64)
+
+    return int(np.lcm.reduce(period_days)) if period_days.size else RESOURCE_DAYS
+
+def check_effort_scale(effort_scale):
+    """
+    Check that an effort scale is a positive integer.
+
+    Args:
+        effort_scale (int): Number of effort units per person-day.
+
+    Raises:
+        ValueError: If the effort scale is not a positive integer.
+    """
+    if not isinstance(effort_scale, (int, np.integer)) or isinstance(effort_scale, bool) or effort_scale <= 0:
+        raise ValueError(f"Invalid effort scale: {effort_scale}. It must be a positive integer.")
@@ -0,0 +1,1049 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import heapq
+
+import numpy as np
+
+from scheduler.project_fixed_point import to_fixed_point, check_effort_scale, resource_days_multiple
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+class MatrixScheduleEngine:
+    """
+    Array based implementation of the allocation loop of TaskManager.update_task_schedule.
+
+    Tasks, available resources and used resources are loaded once into dense NumPy arrays and the whole
+    allocation loop runs on them. It follows the same rules as the pandas implementation:
+
+    - For each date, task groups (same priority and responsibility key) are processed in (priority, responsibility key) order.
+    - The available effort of a group is the minimum remaining resource (available - used) of the available resources 
+      rows constraining it, multiplied by the period days of the date.
+    - The effort is distributed among the ready tasks of the group and added to the used resources rows matching each task.
+    - Tasks restricted by another task are released when it completes (see TaskDependencyGraph). If their group was already
+      processed for the date, it is processed again for them, so they can start in the period their blocker finishes.
+
+    Consecutive groups that do not depend on each other are distributed in one batched call (see distribute_effort).
+
+    In event-driven mode (see run), dates where no allocation can happen are skipped: the engine jumps from one event
+    (a restriction date reached, a task completed, a group with capacity) to the next.
+
+    The engine does not depend on pandas: TaskManager loads the arrays from its DataFrames and writes the results back.
+
+    Attributes:
+        remaining (np.ndarray): Remaining work per task (days, or fixed-point effort units if effort_scale is set).
+        resources_max (np.ndarray): Maximum resources per task and period.
+        effort_scale (int): Effort units per person-day in fixed-point mode, None for floats.
+        dependencies (TaskDependencyGraph): Task ID restrictions and completion state.
+        restriction_dates (np.ndarray): Date restriction per task (datetime64, NaT if none).
+        group_tasks (list of np.ndarray): Task positions of each group, in processing order.
+        group_rows (list of np.ndarray): Available resources rows constraining each group.
+        row_used (list of np.ndarray): Used resources rows consumed by each available resources row.
+        task_used (list of np.ndarray): Used resources rows updated by each task allocation.
+        available (np.ndarray): Available resources matrix (available rows x dates).
+        used (np.ndarray): Used resources matrix (used rows x dates).
+        date_values (np.ndarray): Dates of the matrix columns (datetime64).
+        period_days_available (np.ndarray): Working days of each matrix column.
+        resource_days (int): Common multiple of the period days used for the resources scale in fixed-point mode 
+            (see project_fixed_point.resource_scale), None for floats.
+        period_lengths (np.ndarray): Number of dates merged in each matrix column (see TaskManager.select_resolution_periods).
+        start_indexes (np.ndarray): Date index where each task started (-1 if not started during the run).
+        end_indexes (np.ndarray): Date index where each task finished (-1 if not finished during the run).
+        allocated (np.ndarray): True for tasks that received an allocation during the run.
+        released_groups (set): Groups with tasks released by a completion on the last processed date.
+        group_open (np.ndarray): Number of tasks not completed of each group. Groups without them are retired.
+        group_wake (np.ndarray): Earliest date (int64 ns) each group can have ready tasks, NEVER if all are waiting for other tasks.
+        isolated_end (int): Last date position where an isolated task is completed (-1 if none).
+    """
+
+    # Wake up date of groups whose tasks are all waiting for other tasks
+    NEVER = np.iinfo(np.int64).max
+
+    # Arrays that change while the allocation loop runs (see checkpoint_state)
+    STATE_ARRAYS = ["remaining", "start_indexes", "end_indexes", "allocated", "used", "group_open", "group_wake"]
+
+    def __init__(self, remaining, resources_max, dependencies, restriction_dates, has_start_date,
+                 group_tasks, group_rows, row_used, task_used, available, used, date_values, period_days_available = 5,
+                 effort_scale = None, period_lengths = None, record_allocations = False):
+        """
+        Initialize the engine with the task, resources and index arrays.
+
+        Args:
+            remaining (np.ndarray): Remaining work per task.
+            resources_max (np.ndarray): Maximum resources per task and period.
+            dependencies (TaskDependencyGraph): Task ID restrictions. The engine works on a copy, reset with the tasks without 
+                remaining work as completed, so the graph can be shared by several engines.
+            restriction_dates (np.ndarray): Date restriction per task (datetime64, NaT if none).
+            has_start_date (np.ndarray): True for tasks that already had a start date.
+            group_tasks (list of np.ndarray): Task positions of each group, in processing order.
+            group_rows (list of np.ndarray): Available resources rows constraining each group.
+            row_used (list of np.ndarray): Used resources rows consumed by each available resources row.
+            task_used (list of np.ndarray): Used resources rows updated by each task allocation.
+            available (np.ndarray): Available resources matrix (available rows x dates).
+            used (np.ndarray): Used resources matrix (used rows x dates).
+            date_values (np.ndarray): Dates of the matrix columns (datetime64).
+            period_days_available (int or np.ndarray): Number of days to consider for the available resources, for all the
+                matrix columns or per column. Default is 5 days.
+            effort_scale (int, optional): If provided, effort is handled as int64 fixed-point units of 1 / effort_scale 
+                person-day, and available and used must be given in resource units (see project_fixed_point.resource_scale,
+                with the resource_days_multiple of the period days). remaining and resources_max are given as floats 
+                and converted. Period days must be integers.
+            period_lengths (np.ndarray, optional): Number of dates merged in each matrix column. The maximum effort of a task
+                in a column is multiplied by it. Default: one date per column.
+            record_allocations (bool): If True, the allocations of each column are recorded in allocation_log.
+
+        Raises:
+            ValueError: If the effort scale is not a positive integer, or the period days are not integers in fixed-point mode.
+        """
+        self.effort_scale = effort_scale
+        self.resources_max = np.asarray(resources_max, dtype=float)
+
+        if effort_scale is None:
+            self.remaining = np.asarray(remaining, dtype=float).copy()
+            self.distribute = distribute_effort
+            values_dtype = float
+        else:
+            check_effort_scale(effort_scale)
+            self.remaining = to_fixed_point(remaining, effort_scale)
+            self.distribute = distribute_effort_fixed_point
+            values_dtype = np.int64
+
+        self.dependencies = dependencies.copy()
+        self.restriction_dates = np.asarray(restriction_dates, dtype='datetime64[ns]')
+        self.has_start_date = np.asarray(has_start_date, dtype=bool)
+
+        self.group_tasks = group_tasks
+        self.group_rows = group_rows
+        self.row_used = row_used
+        self.task_used = task_used
+
+        self.available = np.asarray(available, dtype=values_dtype)
+        self.used = np.asarray(used, dtype=values_dtype).copy()
+        self.date_values = np.asarray(date_values, dtype='datetime64[ns]')
+        self.period_lengths = (
+            np.ones(self.available.shape[1], dtype=np.int64) if period_lengths is None else np.asarray(period_lengths, dtype=np.int64)
+        )
+
+        period_days_available = np.broadcast_to(np.asarray(period_days_available, dtype=float), self.available.shape[1:])
+
+        if effort_scale is None:
+            self.period_days_available = period_days_available.copy()
+            self.resource_days = None
+        else:
+            # Resource units used by one effort unit in each column: exact, as resource_days is a multiple of the period days
+            self.resource_days = resource_days_multiple(period_days_available)
+            self.period_days_available = period_days_available.astype(np.int64)
+            self.period_resource_units = np.zeros_like(self.period_days_available)
+            working = self.period_days_available > 0
+            self.period_resource_units[working] = self.resource_days // self.period_days_available[working]
+
+        task_count = self.remaining.size
+
+        self.dependencies.reset(self.remaining == 0)
+        self.start_indexes = np.full(task_count, -1, dtype=np.int64)
+        self.end_indexes = np.full(task_count, -1, dtype=np.int64)
+        self.allocated = np.zeros(task_count, dtype=bool)
+        self.released_groups = set()
+
+        # Allocations by column: (task, effort, remaining work after the allocation)
+        self.allocation_log = {} if record_allocations else None
+
+        self.task_groups = np.full(task_count, -1, dtype=np.int64)
+        for group, tasks in enumerate(self.group_tasks):
+            self.task_groups[tasks] = group
+
+        # Available resources rows whose remaining resources change when a used resources row is updated
+        self.row_incidence = np.zeros((len(self.row_used), self.used.shape[0]), dtype=bool)
+        for row, used_rows in enumerate(self.row_used):
+            self.row_incidence[row, used_rows] = True
+
+        self.group_waves = self._build_group_waves()
+
+        self.group_wave_indexes = np.zeros(len(self.group_tasks), dtype=np.int64)
+        for wave_index, wave in enumerate(self.group_waves):
+            self.group_wave_indexes[wave] = wave_index
+
+        # Active groups: groups with tasks not completed (live), processed from the earliest date they can have ready tasks
+        # (restriction dates as int64, NaT being the minimum value)
+        self.restriction_times = self.restriction_dates.astype(np.int64)
+        self.group_open = np.array([np.count_nonzero(~self.dependencies.completed[tasks]) for tasks in self.group_tasks], dtype=np.int64)
+        self.group_wake = np.full(len(self.group_tasks), self.NEVER, dtype=np.int64)
+        self.live_groups = np.arange(len(self.group_tasks))
+
+        for group in range(len(self.group_tasks)):
+            self._update_group_wake(group)
+
+        self.isolated_groups = self._find_isolated_groups()
+        self.isolated_end = -1
+
+    def checkpoint_state(self):
+        """
+        Copy the state of the allocation loop between two dates, to resume the run later (see restore_state).
+
+        Returns:
+            dict: State arrays (NumPy arrays only).
+        """
+        state = {name: getattr(self, name).copy() for name in self.STATE_ARRAYS}
+
+        state["completed"] = self.dependencies.completed.copy()
+        state["indegree"] = self.dependencies.indegree.copy()
+        state["completed_ids"] = np.array([str(task_id) for task_id in self.dependencies.completed_ids], dtype=str)
+        state["isolated_end"] = np.array(self.isolated_end, dtype=np.int64)
+
+        return state
+
+    def restore_state(self, state):
+        """
+        Restore the state of the allocation loop saved with checkpoint_state, on an engine built with the same inputs.
+        The run is resumed with iter_run from the position after the last processed date.
+
+        Args:
+            state (dict): State arrays.
+        """
+        for name in self.STATE_ARRAYS:
+            setattr(self, name, np.array(state[name], dtype=getattr(self, name).dtype))
+
+        self.dependencies.completed = np.array(state["completed"], dtype=bool)
+        self.dependencies.indegree = np.array(state["indegree"], dtype=np.int64)
+        self.dependencies.completed_ids = [str(task_id) for task_id in state["completed_ids"]]
+        self.dependencies.ready_queue.clear()
+        self.isolated_end = int(state["isolated_end"])
+        self.live_groups = np.arange(len(self.group_tasks))
+
+    def run(self, date_indexes, event_driven = False):
+        """
+        Run the allocation loop for the given date columns.
+
+        Args:
+            date_indexes (iterable of int): Column indexes of the dates to process, in order.
+            event_driven (bool): If True, only the dates where an allocation can happen are processed. 
+                The result is the same as processing every date.
+
+        Returns:
+            list of int: Column indexes of the processed dates.
+        """
+        return list(self.iter_run(date_indexes, event_driven))
+
+    def iter_run(self, date_indexes, event_driven = False, start = 0):
+        """
+        Run the allocation loop for the given date columns, yielding each date column once it is processed 
+        (see run). The allocation loop stops if the generator is not consumed to the end.
+
+        Args:
+            date_indexes (iterable of int): Column indexes of the dates to process, in order.
+            event_driven (bool): If True, only the dates where an allocation can happen are processed.
+            start (int): Position in date_indexes to start from, to resume a run from a restored state 
+                (see restore_state). Default: 0 (new run).
+
+        Yields:
+            int: Column index of each processed date.
+        """
+        date_indexes = list(date_indexes)
+        columns = np.asarray(date_indexes, dtype=np.int64)
+
+        if start == 0:
+            self.isolated_end = self._run_isolated_groups(columns)
+
+        if event_driven:
+            if np.all(np.diff(self.date_values[columns]) > np.timedelta64(0)):
+                yield from self._run_event_driven(columns, start)
+                return
+
+            logger.warning("Dates are not in ascending order. Event-driven time advance disabled: processing every date.")
+
+        for position, date_index in enumerate(date_indexes[start:], start):
+            # Stop when there is no remaining work (isolated tasks finish at their own end date)
+            if self.dependencies.completed.all() and position > self.isolated_end:
+                logger.info("All tasks completed. Stopping schedule update.")
+                break
+
+            self.process_date(date_index)
+            yield date_index
+
+    def _run_event_driven(self, columns, start = 0):
+        """
+        Run the allocation loop jumping to the dates where an allocation can happen, driven by a priority queue of
+        (date position, group) events.
+
+        A group can allocate on a date if it has a ready task and remaining resources. As the used resources of a date 
+        only change when the date is processed, the dates where each group has resources are known in advance. 
+        The next event of a group is the first of those dates on or after the date its first task is ready 
+        (restriction date reached). Tasks released by a completion reschedule the event of their group.
+
+        Args:
+            columns (np.ndarray): Column indexes of the dates to process, in ascending date order.
+            start (int): Date position to start from. The next event of each group only depends on the state of the 
+                tasks, so a restored run schedules the same events.
+
+        Yields:
+            int: Column index of each processed date.
+        """
+        group_count = len(self.group_tasks)
+        capacity_positions = self._group_capacity_positions(columns)
+
+        # First date position where each task is not blocked by its restriction date
+        ready_positions = np.zeros(self.remaining.size, dtype=np.int64)
+        has_date = ~np.isnat(self.restriction_dates)
+        ready_positions[has_date] = np.searchsorted(self.date_values[columns], self.restriction_dates[has_date])
+
+        events = []
+        scheduled = np.full(group_count, -1, dtype=np.int64)
+
+        def schedule(group, start):
+            tasks = self.group_tasks[group]
+            pending = tasks[~self.dependencies.completed[tasks] & (self.dependencies.indegree[tasks] == 0)]
+
+            scheduled[group] = -1
+
+            # Retired groups (isolated groups included)
+            if pending.size == 0 or self.group_open[group] == 0:
+                return
+
+            positions = capacity_positions[group]
+            index = np.searchsorted(positions, max(start, ready_positions[pending].min()))
+
+            if index < positions.size:
+                scheduled[group] = positions[index]
+                heapq.heappush(events, (positions[index], group))
+
+        for group in range(group_count):
+            schedule(group, start)
+
+        processed = 0
+
+        while events:
+            position, group = heapq.heappop(events)
+
+            # Outdated event
+            if scheduled[group] != position:
+                continue
+
+            event_groups = {group}
+            while events and events[0][0] == position:
+                event_groups.add(heapq.heappop(events)[1])
+
+            self.process_date(columns[position])
+            processed += 1
+
+            yield columns[position]
+
+            for group in sorted(event_groups | self.released_groups):
+                schedule(group, position + 1)
+
+        logger.info(f"Event-driven time advance processed {processed} of {columns.size} dates.")
+
+    def _run_isolated_groups(self, columns):
+        """
+        Allocate the isolated groups (see _find_isolated_groups) for all the dates at once.
+
+        The capacity series of an isolated group does not depend on the other groups, so its task receives on each date
+        with resources min(group effort, resources max x period days) until the cumulated allocation reaches its remaining work.
+        The remaining work is accumulated with the same sequence of subtractions as the allocation loop, so the result 
+        is identical. Isolated groups are then retired from the loop.
+
+        Args:
+            columns (np.ndarray): Column indexes of the dates, in processing order.
+
+        Returns:
+            int: Last date position where an isolated task is completed (-1 if none).
+        """
+        isolated_end = -1
+        groups = [group for group in self.isolated_groups if self.group_open[group] > 0]
+
+        if not groups or columns.size == 0:
+            return isolated_end
+
+        row_remaining = self._row_remaining(columns)
+
+        for group in groups:
+            task = self.group_tasks[group][0]
+
+            efforts = self._resources_to_effort(np.maximum(row_remaining[self.group_rows[group]].min(axis=0), 0), columns)
+            positions = np.flatnonzero(efforts != 0)
+
+            if positions.size == 0:
+                continue
+
+            limits = np.minimum(efforts[positions], self.task_capacities(task, columns[positions]))
+
+            # Remaining work before each allocation, and first allocation that completes the task
+            remaining_before = np.subtract.accumulate(np.concatenate(([self.remaining[task]], limits)))[:-1]
+            completing = np.flatnonzero(limits >= remaining_before)
+
+            if completing.size:
+                end = completing[0]
+                positions = positions[:end + 1]
+                allocations = np.append(limits[:end], remaining_before[end])
+            else:
+                allocations = limits
+
+            allocation_columns = columns[positions]
+
+            self.allocated[task] = True
+            self.remaining[task] = remaining_before[positions.size - 1] - allocations[-1]
+
+            if self.start_indexes[task] < 0 and not self.has_start_date[task]:
+                self.start_indexes[task] = allocation_columns[0]
+
+            self.used[np.ix_(self.task_used[task], allocation_columns)] += self._effort_to_resources(allocations, allocation_columns)
+
+            if completing.size:
+                self.remaining[task] = 0
+                self.dependencies.complete(task)
+                self.end_indexes[task] = allocation_columns[-1]
+                isolated_end = max(isolated_end, positions[-1])
+
+            if self.allocation_log is not None:
+                remaining_after = remaining_before[:positions.size] - allocations
+                remaining_after[-1] = self.remaining[task]
+
+                for column, effort, remaining in zip(allocation_columns, allocations, remaining_after):
+                    self.allocation_log.setdefault(column, []).append((task, effort, remaining))
+
+        for group in groups:
+            self.group_open[group] = 0
+
+        logger.debug(f"Isolated groups allocated in closed form: {len(groups)}")
+
+        return isolated_end
+
+    def _find_isolated_groups(self):
+        """
+        Find the isolated groups: groups with a single task without restriction and without tasks waiting for it, 
+        whose resources rows are not affected by the allocations of any other group, and whose allocations do not affect 
+        the resources rows of any other group.
+
+        Returns:
+            list of int: The isolated groups.
+        """
+        group_count = len(self.group_tasks)
+        row_count = len(self.row_used)
+
+        # Rows constraining each group, and rows whose remaining resources change with the allocations of each group
+        group_reads = np.zeros((group_count, row_count), dtype=bool)
+        group_writes = np.zeros((group_count, row_count), dtype=bool)
+
+        for group, tasks in enumerate(self.group_tasks):
+            group_reads[group, self.group_rows[group]] = True
+
+            for task in tasks:
+                group_writes[group] |= self.row_incidence[:, self.task_used[task]].any(axis=1)
+
+        conflicts = (group_writes.astype(np.int64) @ group_reads.T.astype(np.int64)) > 0
+        np.fill_diagonal(conflicts, False)
+        connected = conflicts.any(axis=0) | conflicts.any(axis=1)
+
+        isolated = []
+
+        for group, tasks in enumerate(self.group_tasks):
+            if tasks.size != 1 or connected[group] or self.group_rows[group].size == 0:
+                continue
+
+            task = tasks[0]
+
+            if self.dependencies.predecessors[task] != self.dependencies.NO_PREDECESSOR or \
+                    not np.isnat(self.restriction_dates[task]) or self.dependencies.successors[task].size:
+                continue
+
+            isolated.append(group)
+
+        return isolated
+
+    def estimate_dates(self, columns):
+        """
+        Estimate the start and end dates of the tasks not completed, with an aggregate capacity burn-down instead of the
+        allocation loop (fast, approximate).
+
+        The tasks burn the remaining capacity of their available resources rows in group (priority) order: a task starts 
+        when the cumulated capacity of its rows exceeds the remaining work of the tasks before it, not before its 
+        restriction date, and ends when it covers its own remaining work too. The end is delayed to the date its maximum 
+        resources allow, and tasks start after the end of their Task ID restriction.
+
+        Args:
+            columns (np.ndarray): Column indexes of the dates to estimate, in ascending date order.
+
+        Returns:
+            tuple: Estimated start and end column index of each task (np.ndarray, -1 if completed or out of the dates).
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        task_count = self.remaining.size
+        never = columns.size
+
+        starts = np.full(task_count, never, dtype=np.int64)
+        ends = np.full(task_count, never, dtype=np.int64)
+        pending = ~self.dependencies.completed
+
+        if columns.size == 0 or not pending.any():
+            return np.full(task_count, -1, dtype=np.int64), np.full(task_count, -1, dtype=np.int64)
+
+        remaining = self.remaining.astype(float)
+        row_remaining = self._row_remaining(columns)
+
+        earliest = np.zeros(task_count, dtype=np.int64)
+        has_date = ~np.isnat(self.restriction_dates)
+        earliest[has_date] = np.searchsorted(self.date_values[columns], self.restriction_dates[has_date])
+
+        # Cumulated effort of each available resources row, burnt by the tasks in group (priority) order
+        row_capacities = np.cumsum(
+            np.asarray(self._resources_to_effort(np.maximum(row_remaining, 0), columns), dtype=float), axis=1)
+        row_demands = np.zeros(len(self.row_used))
+
+        for group, tasks in enumerate(self.group_tasks):
+            rows = self.group_rows[group]
+
+            for task in tasks[pending[tasks]]:
+                if rows.size == 0:
+                    continue
+
+                starts[task] = max(
+                    earliest[task], 
+                    max(np.searchsorted(row_capacities[row], row_demands[row], side='right') for row in rows))
+
+                row_demands[rows] += remaining[task]
+                ends[task] = max(np.searchsorted(row_capacities[row], row_demands[row]) for row in rows)
+
+                if np.isfinite(self.resources_max[task]):
+                    capacities = np.cumsum(np.asarray(self.task_capacities(task, columns[starts[task]:]), dtype=float))
+                    ends[task] = max(ends[task], starts[task] + np.searchsorted(capacities, remaining[task]))
+
+        # Task ID restrictions: a task does not start before its predecessor ends (unknown predecessors never end)
+        starts[self.dependencies.predecessors == self.dependencies.UNKNOWN_PREDECESSOR] = never
+        ends[self.dependencies.predecessors == self.dependencies.UNKNOWN_PREDECESSOR] = never
+
+        restricted = np.flatnonzero(pending & (self.dependencies.predecessors >= 0))
+        predecessors = self.dependencies.predecessors[restricted]
+
+        for _ in range(restricted.size):
+            predecessor_ends = np.where(pending[predecessors], ends[predecessors] + 1, 0)
+            delayed_starts = np.maximum(starts[restricted], predecessor_ends)
+            delayed_ends = np.maximum(ends[restricted], delayed_starts)
+
+            if np.array_equal(delayed_starts, starts[restricted]) and np.array_equal(delayed_ends, ends[restricted]):
+                break
+
+            starts[restricted] = delayed_starts
+            ends[restricted] = delayed_ends
+
+        starts = np.where(pending & (starts < never), columns[np.minimum(starts, never - 1)], -1)
+        ends = np.where(pending & (ends < never), columns[np.minimum(ends, never - 1)], -1)
+
+        return starts, ends
+
+    def _row_remaining(self, columns):
+        """
+        Calculate the remaining resources (available - used) of every available resources row on several dates.
+
+        The used resources are summed in the same order as in group_resources, so both give the same values.
+
+        Args:
+            columns (np.ndarray): Column indexes of the dates.
+
+        Returns:
+            np.ndarray: Remaining resources matrix (available rows x columns).
+        """
+        row_remaining = np.empty((len(self.row_used), columns.size), dtype=self.used.dtype)
+
+        for row, used_rows in enumerate(self.row_used):
+            used_sum = np.ascontiguousarray(self.used[used_rows][:, columns].T).sum(axis=1)
+            row_remaining[row] = self.available[row, columns] - used_sum
+
+        return row_remaining
+
+    def _group_capacity_positions(self, columns):
+        """
+        Calculate, for each group, the date positions where it has remaining resources before processing.
+
+        Args:
+            columns (np.ndarray): Column indexes of the dates.
+
+        Returns:
+            list of np.ndarray: Sorted date positions (indexes in columns) where each group has resources.
+        """
+        row_remaining = self._row_remaining(columns)
+        working = self.period_days_available[columns] > 0
+
+        return [
+            np.flatnonzero((row_remaining[rows].min(axis=0) > 0) & working) if rows.size else np.zeros(0, dtype=np.int64)
+            for rows in self.group_rows
+        ]
+
+    def process_date(self, date_index):
+        """
+        Allocate resources to every active group of tasks for a date.
+
+        Args:
+            date_index (int): Column index of the date to process.
+        """
+        current_date = self.date_values[date_index]
+
+        logger.info(f"Processing tasks for date: {np.datetime_as_string(current_date, unit='D')}")
+
+        # Tasks released after their group was processed, by group
+        released_tasks = {}
+        self.released_groups = set()
+
+        # Active groups still to be processed, in processing order. Groups woken up by a release are added on the fly.
+        group_queue = self.active_groups(current_date).tolist()
+        queued_groups = set(group_queue)
+
+        while group_queue:
+            wave_index = self.group_wave_indexes[group_queue[0]]
+            wave_groups = []
+            wave_tasks = []
+            wave_efforts = []
+
+            while group_queue and self.group_wave_indexes[group_queue[0]] == wave_index:
+                group = heapq.heappop(group_queue)
+                tasks = self.group_tasks[group]
+                ready_tasks = tasks[self.ready_mask(tasks, current_date)]
+
+                if ready_tasks.size == 0:
+                    continue
+
+                available_effort = self.group_effort(group, date_index)
+
+                if available_effort == 0:
+                    continue
+
+                wave_groups.append(group)
+                wave_tasks.append(ready_tasks)
+                wave_efforts.append(available_effort)
+
+            if not wave_groups:
+                continue
+
+            ready_tasks = np.concatenate(wave_tasks)
+            offsets = np.cumsum([0] + [tasks.size for tasks in wave_tasks])
+
+            allocations = self.distribute(self.remaining[ready_tasks], self.task_capacities(ready_tasks, date_index), wave_efforts, offsets)
+
+            for task, effort in zip(ready_tasks, allocations):
+                self.allocate(task, effort, date_index)
+
+            woken_groups = self._collect_released_tasks(released_tasks, lambda group: self.group_wave_indexes[group] <= wave_index)
+
+            for group in woken_groups - queued_groups:
+                heapq.heappush(group_queue, group)
+                queued_groups.add(group)
+
+        # Released tasks whose group was already processed are planned in the same period, in group order
+        while released_tasks:
+            group = min(released_tasks)
+            tasks = np.array(sorted(released_tasks.pop(group)), dtype=np.int64)
+
+            available_effort = self.group_effort(group, date_index)
+
+            if available_effort != 0:
+                allocations = self.distribute(self.remaining[tasks], self.task_capacities(tasks, date_index), available_effort)
+
+                for task, effort in zip(tasks, allocations):
+                    self.allocate(task, effort, date_index)
+
+            self._collect_released_tasks(released_tasks, lambda group: True)
+
+    def active_groups(self, current_date):
+        """
+        Select the groups that can have ready tasks on a date: groups with tasks not completed (finished groups are retired)
+        whose earliest restriction date is reached (dormant groups are skipped).
+
+        Args:
+            current_date (np.datetime64): The date being processed.
+
+        Returns:
+            np.ndarray: Active groups, in processing order.
+        """
+        live_groups = self.live_groups[self.group_open[self.live_groups] > 0]
+        self.live_groups = live_groups
+
+        return live_groups[self.group_wake[live_groups] <= current_date.astype(np.int64)]
+
+    def _update_group_wake(self, group):
+        """
+        Update the date from which a group can have ready tasks: the earliest restriction date of its tasks not completed 
+        and not waiting for another task (NEVER if all of them are waiting).
+
+        Args:
+            group (int): Group index.
+        """
+        tasks = self.group_tasks[group]
+        pending = tasks[~self.dependencies.completed[tasks] & (self.dependencies.indegree[tasks] == 0)]
+
+        self.group_wake[group] = self.restriction_times[pending].min() if pending.size else self.NEVER
+
+    def _collect_released_tasks(self, released_tasks, group_processed):
+        """
+        Consume the released tasks of the dependency graph, keeping the ones whose group was already processed.
+
+        Args:
+            released_tasks (dict): Released tasks by group, updated in place.
+            group_processed (callable): Returns True if a group was already processed for the current date.
+
+        Returns:
+            set: Groups with released tasks not processed yet for the current date.
+        """
+        pending_groups = set()
+
+        for task in self.dependencies.pop_ready():
+            group = self.task_groups[task]
+
+            if group < 0 or self.dependencies.completed[task]:
+                continue
+
+            self.released_groups.add(group)
+            self._update_group_wake(group)
+
+            if group_processed(group):
+                released_tasks.setdefault(group, []).append(task)
+            else:
+                pending_groups.add(group)
+
+        return pending_groups
+
+    def _build_group_waves(self):
+        """
+        Split the groups, in processing order, into waves of consecutive groups that do not depend on each other:
+        no group reads resources rows updated by a previous group of its wave, and no task waits for a task of a previous
+        group of its wave. The groups of a wave can then be allocated in one batched distribution.
+
+        Returns:
+            list of list of int: Groups of each wave.
+        """
+        row_count = len(self.row_used)
+        used_count = self.used.shape[0]
+
+        waves = []
+        wave_affected_rows = np.zeros(row_count, dtype=bool)
+        wave_groups = set()
+
+        for group, tasks in enumerate(self.group_tasks):
+            predecessors = self.dependencies.predecessors[tasks]
+            predecessor_groups = set(self.task_groups[predecessors[predecessors >= 0]].tolist())
+
+            if not waves or wave_affected_rows[self.group_rows[group]].any() or predecessor_groups & wave_groups:
+                waves.append([])
+                wave_affected_rows = np.zeros(row_count, dtype=bool)
+                wave_groups = set()
+
+            waves[-1].append(group)
+            wave_groups.add(group)
+
+            touched_used = np.zeros(used_count, dtype=bool)
+            for task in tasks:
+                touched_used[self.task_used[task]] = True
+
+            wave_affected_rows |= self.row_incidence[:, touched_used].any(axis=1)
+
+        return waves
+
+    def ready_mask(self, tasks, current_date):
+        """
+        Select the tasks not yet completed whose restriction is fulfilled on a date.
+
+        Args:
+            tasks (np.ndarray): Task positions to check.
+            current_date (np.datetime64): The date being processed.
+
+        Returns:
+            np.ndarray: Boolean mask aligned with tasks.
+        """
+        restriction_dates = self.restriction_dates[tasks]
+
+        mask = self.dependencies.indegree[tasks] == 0
+        mask &= np.isnat(restriction_dates) | (restriction_dates <= current_date)
+        mask &= ~self.dependencies.completed[tasks]
+
+        return mask
+
+    def group_resources(self, group, date_index):
+        """
+        Calculate the resources available for a group on a date: the minimum remaining resources of its constraining rows.
+
+        Args:
+            group (int): Group index.
+            date_index (int): Column index of the date.
+
+        Returns:
+            float: The minimum available resources after accounting for usage (never negative).
+        """
+        rows = self.group_rows[group]
+
+        if rows.size == 0:
+            return 0
+
+        remaining_resources = min(
+            self.available[row, date_index] - self.used[self.row_used[row], date_index].sum() for row in rows)
+
+        return max(remaining_resources, 0)
+
+    def group_effort(self, group, date_index):
+        """
+        Calculate the effort available for a group on a date: its resources multiplied by the period days.
+
+        Args:
+            group (int): Group index.
+            date_index (int): Column index of the date.
+
+        Returns:
+            float or int: The available effort (fixed-point units if effort_scale is set).
+        """
+        return self._resources_to_effort(self.group_resources(group, date_index), date_index)
+
+    def task_capacities(self, tasks, date_index):
+        """
+        Calculate the maximum effort of tasks in date columns.
+
+        Args:
+            tasks (int or np.ndarray): Task positions.
+            date_index (int or np.ndarray): Column indexes of the dates.
+
+        Returns:
+            np.ndarray: Maximum effort of each task (resources max x period days x dates merged in the column).
+        """
+        capacities = self.resources_max[tasks] * self.period_days_available[date_index] * self.period_lengths[date_index]
+
+        if self.effort_scale is None:
+            return capacities
+
+        return to_fixed_point(capacities, self.effort_scale)
+
+    def _resources_to_effort(self, resources, date_index):
+        """
+        Convert resources to the effort they provide in a period.
+
+        Args:
+            resources (float or np.ndarray): Resources (resource units if effort_scale is set).
+            date_index (int or np.ndarray): Column indexes of the dates.
+
+        Returns:
+            float or np.ndarray: Effort (effort units if effort_scale is set, rounded down).
+        """
+        if self.effort_scale is None:
+            return resources * self.period_days_available[date_index]
+
+        return resources * self.period_days_available[date_index] // self.resource_days
+
+    def _effort_to_resources(self, effort, date_index):
+        """
+        Convert allocated effort to the resources used in the period.
+
+        Args:
+            effort (float or np.ndarray): Effort (effort units if effort_scale is set).
+            date_index (int or np.ndarray): Column indexes of the dates.
+
+        Returns:
+            float or np.ndarray: Used resources (effort / period days). In fixed-point the conversion is exact.
+        """
+        if self.effort_scale is None:
+            return effort / self.period_days_available[date_index]
+
+        return effort * self.period_resource_units[date_index]
+
+    def allocate(self, task, effort, date_index):
+        """
+        Allocate effort to a task on a date, updating its remaining work, dates and the used resources.
+
+        Args:
+            task (int): Task position.
+            effort (float): Effort allocated to the task.
+            date_index (int): Column index of the date.
+        """
+        self.allocated[task] = True
+        self.remaining[task] -= effort
+
+        if self.start_indexes[task] < 0 and not self.has_start_date[task]:
+            self.start_indexes[task] = date_index
+
+        if self.remaining[task] <= 0 and not self.dependencies.completed[task]:
+            self.remaining[task] = 0
+            self.dependencies.complete(task)
+
+            group = self.task_groups[task]
+            self.group_open[group] -= 1
+            self._update_group_wake(group)
+
+            if self.end_indexes[task] < 0:
+                self.end_indexes[task] = date_index
+
+        self.used[self.task_used[task], date_index] += self._effort_to_resources(effort, date_index)
+
+        if self.allocation_log is not None:
+            self.allocation_log.setdefault(date_index, []).append((task, effort, self.remaining[task]))
+
+def distribute_effort(remaining, capacities, available_efforts, offsets = None):
+    """
+    Distribute the available effort of one or several groups of tasks (water-filling).
+
+    Inside each group the effort is shared proportionally to the remaining work of the tasks, capping each task at 
+    min(share, capacity, remaining). The effort a capped task cannot use is shared among the others.
+
+    Instead of redistributing in successive rounds, tasks are sorted by the ratio min(capacity, remaining) / remaining:
+    the capped tasks are always a prefix of that order, and the level of the others is obtained from prefix sums.
+    All the groups are solved at once, the group of each task being given by the segment offsets.
+
+    Args:
+        remaining (np.ndarray): Remaining work of each task.
+        capacities (np.ndarray): Maximum effort each task can receive in the period (resources max x period days).
+        available_efforts (float or np.ndarray): The total available effort of each group.
+        offsets (np.ndarray): Segment offsets: the tasks of group g are [offsets[g], offsets[g + 1]).
+            If None, all the tasks belong to a single group.
+
+    Returns:
+        np.ndarray: Allocation of each task, aligned with the inputs.
+    """
+    remaining = np.asarray(remaining, dtype=float)
+    capacities = np.asarray(capacities, dtype=float)
+
+    if offsets is None:
+        offsets = [0, remaining.size]
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    sizes = np.diff(offsets)
+    available_efforts = np.broadcast_to(np.asarray(available_efforts, dtype=float), sizes.shape)
+
+    allocations = np.zeros(remaining.size)
+
+    if remaining.size == 0:
+        return allocations
+
+    segments = np.repeat(np.arange(sizes.size), sizes)
+    limits = np.minimum(capacities, remaining)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(remaining > 0, limits / remaining, np.inf)
+
+    # Sorting by segment first keeps every segment in its [offsets[g], offsets[g + 1]) range
+    order = np.lexsort((ratios, segments))
+    sorted_remaining = remaining[order]
+    sorted_limits = limits[order]
+
+    def segment_cumsum(values):
+        cumulative = np.cumsum(values)
+        return cumulative - np.repeat(np.append(0, cumulative)[offsets[:-1]], sizes)
+
+    # Effort taken by the tasks sorted before each task, and remaining work of the task and the ones sorted after it
+    limits_before = segment_cumsum(sorted_limits) - sorted_limits
+    remaining_after = np.repeat(np.bincount(segments, weights=sorted_remaining, minlength=sizes.size), sizes)
+    remaining_after -= segment_cumsum(sorted_remaining) - sorted_remaining
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = (available_efforts[segments] - limits_before) * (sorted_remaining / remaining_after)
+
+    # A task is capped if its limit is below its share and all the tasks sorted before it are capped
+    capped = segment_cumsum(~(sorted_limits < shares)) == 0
+
+    capped_effort = np.bincount(segments, weights=np.where(capped, sorted_limits, 0), minlength=sizes.size)
+    free_remaining = np.bincount(segments, weights=np.where(capped, 0, sorted_remaining), minlength=sizes.size)
+    free_effort = available_efforts - capped_effort
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        free_allocations = free_effort[segments] * (sorted_remaining / free_remaining[segments])
+
+    allocations[order] = np.where(capped, sorted_limits, free_allocations)
+    allocations[available_efforts[segments] == 0] = 0
+
+    return allocations
+
+def distribute_effort_fixed_point(remaining, capacities, available_efforts, offsets = None):
+    """
+    Fixed-point version of distribute_effort: all the values are int64 effort units.
+
+    Capped tasks are detected with exact integer comparisons. The free tasks receive the integer part of their
+    proportional share, and the units left are given one by one to the tasks with the largest fractional parts,
+    so the allocations of a group add up exactly to its available effort (unless all its tasks are capped).
+    Tasks with no remaining work are always capped, so no allocation is above the remaining work of its task.
+
+    Args:
+        remaining (np.ndarray): Remaining work of each task (effort units).
+        capacities (np.ndarray): Maximum effort each task can receive in the period (effort units).
+        available_efforts (int or np.ndarray): The total available effort of each group (effort units).
+        offsets (np.ndarray): Segment offsets: the tasks of group g are [offsets[g], offsets[g + 1]).
+            If None, all the tasks belong to a single group.
+
+    Returns:
+        np.ndarray: Allocation of each task (int64 effort units), aligned with the inputs.
+    """
+    remaining = np.asarray(remaining, dtype=np.int64)
+    capacities = np.asarray(capacities, dtype=np.int64)
+
+    if offsets is None:
+        offsets = [0, remaining.size]
+
+    offsets = np.asarray(offsets, dtype=np.int64)
+    sizes = np.diff(offsets)
+    available_efforts = np.broadcast_to(np.asarray(available_efforts, dtype=np.int64), sizes.shape)
+
+    allocations = np.zeros(remaining.size, dtype=np.int64)
+
+    if remaining.size == 0:
+        return allocations
+
+    segments = np.repeat(np.arange(sizes.size), sizes)
+    limits = np.minimum(capacities, remaining)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.where(remaining > 0, limits / remaining, np.inf)
+
+    order = np.lexsort((ratios, segments))
+    sorted_remaining = remaining[order]
+    sorted_limits = limits[order]
+
+    def segment_cumsum(values):
+        cumulative = np.cumsum(values)
+        return cumulative - np.repeat(np.append(0, cumulative)[offsets[:-1]], sizes)
+
+    def segment_sum(values):
+        cumulative = np.append(0, np.cumsum(values))
+        return cumulative[offsets[1:]] - cumulative[offsets[:-1]]
+
+    limits_before = segment_cumsum(sorted_limits) - sorted_limits
+    remaining_after = np.repeat(segment_sum(sorted_remaining), sizes) - (segment_cumsum(sorted_remaining) - sorted_remaining)
+
+    # limit < (effort - limits_before) * remaining / remaining_after, without divisions
+    below_share = sorted_limits * remaining_after < (available_efforts[segments] - limits_before) * sorted_remaining
+    capped = segment_cumsum(~below_share) == 0
+
+    # Finished tasks are capped at 0 and never receive the units left
+    capped |= sorted_remaining == 0
+
+    free_effort = available_efforts - segment_sum(np.where(capped, sorted_limits, 0))
+    free_remaining = segment_sum(np.where(capped, 0, sorted_remaining))
+
+    # Integer part of the proportional shares, and units left to distribute in each group
+    shares = free_effort[segments] * sorted_remaining
+    divisors = np.maximum(free_remaining[segments], 1)
+    free_allocations = np.where(capped, 0, shares // divisors)
+    fractions = np.where(capped, -1, shares % divisors)
+
+    units_left = free_effort - segment_sum(free_allocations)
+
+    # Largest fractional parts first, in original order for ties
+    fraction_order = np.lexsort((order, -fractions, segments))
+    ranks = np.empty(remaining.size, dtype=np.int64)
+    ranks[fraction_order] = np.arange(remaining.size) - np.repeat(offsets[:-1], sizes)
+
+    free_allocations += (~capped & (ranks < units_left[segments])).astype(np.int64)
+
+    allocations[order] = np.where(capped, sorted_limits, free_allocations)
+    allocations[available_efforts[segments] == 0] = 0
+
+    return allocations
@@ -0,0 +1,280 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+
+def connected_components(node_count, edges):
+    """
+    Label the connected components of an undirected graph (union-find with path halving).
+
+    Args:
+        node_count (int): Number of nodes.
+        edges (iterable of (int, int)): Edges between nodes.
+
+    Returns:
+        np.ndarray: Component of each node, numbered 0, 1, ... in order of their first node.
+    """
+    parents = list(range(node_count))
+
+    def find(node):
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    for first, second in edges:
+        first_root, second_root = find(first), find(second)
+
+        if first_root != second_root:
+            parents[max(first_root, second_root)] = min(first_root, second_root)
+
+    roots = np.array([find(node) for node in range(node_count)], dtype=np.int64)
+    _, labels = np.unique(roots, return_inverse=True)
+
+    return labels.astype(np.int64)
+
+class SharedArray:
+    """
+    NumPy array in shared memory, so worker processes read and write it without copying it.
+
+    Attributes:
+        shared_memory (shared_memory.SharedMemory): The shared memory block.
+        array (np.ndarray): The array backed by the block.
+    """
+
+    def __init__(self, shape, dtype, name = None):
+        """
+        Create a shared array, or attach to an existing one.
+
+        Args:
+            shape (tuple): Shape of the array.
+            dtype (np.dtype): Type of the values.
+            name (str, optional): Name of the block to attach to. If None, a new block is created.
+        """
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+
+        self.shared_memory = shared_memory.SharedMemory(name=name, create=name is None, size=nbytes if name is None else 0)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shared_memory.buf)
+
+    @classmethod
+    def from_array(cls, values):
+        """Create a shared array with a copy of values."""
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    def reference(self):
+        """Name, shape and type needed to attach to the array from another process."""
+        return self.shared_memory.name, self.array.shape, self.array.dtype.str
+
+    def close(self, unlink = False):
+        """Release the block (and destroy it if unlink is True)."""
+        del self.array
+        self.shared_memory.close()
+
+        if unlink:
+            self.shared_memory.unlink()
+
+class PartitionedSchedule:
+    """
+    Merged results of the partitions of a schedule, with the attributes of a MatrixScheduleEngine read by 
+    TaskManager._store_matrix_engine.
+
+    Attributes:
+        remaining (np.ndarray): Remaining work per task.
+        start_indexes (np.ndarray): Date index where each task started (-1 if not started during the run).
+        end_indexes (np.ndarray): Date index where each task finished (-1 if not finished during the run).
+        allocated (np.ndarray): True for tasks that received an allocation during the run.
+        used (np.ndarray): Used resources matrix.
+        effort_scale (int): Effort units per person-day in fixed-point mode, None for floats.
+        resource_days (int): Common multiple of the period days in fixed-point mode, None for floats.
+        processed_indexes (list of int): Column indexes processed by any partition, in order.
+        group_tasks, group_rows, row_used, task_used (list of np.ndarray): Tasks and resources rows of the whole 
+            schedule, as in MatrixScheduleEngine.
+    """
+
+    def __init__(self, task_count, used, effort_scale = None, resource_days = None, group_tasks = None, group_rows = None,
+                 row_used = None, task_used = None):
+        """
+        Initialize empty results.
+
+        Args:
+            task_count (int): Number of tasks.
+            used (np.ndarray): Used resources matrix (updated by the partitions).
+            effort_scale (int, optional): Effort units per person-day in fixed-point mode.
+            resource_days (int, optional): Common multiple of the period days in fixed-point mode.
+            group_tasks (list of np.ndarray, optional): Tasks of each group.
+            group_rows (list of np.ndarray, optional): Available resources rows constraining each group.
+            row_used (list of np.ndarray, optional): Used resources rows consumed by each available resources row.
+            task_used (list of np.ndarray, optional): Used resources rows updated by each task.
+        """
+        self.remaining = np.zeros(task_count, dtype=float if effort_scale is None else np.int64)
+        self.start_indexes = np.full(task_count, -1, dtype=np.int64)
+        self.end_indexes = np.full(task_count, -1, dtype=np.int64)
+        self.allocated = np.zeros(task_count, dtype=bool)
+        self.used = used
+        self.effort_scale = effort_scale
+        self.resource_days = resource_days
+        self.processed_indexes = []
+        self.group_tasks = group_tasks
+        self.group_rows = group_rows
+        self.row_used = row_used
+        self.task_used = task_used
+
+    def merge(self, result):
+        """
+        Merge the results of a partition.
+
+        Args:
+            result (dict): Results of schedule_partitions for one partition.
+        """
+        tasks = result["tasks"]
+
+        self.remaining[tasks] = result["remaining"]
+        self.start_indexes[tasks] = result["start_indexes"]
+        self.end_indexes[tasks] = result["end_indexes"]
+        self.allocated[tasks] = result["allocated"]
+        self.processed_indexes = sorted(set(self.processed_indexes) | set(result["processed_indexes"]))
+
+def schedule_partition(partition, available, used, column_count, event_driven = False):
+    """
+    Schedule a partition of tasks with its own MatrixScheduleEngine.
+
+    Args:
+        partition (dict): Engine arguments of the partition (without available and used), with the positions of its 
+            tasks (tasks), available resources rows (available_rows) and used resources rows (used_rows).
+        available (np.ndarray): Available resources rows of the partition.
+        used (np.ndarray): Used resources rows of the partition.
+        column_count (int): Number of matrix columns to process.
+        event_driven (bool): Run the engine with event-driven time advance.
+
+    Returns:
+        dict: Results of the partition: tasks, remaining, start_indexes, end_indexes, allocated, processed_indexes and 
+            used (the updated used resources rows).
+    """
+    inputs = {key: value for key, value in partition.items() if key not in ["tasks", "available_rows", "used_rows"]}
+
+    engine = MatrixScheduleEngine(**inputs, available=available, used=used)
+
+    processed_indexes = engine.run(range(column_count), event_driven=event_driven)
+
+    return {
+        "tasks": partition["tasks"],
+        "remaining": engine.remaining,
+        "start_indexes": engine.start_indexes,
+        "end_indexes": engine.end_indexes,
+        "allocated": engine.allocated,
+        "processed_indexes": processed_indexes,
+        "used": engine.used
+    }
+
+def schedule_partitions(partitions, available_reference, used_reference, column_count, event_driven = False):
+    """
+    Schedule partitions of tasks that do not share resources rows nor dependencies (see schedule_partition).
+
+    The available and used resources matrices are in shared memory. Each partition reads its rows and writes its used 
+    resources rows back: partitions have disjoint rows, so they can run in parallel processes.
+
+    Args:
+        partitions (list of dict): Partitions (see schedule_partition).
+        available_reference (tuple): Reference of the shared available resources matrix (see SharedArray.reference).
+        used_reference (tuple): Reference of the shared used resources matrix.
+        column_count (int): Number of matrix columns to process.
+        event_driven (bool): Run the engines with event-driven time advance.
+
+    Returns:
+        list of dict: Results of each partition (see schedule_partition), without the used resources rows.
+    """
+    available = SharedArray(available_reference[1], available_reference[2], name=available_reference[0])
+    used = SharedArray(used_reference[1], used_reference[2], name=used_reference[0])
+
+    results = []
+
+    try:
+        for partition in partitions:
+            used_rows = partition["used_rows"]
+
+            result = schedule_partition(
+                partition, available.array[partition["available_rows"]], used.array[used_rows], column_count, event_driven)
+
+            used.array[used_rows] = result.pop("used")
+            results.append(result)
+    finally:
+        available.close()
+        used.close()
+
+    return results
+
+def run_partitions(partitions, available, used, column_count, workers, event_driven = False):
+    """
+    Schedule partitions in worker processes, sharing the available and used resources matrices.
+
+    Partitions are distributed among the workers from the largest to the smallest (by number of tasks). 
+    The results do not depend on the number of workers.
+
+    Args:
+        partitions (list of dict): Partitions (see schedule_partitions).
+        available (np.ndarray): Available resources matrix.
+        used (np.ndarray): Used resources matrix. It is not modified.
+        column_count (int): Number of matrix columns to process.
+        workers (int): Number of worker processes. With 1 worker, partitions run in the current process.
+        event_driven (bool): Run the engines with event-driven time advance.
+
+    Returns:
+        tuple: Results of each partition (see schedule_partitions), in partition order, and the updated used resources matrix.
+    """
+    shared_available = SharedArray.from_array(np.ascontiguousarray(available))
+    shared_used = SharedArray.from_array(np.ascontiguousarray(used))
+
+    try:
+        order = sorted(range(len(partitions)), key=lambda partition: -len(partitions[partition]["tasks"]))
+        batches = [order[worker::workers] for worker in range(workers)]
+        batches = [batch for batch in batches if batch]
+
+        arguments = [
+            ([partitions[partition] for partition in batch], shared_available.reference(), shared_used.reference(), column_count, event_driven)
+            for batch in batches
+        ]
+
+        if workers == 1:
+            batch_results = [schedule_partitions(*batch_arguments) for batch_arguments in arguments]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batch_results = list(executor.map(schedule_partitions, *zip(*arguments)))
+
+        results = [None] * len(partitions)
+        for batch, batch_result in zip(batches, batch_results):
+            for partition, result in zip(batch, batch_result):
+                results[partition] = result
+
+        return results, shared_used.array.copy()
+    finally:
+        shared_available.close(unlink=True)
+        shared_used.close(unlink=True)
@@ -0,0 +1,251 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pandas as pd
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from utils.date_utils import safe_to_datetime
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_RESTRICTION, USED_RESOURCE_GOAL, ACCUMULATED_SYNONYMS, ENGINE_PANDAS, PORTFOLIO_PROJECT, 
+    PORTFOLIO_SEPARATOR
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+
+class PortfolioScheduler:
+    """
+    Schedule several projects that share resource pools in a single run.
+
+    Each project has its own tasks, available resources and used resources. They are merged into one schedule:
+
+    - Task IDs, Goals and Task ID restrictions are qualified with the project name (e.g. 'Alpha::T1'), and the project 
+      of each task is stored in the 'Portfolio Project' column.
+    - Available resources rows with the same responsibility values and Goal are the same pool, and are taken once 
+      (from the first project). Rows of a specific Goal are qualified as the tasks.
+    - Used resources rows of the tasks are qualified as the tasks. Accumulated rows (Goal '*' or 'TOTAL') are 
+      recalculated for the whole portfolio.
+
+    After scheduling, the results are split back per project with their original IDs, Goals and restrictions. 
+    The accumulated used resources rows of each project hold the usage of the whole portfolio, so the pools are not 
+    double-booked when a project is later scheduled alone.
+
+    Attributes:
+        projects (dict): Tasks, available resources and used resources DataFrames of each project, by name.
+        engine (str): Scheduling engine.
+        period_days_available (int or str): Number of days to consider for the available resources, or 'auto'.
+        dates ([str]): Dates to schedule (date columns of the available resources).
+        responsible_attr_names ([str]): Responsibility columns of the available resources.
+        available_columns ([str]): Available resources columns, in the order of the first project.
+        schedule_summary (dict): Summary of the last run (see TaskManager.update_task_schedule).
+    """
+
+    def __init__(self, projects, engine = ENGINE_PANDAS, period_days_available = 5):
+        """
+        Initialize the portfolio.
+
+        Args:
+            projects (dict): (tasks_df, available_resources_df, used_resources_df) of each project, by name.
+            engine (str): Scheduling engine (see TaskManager.update_task_schedule). Default is 'pandas'.
+            period_days_available (int or str): Number of days to consider for the available resources. Default is 5.
+
+        Raises:
+            ValueError: If there are no projects, a project name contains the separator, or the projects do not have the 
+                same responsibility columns and dates.
+        """
+        if not projects:
+            raise ValueError("A portfolio needs at least one project.")
+
+        self.projects = {}
+
+        for name, (tasks_df, available_resources_df, used_resources_df) in projects.items():
+            if PORTFOLIO_SEPARATOR in str(name):
+                raise ValueError(f"Invalid project name: {name}. It cannot contain '{PORTFOLIO_SEPARATOR}'.")
+
+            available_resources_df = available_resources_df.rename(columns=ProjectResourceManager._format_date_column_names)
+            used_resources_df = used_resources_df.rename(columns=ProjectResourceManager._format_date_column_names)
+
+            self.projects[name] = (tasks_df, available_resources_df, used_resources_df)
+
+        self.engine = engine
+        self.period_days_available = period_days_available
+
+        first_available = next(iter(self.projects.values()))[1]
+
+        self.dates = [col for col in first_available.columns if safe_to_datetime(col, errors='coerce') is not pd.NaT]
+        self.responsible_attr_names = [col for col in first_available.columns if col != USED_RESOURCE_GOAL and col not in self.dates]
+        self.available_columns = list(first_available.columns)
+        self.schedule_summary = None
+
+        for name, (_, available_resources_df, _) in self.projects.items():
+            if set(available_resources_df.columns) != set(self.available_columns):
+                raise ValueError(
+                    f"Project {name}: the available resources columns must be the same in every project. "
+                    f"Expected {self.available_columns}, found {list(available_resources_df.columns)}")
+
+    @staticmethod
+    def qualify(name, value):
+        """
+        Qualify a task ID or Goal with its project name.
+
+        Args:
+            name (str): Project name.
+            value: Task ID or Goal.
+
+        Returns:
+            str: The qualified value (e.g. 'Alpha::T1').
+        """
+        return f"{name}{PORTFOLIO_SEPARATOR}{value}"
+
+    def merge(self):
+        """
+        Merge the projects into a single schedule.
+
+        Returns:
+            tuple: Merged tasks, available resources and used resources DataFrames. The tasks keep the order of the projects.
+        """
+        tasks_frames = []
+        available_frames = []
+        used_frames = []
+
+        for name, (tasks_df, available_resources_df, used_resources_df) in self.projects.items():
+            tasks_df = tasks_df.copy()
+            task_ids = set(tasks_df[TASK_ID].astype(str))
+
+            tasks_df[PORTFOLIO_PROJECT] = name
+            tasks_df[TASK_ID] = [self.qualify(name, task_id) for task_id in tasks_df[TASK_ID].astype(str)]
+            tasks_df[TASK_GOAL] = [self.qualify(name, goal) for goal in tasks_df[TASK_GOAL]]
+
+            if TASK_RESTRICTION in tasks_df.columns:
+                tasks_df[TASK_RESTRICTION] = [
+                    self.qualify(name, restriction) if pd.notnull(restriction) and str(restriction) in task_ids else restriction
+                    for restriction in tasks_df[TASK_RESTRICTION]
+                ]
+
+            available_resources_df = available_resources_df.copy()
+            specific_goals = ~available_resources_df[USED_RESOURCE_GOAL].isin(ACCUMULATED_SYNONYMS)
+            available_resources_df.loc[specific_goals, USED_RESOURCE_GOAL] = [
+                self.qualify(name, goal) for goal in available_resources_df.loc[specific_goals, USED_RESOURCE_GOAL]
+            ]
+
+            # Accumulated rows are recalculated for the whole portfolio by the used resources initializer
+            used_resources_df = used_resources_df[~used_resources_df[USED_RESOURCE_GOAL].isin(ACCUMULATED_SYNONYMS)].copy()
+            used_resources_df[USED_RESOURCE_GOAL] = [self.qualify(name, goal) for goal in used_resources_df[USED_RESOURCE_GOAL]]
+
+            tasks_frames.append(tasks_df)
+            available_frames.append(available_resources_df[self.available_columns])
+            used_frames.append(used_resources_df)
+
+        available_resources_df = pd.concat(available_frames, ignore_index=True)
+        pool_columns = self.responsible_attr_names + [USED_RESOURCE_GOAL]
+
+        pools = available_resources_df.astype({column: str for column in pool_columns})
+        duplicated = pools.duplicated(subset=pool_columns)
+
+        if (pools.duplicated(subset=pool_columns + self.dates) != duplicated).any():
+            logger.warning("Available resources rows of the same pool differ between projects. The first project's values are used.")
+
+        available_resources_df = available_resources_df[~duplicated].reset_index(drop=True)
+
+        logger.info(f"Portfolio of {len(self.projects)} projects merged: {sum(len(frame) for frame in tasks_frames)} tasks, "
+                    f"{len(available_resources_df)} available resources rows.")
+
+        return (
+            pd.concat(tasks_frames, ignore_index=True), available_resources_df, pd.concat(used_frames, ignore_index=True)
+        )
+
+    def run(self, **options):
+        """
+        Schedule every project in a single run against the merged resource pools.
+
+        Args:
+            **options: Options of TaskManager.update_task_schedule (e.g. engine, horizon_end, effort_scale).
+
+        Returns:
+            dict: Updated tasks and used resources DataFrames of each project, by name (see split).
+        """
+        tasks_df, available_resources_df, used_resources_df = self.merge()
+
+        resource_manager = ProjectResourceManager(available_resources_df, used_resources_df, tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager, period_days_available=self.period_days_available)
+
+        options.setdefault("engine", self.engine)
+        updated_tasks_df = task_manager.update_task_schedule(self.dates, **options)
+
+        self.schedule_summary = task_manager.schedule_summary
+
+        return self.split(updated_tasks_df, resource_manager.used_resources_manager.used_resources_df)
+
+    def split(self, tasks_df, used_resources_df):
+        """
+        Split a merged schedule back into its projects.
+
+        Tasks get their original index, order, IDs, Goals and restrictions. Used resources rows are the ones of the 
+        project's Goals, and the accumulated rows of the project's available resources, with the project's columns.
+
+        Args:
+            tasks_df (pd.DataFrame): Merged tasks DataFrame after scheduling.
+            used_resources_df (pd.DataFrame): Merged used resources DataFrame after scheduling.
+
+        Returns:
+            dict: (tasks_df, used_resources_df) of each project, by name.
+        """
+        tasks_df = tasks_df.sort_index()
+        all_task_columns = set().union(*[project_tasks.columns for project_tasks, _, _ in self.projects.values()])
+
+        accumulated = used_resources_df[USED_RESOURCE_GOAL].isin(ACCUMULATED_SYNONYMS)
+        used_pools = used_resources_df[self.responsible_attr_names].astype(str).apply(tuple, axis=1)
+
+        results = {}
+        offset = 0
+
+        for name, (project_tasks, available_resources_df, project_used) in self.projects.items():
+            project_result = tasks_df.iloc[offset:offset + len(project_tasks)].copy()
+            offset += len(project_tasks)
+
+            project_result.index = project_tasks.index
+
+            for column in [TASK_ID, TASK_GOAL, TASK_RESTRICTION]:
+                if column in project_tasks.columns:
+                    project_result[column] = project_tasks[column]
+
+            # Keep the columns added by the scheduler, but not the ones of other projects
+            project_result = project_result.drop(columns=[PORTFOLIO_PROJECT] + [
+                column for column in all_task_columns if column not in project_tasks.columns and column in project_result.columns
+            ])
+
+            prefix = self.qualify(name, "")
+            project_goals = used_resources_df[USED_RESOURCE_GOAL].astype(str).str.startswith(prefix)
+
+            pools = set(available_resources_df[self.responsible_attr_names].astype(str).apply(tuple, axis=1))
+            project_rows = project_goals | (accumulated & used_pools.isin(pools))
+
+            project_used_result = used_resources_df[project_rows].copy()
+            project_used_result.loc[project_goals[project_rows], USED_RESOURCE_GOAL] = [
+                goal[len(prefix):] for goal in project_used_result.loc[project_goals[project_rows], USED_RESOURCE_GOAL]
+            ]
+
+            results[name] = (project_result, project_used_result[list(project_used.columns)].reset_index(drop=True))
+
+        return results
@@ -24,6 +24,7 @@
 # pandas_conf imported to avoid the warning: "SettingWithCopyWarning: A value is trying to be set on a copy of a slice from a DataFrame."
 import scheduler.pandas_conf
 
+import numpy as np
 import pandas as pd
 
 from utils.date_utils import safe_to_datetime
@@ -31,6 +32,9 @@ from utils.date_utils import safe_to_datetime
 from scheduler.project_used_resources_initializer import ProjectUsedResourceManagerInitializer
 from scheduler.project_used_resource_manager import ProjectUsedResourceManager
 from scheduler.project_scheduler_constants import USED_RESOURCE_GOAL, ACCUMULATED_SYNONYMS
+from scheduler.project_fixed_point import to_fixed_point
+from scheduler.project_partition import connected_components
+from scheduler.project_capacity_ledger import CapacityLedger
 
 from utils.logger import create_logger
 logger = create_logger(__name__)
@@ -115,6 +119,8 @@ class ProjectResourceManager:
         initializer = ProjectUsedResourceManagerInitializer(used_resources_df, tasks_df, self.responsible_df)        
         self.used_resources_manager = initializer.initialize_used_resource_manager()  
 
+        self._capacity_ledger = None
+
     @staticmethod
     def _format_date_column_names(col_name):
         
@@ -151,9 +157,88 @@ class ProjectResourceManager:
         Raises:
             ValueError: If the date column is missing or if required filters are not provided.
         """        
-        if current_date not in self.available_resources_df.columns or safe_to_datetime(current_date, errors='coerce') is pd.NaT:
+        ledger = self.capacity_ledger()
+
+        # The ledger dates are the date columns of the available resources
+        if current_date not in ledger.dates:
             raise ValueError(f"Invalid or missing date column: {current_date}")
 
+        missing_filters = [col for col in self.responsible_attr_names if col not in filters]
+
+        if missing_filters:
+            raise ValueError(f"Missing required filters: {', '.join(missing_filters)}")
+
+        return ledger.remaining(current_date, **filters)
+
+    def capacity_ledger(self):
+        """
+        Obtain the capacity ledger of the available and used resources, building it again if the resources were changed 
+        by other means than update_goal_resources since it was built.
+
+        Returns:
+            CapacityLedger: The capacity ledger.
+        """
+        if not self._capacity_ledger_synced():
+            date_columns = [col for col in self.available_resources_df.columns if safe_to_datetime(col, errors='coerce') is not pd.NaT]
+
+            used_manager = self.used_resources_manager
+
+            self._capacity_ledger = CapacityLedger(
+                self.available_resources_df, used_manager.info_df, used_manager.used_resources_matrix(date_columns), self.responsible_attr_names, date_columns)
+            self._capacity_ledger.source = self._capacity_ledger_source()
+
+        return self._capacity_ledger
+
+    def _capacity_ledger_source(self):
+        return (self.available_resources_df, self.used_resources_manager, self.used_resources_manager.values_version)
+
+    def _capacity_ledger_synced(self):
+        # Changes made to the used resources DataFrame since it was handed out are loaded first
+        self.used_resources_manager.sync()
+
+        if self._capacity_ledger is None:
+            return False
+
+        available_df, used_manager, values_version = self._capacity_ledger.source
+
+        return (available_df is self.available_resources_df and used_manager is self.used_resources_manager and 
+                values_version == used_manager.values_version)
+    
+    def available_resources_matrix(self, dates, scale = None):
+        """
+        Obtain the available resources of several dates as a matrix (available resources rows x dates).
+
+        Args:
+            dates ([str]): Date columns to obtain.
+            scale (int, optional): If provided, the resources are returned as int64 fixed-point units of 1 / scale.
+
+        Returns:
+            np.ndarray: The available resources matrix.
+
+        Raises:
+            ValueError: If a date column is invalid or does not exist.
+        """
+        for date in dates:
+            if date not in self.available_resources_df.columns or safe_to_datetime(date, errors='coerce') is pd.NaT:
+                raise ValueError(f"Invalid or missing date column: {date}")
+
+        values = self.available_resources_df[list(dates)].to_numpy(dtype=float).reshape(self.available_resources_df.shape[0], len(dates))
+
+        return values if scale is None else to_fixed_point(values, scale)
+
+    def goal_resources_mask(self, **filters):
+        """
+        Select the available resources rows that constrain a responsibility, considering wildcards.
+
+        Args:
+            **filters (dict): Dynamic filter values to apply, should include the columns defined in available resources.
+
+        Returns:
+            pd.Series: Boolean mask over the available resources rows.
+
+        Raises:
+            ValueError: If required filters are not provided.
+        """
         valid_columns = self.responsible_attr_names
         missing_filters = [col for col in valid_columns if col not in filters]
 
@@ -174,24 +259,49 @@ class ProjectResourceManager:
             # Apply wildcard filtering directly with boolean indexing
             mask &= (self.available_resources_df[col].isin(ACCUMULATED_SYNONYMS)) | (self.available_resources_df[col] == val)
 
-        filtered_df = self.available_resources_df.loc[mask]
-        
-        if filtered_df.empty:
-            return 0
+        return mask
 
-        remaining_resources = float('inf')
-        
-        # Aggregate remaining resources
-        def calculate_remaining(row):
-            responsibility_filters = {col: row[col] for col in self.responsible_attr_names + [USED_RESOURCE_GOAL]}
-            available = row[current_date]
-            used = self.used_resources_manager.obtain_used_goal_resources(current_date, **responsibility_filters)
-            return available - used
+    def available_used_rows(self):
+        """
+        Obtain the used resources rows consumed by each available resources row, considering wildcards.
 
-        remaining_resources = filtered_df.apply(calculate_remaining, axis=1).min()
+        Returns:
+            list of np.ndarray: Used resources rows of each available resources row.
+        """
+        used_manager = self.used_resources_manager
+        row_filter_columns = self.responsible_attr_names + [USED_RESOURCE_GOAL]
+
+        return [
+            np.flatnonzero(used_manager.goal_resources_mask(**{col: row[col] for col in row_filter_columns}).to_numpy())
+            for _, row in self.available_resources_df.iterrows()
+        ]
+
+    def resource_components(self, row_used = None):
+        """
+        Group the available and used resources rows into connected components: rows are connected when an available 
+        resources row consumes a used resources row (see available_used_rows). Rows of different components never 
+        constrain each other.
+
+        Args:
+            row_used (list of np.ndarray, optional): Used resources rows of each available resources row. 
+                Default: calculated with available_used_rows.
+
+        Returns:
+            tuple: Component of each available resources row and component of each used resources row (np.ndarray).
+        """
+        if row_used is None:
+            row_used = self.available_used_rows()
+
+        available_count = len(row_used)
+        used_count = self.used_resources_manager.info_df.shape[0]
+
+        edges = [(row, available_count + used_row) for row, used_rows in enumerate(row_used) for used_row in used_rows]
+        components = connected_components(available_count + used_count, edges)
+
+        logger.debug(f"{np.unique(components).size} resource components found.")
+
+        return components[:available_count], components[available_count:]
 
-        return max(remaining_resources, 0)  # Ensure no negative values
-    
     def update_goal_resources (self, current_date, resources_used, **goal_filter):
 
         logger.debug(f"Updating resources for date {current_date} and goal {goal_filter}")
@@ -199,10 +309,44 @@ class ProjectResourceManager:
         filter_keys = self.responsible_attr_names + [USED_RESOURCE_GOAL]
 
         responsible_filter = {key: goal_filter[key] for key in filter_keys if key in goal_filter}
+
+        ledger_synced = self._capacity_ledger_synced()
         
         self.used_resources_manager.update_used_resources(current_date, resources_used, True, **responsible_filter)
 
+        # The ledger follows the update instead of being built again
+        if ledger_synced:
+            self._capacity_ledger.update(current_date, resources_used, **responsible_filter)
+            self._capacity_ledger.source = self._capacity_ledger_source()
+
         logger.debug(f"Resources updated for date {current_date} and goal {goal_filter}")
 
+    def update_goal_resources_batch(self, current_date, goal_filters, resources_used):
+        """
+        Update the used resources of several goals on a date at once, with the same result as calling 
+        update_goal_resources for each of them in order.
+
+        Args:
+            current_date (str): The date column to update.
+            goal_filters (list of dict or pd.Series): Responsibility values and Goal of each usage (e.g. the tasks). 
+                Other keys are ignored.
+            resources_used (list of float): Amount of resources of each usage.
+        """
+        filter_keys = self.responsible_attr_names + [USED_RESOURCE_GOAL]
+
+        responsible_filters = [{key: goal_filter[key] for key in filter_keys if key in goal_filter} for goal_filter in goal_filters]
+
+        ledger_synced = self._capacity_ledger_synced()
+
+        self.used_resources_manager.update_used_resources_batch(current_date, responsible_filters, resources_used)
+
+        if ledger_synced:
+            for responsible_filter, amount in zip(responsible_filters, resources_used):
+                self._capacity_ledger.update(current_date, amount, **responsible_filter)
+
+            self._capacity_ledger.source = self._capacity_ledger_source()
+
+        logger.debug(f"Resources updated for date {current_date} and {len(responsible_filters)} goals")
+
     def get_dayfirst(self):
         return self.__class__.DAYFIRST
\ No newline at end of file
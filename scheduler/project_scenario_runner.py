@@ -0,0 +1,223 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from utils.util_constants import CONF_HOLIDAYS
+from utils.app_config import AppConfig
+from utils.date_utils import safe_to_datetime
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_END_DATE, ENGINE_PANDAS, SCENARIO_BASELINE, SCENARIO_NAME, SCENARIO_CAPACITY,
+    SCENARIO_CAPACITY_DELTA, SCENARIO_CAPACITY_FROM, SCENARIO_CAPACITY_TO, SCENARIO_PRIORITY, SCENARIO_HOLIDAYS, 
+    SCENARIO_PERIOD, SCENARIO_ENGINE
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_core import load_holidays
+
+class ScenarioRunner:
+    """
+    Run what-if scenarios over a schedule loaded once, and compare their End Dates.
+
+    A scenario is a dictionary with a name and the overrides to apply to the baseline schedule:
+
+    - capacity: List of capacity changes. Each one has the responsibility column values of the available resources rows
+      to change (e.g. {"Team": "Team B"}), the resources to add (delta, negative to remove) and optionally the first and 
+      last dates to change (from, to).
+    - priority: New priority by task ID (e.g. {"T1": 1}).
+    - holidays: List of bank holidays.
+    - period: Number of days to consider for the available resources, or 'auto' (see TaskManager).
+    - engine: Scheduling engine (see TaskManager.update_task_schedule).
+
+    E.g.: {"name": "Team B +2", "capacity": [{"Team": "Team B", "delta": 2}], "priority": {"T7": 1}}
+
+    Each scenario is scheduled on copies of the DataFrames, optionally in a worker process.
+
+    Attributes:
+        tasks_df (pd.DataFrame): Baseline tasks.
+        available_resources_df (pd.DataFrame): Baseline available resources.
+        used_resources_df (pd.DataFrame): Baseline used resources.
+        dates ([str]): Dates to schedule (date columns of the available resources).
+        engine (str): Default scheduling engine.
+        period_days_available (int or str): Default period.
+    """
+
+    def __init__(self, tasks_df, available_resources_df, used_resources_df, engine = ENGINE_PANDAS, period_days_available = 5):
+        """
+        Initialize the runner with the baseline schedule.
+
+        Args:
+            tasks_df (pd.DataFrame): Baseline tasks.
+            available_resources_df (pd.DataFrame): Baseline available resources.
+            used_resources_df (pd.DataFrame): Baseline used resources.
+            engine (str): Default scheduling engine. Default is 'pandas'.
+            period_days_available (int or str): Default period. Default is 5 days.
+        """
+        self.tasks_df = tasks_df
+        self.available_resources_df = available_resources_df
+        self.used_resources_df = used_resources_df
+        self.engine = engine
+        self.period_days_available = period_days_available
+
+        self.dates = [
+            col for col in available_resources_df.columns if safe_to_datetime(col, errors='coerce') is not pd.NaT
+        ]
+
+    def run(self, scenarios, workers = None):
+        """
+        Schedule the baseline and every scenario, and build the End Dates comparison table.
+
+        Args:
+            scenarios (list of dict): Scenarios to run.
+            workers (int, optional): Number of worker processes. Default: scenarios run in the current process.
+
+        Returns:
+            pd.DataFrame: Task ID and Goal, and the End Date of each task in the baseline and each scenario 
+                (one column per scenario name).
+
+        Raises:
+            ValueError: If a scenario is not valid, or the number of workers is not a positive integer.
+        """
+        if workers is not None and (not isinstance(workers, int) or workers <= 0):
+            raise ValueError(f"Invalid number of workers: {workers}. It must be a positive integer.")
+
+        scenarios = [{SCENARIO_NAME: SCENARIO_BASELINE}] + list(scenarios)
+        names = [scenario.get(SCENARIO_NAME) for scenario in scenarios]
+
+        if any(name is None for name in names) or len(set(names)) < len(names):
+            raise ValueError(f"Scenarios must have unique names (and '{SCENARIO_BASELINE}' is reserved): {names[1:]}")
+
+        inputs = [self.apply_scenario(scenario) for scenario in scenarios]
+        config = dict(AppConfig.settings)
+
+        logger.info(f"Running {len(scenarios)} scenarios on {workers or 1} process(es)...")
+
+        if workers is None or workers == 1:
+            end_dates = [schedule_scenario(*scenario_inputs, config) for scenario_inputs in inputs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                end_dates = list(executor.map(schedule_scenario, *zip(*inputs), [config] * len(inputs)))
+
+        comparison = self.tasks_df[[TASK_ID, TASK_GOAL]].copy()
+
+        # End Dates are aligned on the tasks DataFrame index
+        for name, scenario_end_dates in zip(names, end_dates):
+            comparison[name] = scenario_end_dates
+
+        return comparison
+
+    def apply_scenario(self, scenario):
+        """
+        Apply the overrides of a scenario to copies of the baseline DataFrames.
+
+        Args:
+            scenario (dict): The scenario.
+
+        Returns:
+            tuple: Tasks, available resources and used resources DataFrames, dates, engine, period and holidays 
+                (None to keep the configured ones) of the scenario.
+
+        Raises:
+            ValueError: If a capacity change matches no available resources row, or a priority change an unknown task.
+        """
+        tasks_df = self.tasks_df.copy()
+        available_resources_df = self.available_resources_df.copy()
+
+        for change in scenario.get(SCENARIO_CAPACITY, []):
+            filters = {
+                key: value for key, value in change.items() 
+                if key not in [SCENARIO_CAPACITY_DELTA, SCENARIO_CAPACITY_FROM, SCENARIO_CAPACITY_TO]
+            }
+
+            mask = pd.Series(True, index=available_resources_df.index)
+            for column, value in filters.items():
+                if column not in available_resources_df.columns:
+                    raise ValueError(f"Scenario {scenario[SCENARIO_NAME]}: unknown available resources column {column}")
+                mask &= available_resources_df[column].astype(str) == str(value)
+
+            if not mask.any():
+                raise ValueError(f"Scenario {scenario[SCENARIO_NAME]}: no available resources row matches {filters}")
+
+            first = safe_to_datetime(change.get(SCENARIO_CAPACITY_FROM)) if change.get(SCENARIO_CAPACITY_FROM) else None
+            last = safe_to_datetime(change.get(SCENARIO_CAPACITY_TO)) if change.get(SCENARIO_CAPACITY_TO) else None
+
+            columns = [
+                date for date in self.dates 
+                if (first is None or safe_to_datetime(date) >= first) and (last is None or safe_to_datetime(date) <= last)
+            ]
+
+            available_resources_df.loc[mask, columns] = (
+                available_resources_df.loc[mask, columns].astype(float) + change.get(SCENARIO_CAPACITY_DELTA, 0)
+            )
+
+        for task_id, priority in scenario.get(SCENARIO_PRIORITY, {}).items():
+            mask = tasks_df[TASK_ID].astype(str) == str(task_id)
+
+            if not mask.any():
+                raise ValueError(f"Scenario {scenario[SCENARIO_NAME]}: unknown task {task_id}")
+
+            tasks_df.loc[mask, TASK_PRIORITY] = priority
+
+        return (
+            tasks_df, available_resources_df, self.used_resources_df.copy(), self.dates,
+            scenario.get(SCENARIO_ENGINE, self.engine), scenario.get(SCENARIO_PERIOD, self.period_days_available), 
+            scenario.get(SCENARIO_HOLIDAYS)
+        )
+
+def schedule_scenario(tasks_df, available_resources_df, used_resources_df, dates, engine, period_days_available, holidays, config):
+    """
+    Schedule a scenario. The configuration is loaded in the process and restored afterwards.
+
+    Args:
+        tasks_df (pd.DataFrame): Tasks of the scenario.
+        available_resources_df (pd.DataFrame): Available resources of the scenario.
+        used_resources_df (pd.DataFrame): Used resources of the scenario.
+        dates ([str]): Dates to schedule.
+        engine (str): Scheduling engine.
+        period_days_available (int or str): Number of days to consider for the available resources, or 'auto'.
+        holidays (list, optional): Bank holidays of the scenario. None to keep the configured ones.
+        config (dict): Application configuration settings.
+
+    Returns:
+        pd.Series: End Date of each task, with the index of the tasks DataFrame (tasks are sorted by priority when scheduled).
+    """
+    settings = dict(AppConfig.settings)
+
+    try:
+        AppConfig.load_dict(config)
+
+        if holidays is not None:
+            AppConfig()[CONF_HOLIDAYS] = load_holidays(holidays)
+
+        resource_manager = ProjectResourceManager(available_resources_df, used_resources_df, tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager, period_days_available=period_days_available)
+
+        return task_manager.update_task_schedule(dates, engine=engine)[TASK_END_DATE]
+    finally:
+        AppConfig.settings.clear()
+        AppConfig.settings.update(settings)
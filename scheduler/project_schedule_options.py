@@ -0,0 +1,185 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from scheduler.project_scheduler_constants import ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT, RESOLUTION_MONTH
+from scheduler.project_checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from scheduler.project_fixed_point import check_effort_scale
+
+# Options only available with the matrix engines, and the feature they enable
+MATRIX_ENGINE_OPTIONS = {
+    "effort_scale": "Fixed-point effort",
+    "resolution_cutoff": "Multi-resolution periods",
+    "workers": "Partition-parallel scheduling",
+    "coordinator": "Partition-parallel scheduling",
+    "previous_state": "Incremental re-scheduling",
+    "checkpoint_path": "Checkpoints",
+    "time_budget": "Time budgets"
+}
+
+# Options that run a single engine, and the options they cannot be combined with
+SINGLE_ENGINE_OPTIONS = {
+    "checkpoint_path": ["workers", "coordinator", "previous_state"],
+    "time_budget": ["workers", "coordinator", "previous_state", "checkpoint_path"]
+}
+
+# Options that are not available when the schedule is streamed (see TaskManager.iter_schedule)
+STREAMING_UNAVAILABLE_OPTIONS = ["workers", "coordinator", "previous_state", "checkpoint_path", "time_budget"]
+
+class ScheduleOptions:
+    """
+    Engine and run options of TaskManager.update_task_schedule and TaskManager.iter_schedule.
+
+    All the checks of the option values and of their combinations are done in validate. Horizon and resolution values 
+    depend on the dates, and are checked when the dates are selected (see TaskManager.select_horizon_dates and 
+    TaskManager.select_resolution_periods).
+
+    Usage:
+        options = ScheduleOptions(engine=ENGINE_MATRIX, effort_scale=1000, workers=4)
+        task_manager.update_task_schedule(dates, options)
+
+    Attributes:
+        engine (str): Scheduling engine. 'pandas' (default) allocates working on the DataFrames, 'matrix' loads tasks and 
+            resources into NumPy arrays once and runs the allocation loop on them (see MatrixScheduleEngine). 'event' runs 
+            the matrix engine with event-driven time advance, skipping the dates where no allocation can happen. All the 
+            engines produce the same schedule.
+        horizon_start (str or datetime): Dates before it are not processed.
+        horizon_end (str or datetime): Dates after it are not processed.
+        max_periods (int): Maximum number of dates to process.
+        effort_scale (int): Matrix engines only. If provided, effort is handled as int64 fixed-point units of 
+            1 / effort_scale person-day (e.g. 1000), so remaining work comparisons are exact. Values are converted back to 
+            floats when stored in the DataFrames.
+        resolution_cutoff (str or datetime): Matrix engines only. Dates after it are merged into coarser periods 
+            (see TaskManager.select_resolution_periods). Dates up to it keep their own period.
+        coarse_resolution (str): Resolution of the merged periods: 'month' (default) or 'quarter'.
+        workers (int): Matrix engines only. If provided, tasks are split into partitions that share no resources rows nor 
+            Task ID restrictions (see TaskManager.matrix_partitions), and the partitions are scheduled on this number of 
+            worker processes. The schedule is the same as without partitions.
+        coordinator (ScheduleCoordinator): Matrix engines only. If provided, the partitions are scheduled by the workers 
+            connected to the coordinator instead of local worker processes.
+        previous_state (ScheduleState): Matrix engines only. State of a previous run (an empty ScheduleState for the 
+            first one). Only the partitions of the tasks whose Schedule, Available Resources or Used Resources inputs 
+            changed are re-planned; the other ones reuse their previous allocations, also in a run on later dates if 
+            they had nothing allocated on the dates left behind. The schedule is the same as a full run. Reuse is per 
+            partition (see TaskManager.matrix_partitions): tasks sharing a resources row, such as a single TOTAL or '*' 
+            row, are all in one partition and are re-planned together. The state of the run is stored in 
+            TaskManager.schedule_state, and the re-planned task IDs in schedule_summary['replanned_tasks'].
+        checkpoint_path (str): Matrix engines only, without partitions. Path of a checkpoint file (NumPy .npz) saved 
+            periodically during the run. If it holds the state of an interrupted run with the same inputs, the run is 
+            resumed from it, with the same result as an uninterrupted run. It is removed when the run finishes.
+        checkpoint_interval (int): Number of processed dates between checkpoints. Default: 10.
+        time_budget (float): Matrix engines only, without partitions nor checkpoints. Maximum time in seconds of the 
+            allocation loop ('anytime' mode). The dates processed within the budget (at least one) are planned exactly; 
+            the Start and End Dates of the tasks not completed on them are estimated with a capacity burn-down (see 
+            MatrixScheduleEngine.estimate_dates). The Estimated column tells the estimated tasks, and their IDs are stored 
+            in schedule_summary['estimated_tasks']. Remaining and Used Resources only include the exact allocations.
+    """
+
+    def __init__(self, engine = ENGINE_PANDAS, horizon_start = None, horizon_end = None, max_periods = None, 
+                 effort_scale = None, resolution_cutoff = None, coarse_resolution = RESOLUTION_MONTH, workers = None,
+                 coordinator = None, previous_state = None, checkpoint_path = None, 
+                 checkpoint_interval = DEFAULT_CHECKPOINT_INTERVAL, time_budget = None):
+        """
+        Initialize the options (see the class attributes). They are not checked until validate is called.
+        """
+        self.engine = engine
+        self.horizon_start = horizon_start
+        self.horizon_end = horizon_end
+        self.max_periods = max_periods
+        self.effort_scale = effort_scale
+        self.resolution_cutoff = resolution_cutoff
+        self.coarse_resolution = coarse_resolution
+        self.workers = workers
+        self.coordinator = coordinator
+        self.previous_state = previous_state
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.time_budget = time_budget
+
+    @property
+    def event_driven(self):
+        """bool: True if the matrix engine runs with event-driven time advance."""
+        return self.engine == ENGINE_EVENT
+
+    @property
+    def partitioned(self):
+        """bool: True if the tasks are scheduled in partitions (workers, coordinator or incremental runs)."""
+        return self.workers is not None or self.coordinator is not None or self.previous_state is not None
+
+    def validate(self, streaming = False):
+        """
+        Check the option values and their combinations.
+
+        Args:
+            streaming (bool): Check the options for TaskManager.iter_schedule: only the matrix engines, and none of the 
+                STREAMING_UNAVAILABLE_OPTIONS (partitions, incremental runs, checkpoints and time budgets).
+
+        Raises:
+            ValueError: If the engine is unknown, an option value is not valid, an option is only available with the 
+                matrix engines and the engine is 'pandas', two options cannot be combined, or (when streaming) the 
+                engine or an option are not available when streaming.
+        """
+        if self.engine not in [ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT]:
+            raise ValueError(f"Invalid scheduling engine: {self.engine}. Possible values: {ENGINE_PANDAS}, {ENGINE_MATRIX}, {ENGINE_EVENT}")
+
+        if streaming:
+            if self.engine not in [ENGINE_MATRIX, ENGINE_EVENT]:
+                raise ValueError(f"Invalid streaming engine: {self.engine}. Possible values: {ENGINE_MATRIX}, {ENGINE_EVENT}")
+
+            for option in STREAMING_UNAVAILABLE_OPTIONS:
+                if getattr(self, option) is not None:
+                    raise ValueError(f"{MATRIX_ENGINE_OPTIONS[option]} ({option}) is not available when streaming the schedule.")
+
+        if self.effort_scale is not None:
+            check_effort_scale(self.effort_scale)
+
+        if self.workers is not None and (not isinstance(self.workers, (int, np.integer)) or self.workers <= 0):
+            raise ValueError(f"Invalid number of workers: {self.workers}. It must be a positive integer.")
+
+        if self.checkpoint_path is not None and (
+                not isinstance(self.checkpoint_interval, (int, np.integer)) or self.checkpoint_interval <= 0):
+            raise ValueError(f"Invalid checkpoint interval: {self.checkpoint_interval}. It must be a positive integer.")
+
+        if self.time_budget is not None and (
+                not isinstance(self.time_budget, (int, float, np.integer, np.floating)) or isinstance(self.time_budget, bool) 
+                or not self.time_budget >= 0):
+            raise ValueError(f"Invalid time budget: {self.time_budget}. It must be a number of seconds >= 0.")
+
+        if self.engine == ENGINE_PANDAS:
+            for option, feature in MATRIX_ENGINE_OPTIONS.items():
+                if getattr(self, option) is not None:
+                    raise ValueError(f"{feature} ({option}) is only available with the {ENGINE_MATRIX} and {ENGINE_EVENT} engines.")
+
+        for option, excluded_options in SINGLE_ENGINE_OPTIONS.items():
+            if getattr(self, option) is None:
+                continue
+
+            conflicts = [excluded for excluded in excluded_options if getattr(self, excluded) is not None]
+
+            if conflicts:
+                raise ValueError(
+                    f"{MATRIX_ENGINE_OPTIONS[option]} ({option}) cannot be combined with {', '.join(conflicts)}: "
+                    f"it is only available with a single {ENGINE_MATRIX} or {ENGINE_EVENT} engine.")
@@ -0,0 +1,255 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_REMAINING, TASK_END_DATE, TASK_BLOCKED_DAYS, TASK_REMAINING_MIN, TASK_REMAINING_MAX,
+    ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+from scheduler.project_core import configured_holidays
+
+# Relative spread of the remaining work of tasks without Remaining Min. / Remaining Max.
+DEFAULT_SPREAD = 0.2
+
+class ScheduleSimulation:
+    """
+    Monte Carlo simulation of the schedule of a TaskManager.
+
+    The remaining work of each task is sampled from a triangular distribution: Remaining Min. (optimistic), Remaining 
+    (most likely) and Remaining Max. (pessimistic). Tasks without them use Remaining +/- spread. Tasks without remaining 
+    work are not sampled.
+
+    Tasks and resources are loaded into the matrix engine arguments once (see TaskManager.matrix_engine_inputs): each 
+    sample only builds a MatrixScheduleEngine with its remaining work and runs it, optionally on a process pool. 
+    The TaskManager and its DataFrames are not changed by the simulation.
+
+    Attributes:
+        task_manager (TaskManager): The task manager with the tasks and resources to simulate.
+        spread (float): Relative spread of the remaining work of tasks without Remaining Min. / Remaining Max.
+        remaining_samples (np.ndarray): Remaining work of the last run (samples x tasks).
+        end_indexes (np.ndarray): End period index of each task in the last run (samples x tasks, -1 if not finished).
+    """
+
+    def __init__(self, task_manager, spread = DEFAULT_SPREAD):
+        """
+        Initialize the simulation.
+
+        Args:
+            task_manager (TaskManager): The task manager with the tasks and resources to simulate.
+            spread (float): Relative spread of the remaining work of tasks without Remaining Min. / Remaining Max. 
+                Default is 0.2 (+/- 20%).
+
+        Raises:
+            ValueError: If the spread is negative.
+        """
+        if spread < 0:
+            raise ValueError(f"Invalid spread: {spread}. It must be a positive number.")
+
+        self.task_manager = task_manager
+        self.spread = spread
+        self.remaining_samples = None
+        self.end_indexes = None
+
+    def sample_remaining(self, samples, rng):
+        """
+        Sample the remaining work of the tasks.
+
+        Args:
+            samples (int): Number of samples.
+            rng (np.random.Generator): Random generator.
+
+        Returns:
+            np.ndarray: Remaining work of each sample and task (samples x tasks).
+        """
+        tasks_df = self.task_manager.tasks_df
+        remaining = tasks_df[TASK_REMAINING].to_numpy(dtype=float)
+
+        low = remaining * (1 - self.spread)
+        high = remaining * (1 + self.spread)
+
+        if TASK_REMAINING_MIN in tasks_df.columns:
+            values = pd.to_numeric(tasks_df[TASK_REMAINING_MIN], errors='coerce').to_numpy(dtype=float)
+            low = np.where(np.isnan(values), low, values)
+
+        if TASK_REMAINING_MAX in tasks_df.columns:
+            values = pd.to_numeric(tasks_df[TASK_REMAINING_MAX], errors='coerce').to_numpy(dtype=float)
+            high = np.where(np.isnan(values), high, values)
+
+        low = np.clip(low, 0, remaining)
+        high = np.maximum(high, remaining)
+
+        # Inverse of the triangular cumulative distribution, valid for degenerate distributions (low == high)
+        width = high - low
+        mode_ratio = np.divide(remaining - low, width, out=np.zeros_like(width), where=width > 0)
+        quantiles = rng.random((samples, remaining.size))
+
+        rising = low + np.sqrt(quantiles * width * (remaining - low))
+        falling = high - np.sqrt((1 - quantiles) * width * (high - remaining))
+
+        sampled = np.where(quantiles < mode_ratio, rising, falling)
+        sampled[:, remaining == 0] = 0
+
+        return sampled
+
+    def run(self, dates, samples = 1000, percentiles = (50, 90), seed = None, workers = None, engine = ENGINE_MATRIX,
+            effort_scale = None):
+        """
+        Run the simulation and calculate the End Date percentiles of each task.
+
+        The planning horizon is selected and the used resources after today are ignored as in update_task_schedule, 
+        without changing the TaskManager nor its used resources.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager) to be processed.
+            samples (int): Number of samples. Default is 1000.
+            percentiles (tuple of float): End Date percentiles to calculate. Default is (50, 90).
+            seed (int, optional): Seed of the random generator. Results do not depend on the number of workers.
+            workers (int, optional): Number of worker processes. Default: samples run in the current process.
+            engine (str): 'matrix' (default) or 'event' (see TaskManager.update_task_schedule).
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+
+        Returns:
+            pd.DataFrame: Task ID and one End Date column per percentile (e.g. 'End Date P90'). The date is None if the 
+                task does not finish in the processed dates for that percentile of samples.
+
+        Raises:
+            ValueError: If the engine, the number of samples or the number of workers is not valid.
+        """
+        if engine not in [ENGINE_MATRIX, ENGINE_EVENT]:
+            raise ValueError(f"Invalid simulation engine: {engine}. Possible values: {ENGINE_MATRIX}, {ENGINE_EVENT}")
+
+        if not isinstance(samples, (int, np.integer)) or samples <= 0:
+            raise ValueError(f"Invalid number of samples: {samples}. It must be a positive integer.")
+
+        if workers is not None and (not isinstance(workers, (int, np.integer)) or workers <= 0):
+            raise ValueError(f"Invalid number of workers: {workers}. It must be a positive integer.")
+
+        # The run state (period days, restriction dates and dependency graph) is set on a shallow copy of the TaskManager
+        task_manager = copy.copy(self.task_manager)
+
+        date_indexes = task_manager.select_horizon_dates(dates)
+        task_manager.date_period_days = dict(zip(dates, task_manager.period_days(dates)))
+        task_manager.restriction_dates = task_manager.parse_restriction_dates(task_manager.tasks_df)
+        task_manager.dependency_graph = task_manager.build_dependency_graph(task_manager.tasks_df, task_manager.restriction_dates)
+
+        inputs = task_manager.matrix_engine_inputs(dates, date_indexes, effort_scale)
+        event_driven = engine == ENGINE_EVENT
+
+        # Used resources after today are cleaned in the engine arguments (a copy of the used resources matrix)
+        inputs["used"] = inputs["used"].copy()
+        inputs["used"][:, inputs["date_values"] >= np.datetime64(datetime.datetime.now())] = 0
+
+        self.remaining_samples = self.sample_remaining(samples, np.random.default_rng(seed))
+
+        logger.info(f"Running {samples} schedule samples on {workers or 1} process(es)...")
+
+        if workers is None or workers == 1:
+            self.end_indexes = simulate_end_indexes(inputs, self.remaining_samples, len(date_indexes), event_driven)
+        else:
+            chunks = [chunk for chunk in np.array_split(self.remaining_samples, workers) if chunk.shape[0]]
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    simulate_end_indexes, [inputs] * len(chunks), chunks, [len(date_indexes)] * len(chunks), 
+                    [event_driven] * len(chunks))
+
+                self.end_indexes = np.concatenate(list(results))
+
+        return self.end_date_percentiles(dates, date_indexes, percentiles)
+
+    def end_date_percentiles(self, dates, date_indexes, percentiles = (50, 90)):
+        """
+        Calculate the End Date percentiles of each task from the end indexes of the last run.
+
+        Percentiles are taken on the sampled end dates (inverted CDF), tasks not finished counting as later than any date.
+        Tasks without remaining work keep their End Date. Blocked days are added as in update_task_schedule.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the processed dates.
+            percentiles (tuple of float): End Date percentiles to calculate.
+
+        Returns:
+            pd.DataFrame: Task ID and one End Date column per percentile.
+        """
+        tasks_df = self.task_manager.tasks_df
+        holidays = configured_holidays()
+
+        end_positions = np.where(self.end_indexes >= 0, self.end_indexes, np.inf)
+        percentile_positions = np.percentile(end_positions, percentiles, axis=0, method='inverted_cdf')
+
+        completed = tasks_df[TASK_REMAINING].to_numpy(dtype=float) == 0
+        blocked_days = tasks_df[TASK_BLOCKED_DAYS].to_numpy() if TASK_BLOCKED_DAYS in tasks_df.columns else np.zeros(len(tasks_df))
+        existing_end_dates = tasks_df[TASK_END_DATE].tolist() if TASK_END_DATE in tasks_df.columns else [None] * len(tasks_df)
+
+        result = pd.DataFrame({TASK_ID: tasks_df[TASK_ID].to_numpy()})
+
+        for percentile, positions in zip(percentiles, percentile_positions):
+            end_dates = []
+
+            for task, position in enumerate(positions):
+                if completed[task]:
+                    end_dates.append(existing_end_dates[task])
+                elif not np.isfinite(position):
+                    end_dates.append(None)
+                elif blocked_days[task] > 0:
+                    end_date = dates[date_indexes[int(position)]]
+                    end_dates.append(self.task_manager.calculate_end_date_with_block(end_date, blocked_days[task], holidays))
+                else:
+                    end_dates.append(dates[date_indexes[int(position)]])
+
+            result[f"{TASK_END_DATE} P{percentile:g}"] = end_dates
+
+        return result
+
+def simulate_end_indexes(inputs, remaining_samples, date_count, event_driven = False):
+    """
+    Run one MatrixScheduleEngine per sample of remaining work.
+
+    Args:
+        inputs (dict): MatrixScheduleEngine keyword arguments (see TaskManager.matrix_engine_inputs).
+        remaining_samples (np.ndarray): Remaining work of each sample and task (samples x tasks).
+        date_count (int): Number of matrix columns to process.
+        event_driven (bool): Run the engines with event-driven time advance.
+
+    Returns:
+        np.ndarray: End column index of each sample and task (samples x tasks, -1 if not finished).
+    """
+    end_indexes = np.full(remaining_samples.shape, -1, dtype=np.int64)
+
+    for sample, remaining in enumerate(remaining_samples):
+        engine = MatrixScheduleEngine(**{**inputs, "remaining": remaining})
+        engine.run(range(date_count), event_driven=event_driven)
+
+        end_indexes[sample] = engine.end_indexes
+
+    return end_indexes
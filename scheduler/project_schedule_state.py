@@ -0,0 +1,318 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+
+import numpy as np
+
+from utils.logger import create_logger
+logger = create_logger(__name__)
+
+STATE_VERSION = 2
+
+def _partition_digest(partition, task_ids, used_keys, settings):
+    """
+    Start a SHA-256 digest of the inputs of a partition that do not depend on its dates.
+
+    Args:
+        partition (dict): Engine arguments of the partition.
+        task_ids (list): ID of each task of the partition.
+        used_keys (list): Key (responsibility and goal) of each used resources row of the partition.
+        settings (tuple): Engine settings shared by all the partitions (effort scale, event driven...).
+
+    Returns:
+        hashlib._Hash: The digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(task_id) for task_id in task_ids], used_keys, repr(settings)]).encode())
+
+    for key in ["remaining", "resources_max", "restriction_dates"]:
+        _add_array(digest, partition[key])
+
+    _add_array(digest, partition["dependencies"].predecessors)
+
+    for key in ["group_tasks", "group_rows", "row_used", "task_used"]:
+        _add_array(digest, np.array([len(values) for values in partition[key]], dtype=np.int64))
+
+        for values in partition[key]:
+            _add_array(digest, np.asarray(values, dtype=np.int64))
+
+    return digest
+
+def _add_array(digest, value):
+    """
+    Add an array (dtype, shape and values) to a digest.
+
+    Args:
+        digest (hashlib._Hash): The digest.
+        value (array-like): The array.
+    """
+    value = np.ascontiguousarray(value)
+    digest.update(f"{value.dtype.str}{value.shape}".encode())
+    digest.update(value.tobytes())
+
+def partition_fingerprint(partition, available, used, task_ids, used_keys, settings):
+    """
+    Calculate the fingerprint of everything that determines the schedule of a partition (see 
+    TaskManager.matrix_partitions), except the tasks Start Date (see ScheduleState.reuse).
+
+    Args:
+        partition (dict): Engine arguments of the partition.
+        available (np.ndarray): Available resources rows of the partition.
+        used (np.ndarray): Used resources rows of the partition, before scheduling.
+        task_ids (list): ID of each task of the partition.
+        used_keys (list): Key (responsibility and goal) of each used resources row of the partition.
+        settings (tuple): Engine settings shared by all the partitions (dates, period days, effort scale...).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    digest = _partition_digest(partition, task_ids, used_keys, settings)
+
+    _add_array(digest, available)
+    _add_array(digest, used)
+
+    return digest.hexdigest()
+
+def partition_key(partition, task_ids, used_keys, settings):
+    """
+    Calculate the fingerprint of the inputs of a partition (see TaskManager.matrix_partitions) that do not depend on 
+    its dates: tasks, groups, resources rows and engine settings. The dates are compared column by column 
+    (see column_fingerprints), so a run on later dates can still reuse the partition.
+
+    Args:
+        partition (dict): Engine arguments of the partition.
+        task_ids (list): ID of each task of the partition.
+        used_keys (list): Key (responsibility and goal) of each used resources row of the partition.
+        settings (tuple): Engine settings shared by all the partitions (effort scale, event driven...).
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    return _partition_digest(partition, task_ids, used_keys, settings).hexdigest()
+
+def column_fingerprints(column_dates, available, used):
+    """
+    Calculate the fingerprint of each matrix column of a partition: its date and the available and used resources 
+    of the partition rows on it.
+
+    Args:
+        column_dates (list): Key of each column date (date, period days and number of merged dates).
+        available (np.ndarray): Available resources rows of the partition.
+        used (np.ndarray): Used resources rows of the partition, before scheduling.
+
+    Returns:
+        list of str: Hexadecimal SHA-256 digest of each column.
+    """
+    fingerprints = []
+
+    for column, column_date in enumerate(column_dates):
+        digest = hashlib.sha256(column_date.encode())
+        _add_array(digest, available[:, column])
+        _add_array(digest, used[:, column])
+        fingerprints.append(digest.hexdigest())
+
+    return fingerprints
+
+class ScheduleState:
+    """
+    State of a schedule run, to re-plan only what changed in the next run (see TaskManager.update_task_schedule).
+
+    The results of each independent partition of the tasks are stored with the fingerprint of its inputs 
+    (see partition_key) and of each of its dates (see column_fingerprints). A partition with the same inputs in the 
+    next run gets the same schedule if the dates it used are the same, so its results are reused instead of re-planned. 
+    The next run can start on a later date, as long as the partition had nothing allocated on the dates left behind.
+
+    Reuse is per partition: tasks sharing resources rows (a single TOTAL or '*' row, for example) are in the same 
+    partition, and any change in it re-plans all of them.
+
+    Attributes:
+        partitions (dict): Results of each partition by fingerprint: task_ids, has_start_date, remaining, 
+            start_indexes, end_indexes, allocated, processed_indexes, used, column_dates, columns, first_active 
+            and last_used.
+    """
+
+    def __init__(self, partitions = None):
+        """
+        Initialize the state.
+
+        Args:
+            partitions (dict, optional): Results of each partition by fingerprint. Default: empty (everything is planned).
+        """
+        self.partitions = partitions if partitions is not None else {}
+
+    def record(self, fingerprint, column_dates, columns, task_ids, has_start_date, result, initial_used, used):
+        """
+        Store the results of a partition.
+
+        Args:
+            fingerprint (str): Fingerprint of the partition inputs (see partition_key).
+            column_dates (list): Key of each column date (see column_fingerprints).
+            columns (list): Fingerprint of each column (see column_fingerprints).
+            task_ids (list): ID of each task of the partition.
+            has_start_date (np.ndarray): True for the tasks that already had a Start Date.
+            result (dict): Results of the partition (see schedule_partition).
+            initial_used (np.ndarray): Used resources rows of the partition, before scheduling.
+            used (np.ndarray): Used resources rows of the partition, after scheduling.
+        """
+        start_indexes = np.asarray(result["start_indexes"], dtype=np.int64)
+        end_indexes = np.asarray(result["end_indexes"], dtype=np.int64)
+        processed_indexes = [int(index) for index in result["processed_indexes"]]
+
+        # Columns with allocations, and last column the schedule depends on (all of them if a task is not completed)
+        active = np.concatenate((np.flatnonzero((np.asarray(used) != np.asarray(initial_used)).any(axis=0)), 
+                                 start_indexes[start_indexes >= 0], end_indexes[end_indexes >= 0]))
+
+        if np.all(np.asarray(result["remaining"]) == 0):
+            last_used = max(active.max(initial=-1), max(processed_indexes, default=-1))
+        else:
+            last_used = len(column_dates) - 1
+
+        self.partitions[fingerprint] = {
+            "task_ids": [str(task_id) for task_id in task_ids],
+            "has_start_date": np.asarray(has_start_date, dtype=bool),
+            "remaining": np.asarray(result["remaining"]),
+            "start_indexes": start_indexes,
+            "end_indexes": end_indexes,
+            "allocated": np.asarray(result["allocated"], dtype=bool),
+            "processed_indexes": processed_indexes,
+            "used": np.asarray(used),
+            "column_dates": list(column_dates),
+            "columns": list(columns),
+            "first_active": int(active.min(initial=len(column_dates))),
+            "last_used": int(last_used)
+        }
+
+    def reuse(self, fingerprint, column_dates, columns, tasks, has_start_date, used):
+        """
+        Obtain the stored results of a partition, if they are still valid.
+
+        The run can start on a later date than the stored one if the partition had nothing allocated before it. The 
+        dates up to the last one the stored schedule used must be the same (with the same resources). If a task was 
+        not completed, that is every date, and the run must not have more dates either.
+
+        Tasks that got a Start Date since the stored run keep it (their start index is cleared, as the engine does). 
+        Tasks that lost their Start Date need their first allocation date, so the partition is re-planned.
+
+        Args:
+            fingerprint (str): Fingerprint of the partition inputs (see partition_key).
+            column_dates (list): Key of each column date (see column_fingerprints).
+            columns (list): Fingerprint of each column (see column_fingerprints).
+            tasks (np.ndarray): Current positions of the tasks of the partition.
+            has_start_date (np.ndarray): True for the tasks of the partition that already have a Start Date.
+            used (np.ndarray): Used resources rows of the partition, before scheduling.
+
+        Returns:
+            tuple: Results of the partition (see schedule_partition, without used) and its used resources rows, 
+                or None if the partition must be re-planned.
+        """
+        stored = self.partitions.get(fingerprint)
+
+        if stored is None or np.any(stored["has_start_date"] & ~has_start_date):
+            return None
+
+        if not column_dates or column_dates[0] not in stored["column_dates"]:
+            return None
+
+        offset = stored["column_dates"].index(column_dates[0])
+        span = max(stored["last_used"] - offset + 1, 0)
+        completed = stored["last_used"] < len(stored["column_dates"]) - 1
+
+        if offset > stored["first_active"] or span > len(columns) or stored["columns"][offset:offset + span] != columns[:span]:
+            return None
+
+        if not completed and len(columns) != len(stored["column_dates"]) - offset:
+            return None
+
+        def shift(indexes):
+            return np.where(indexes >= 0, indexes - offset, -1)
+
+        result = {
+            "tasks": tasks,
+            "remaining": stored["remaining"].copy(),
+            "start_indexes": np.where(has_start_date, -1, shift(stored["start_indexes"])),
+            "end_indexes": shift(stored["end_indexes"]),
+            "allocated": stored["allocated"].copy(),
+            "processed_indexes": [index - offset for index in stored["processed_indexes"] if index >= offset]
+        }
+
+        used = np.array(used, copy=True)
+        used[:, :span] = stored["used"][:, offset:offset + span]
+
+        return result, used
+
+    def save(self, path):
+        """
+        Save the state to a JSON file.
+
+        Args:
+            path (str): Path of the file.
+        """
+        partitions = {
+            fingerprint: {
+                key: (
+                    {"dtype": value.dtype.str, "shape": value.shape, "values": value.tolist()} if isinstance(value, np.ndarray) else value
+                )
+                for key, value in stored.items()
+            }
+            for fingerprint, stored in self.partitions.items()
+        }
+
+        with open(path, 'w') as file:
+            json.dump({"version": STATE_VERSION, "partitions": partitions}, file)
+
+        logger.info(f"Schedule state with {len(self.partitions)} partitions saved to {path}")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a state saved with save.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            ScheduleState: The loaded state.
+
+        Raises:
+            ValueError: If the file is not a schedule state of this version.
+        """
+        with open(path) as file:
+            data = json.load(file)
+
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            raise ValueError(f"Invalid schedule state file: {path}")
+
+        partitions = {
+            fingerprint: {
+                key: (
+                    np.array(value["values"], dtype=value["dtype"]).reshape(value["shape"]) if isinstance(value, dict) else value
+                )
+                for key, value in stored.items()
+            }
+            for fingerprint, stored in data["partitions"].items()
+        }
+
+        logger.info(f"Schedule state with {len(partitions)} partitions loaded from {path}")
+
+        return cls(partitions)
@@ -36,6 +36,9 @@ TASK_REMAINING = "Remaining"
 TASK_START_DATE = "Start Date"
 TASK_END_DATE = "End Date"
 TASK_BLOCKED_DAYS = "Blocked Days"
+TASK_REMAINING_MIN = "Remaining Min."
+TASK_REMAINING_MAX = "Remaining Max."
+TASK_ESTIMATED = "Estimated"
 
 TASK_AUX_WEIGHT = "Weight"
 TASK_AUX_RESPONSIBILITY_KEY = "Responsibility Key"
@@ -45,4 +48,37 @@ TASK_AUX_ALLOCATABLE_RESOURCES_DONE = "Allocatable Resources Done"
 
 CONF_PERIOD = "period"
 CONF_PERIOD_AUTO = "auto"
-CONF_HOLIDAYS = "holidays"
\ No newline at end of file
+CONF_HOLIDAYS = "holidays"
+CONF_ENGINE = "engine"
+CONF_HORIZON_START = "horizonstart"
+CONF_HORIZON_END = "horizonend"
+CONF_MAX_PERIODS = "maxperiods"
+CONF_EFFORT_SCALE = "effortscale"
+CONF_RESOLUTION_CUTOFF = "resolutioncutoff"
+CONF_COARSE_RESOLUTION = "coarseresolution"
+CONF_SCENARIOS = "scenarios"
+CONF_WORKERS = "workers"
+CONF_STATE = "state"
+CONF_CHECKPOINT = "checkpoint"
+CONF_TIME_BUDGET = "timebudget"
+
+ENGINE_PANDAS = "pandas"
+ENGINE_MATRIX = "matrix"
+ENGINE_EVENT = "event"
+
+RESOLUTION_MONTH = "month"
+RESOLUTION_QUARTER = "quarter"
+
+SCENARIO_BASELINE = "Baseline"
+SCENARIO_NAME = "name"
+SCENARIO_CAPACITY = "capacity"
+SCENARIO_CAPACITY_DELTA = "delta"
+SCENARIO_CAPACITY_FROM = "from"
+SCENARIO_CAPACITY_TO = "to"
+SCENARIO_PRIORITY = "priority"
+SCENARIO_HOLIDAYS = "holidays"
+SCENARIO_PERIOD = "period"
+SCENARIO_ENGINE = "engine"
+
+PORTFOLIO_PROJECT = "Portfolio Project"
+PORTFOLIO_SEPARATOR = "::"
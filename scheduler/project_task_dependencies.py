@@ -0,0 +1,188 @@
+# Copyright (c) 2024 - Iván Moreno 
+#  
+# This software is licensed under the MIT License.
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import deque
+
+import numpy as np
+
+class TaskDependencyGraph:
+    """
+    Predecessor graph of the tasks, built once from the task ID restrictions (Restriction column).
+
+    Each task has at most one predecessor (the task in its Restriction column). The graph keeps, for each task,
+    the number of predecessors not yet completed (indegree). Completing a task decreases the indegree of its successors
+    and puts the ones that reach 0 in the ready queue, so readiness is updated in O(out-degree) instead of scanning all tasks.
+
+    Tasks are identified by their position in the task list.
+
+    Attributes:
+        task_ids (list): ID of each task.
+        predecessors (np.ndarray): Position of the predecessor of each task, NO_PREDECESSOR or UNKNOWN_PREDECESSOR 
+            (restricted by an ID that is not in the schedule; such a task is never released).
+        successors (list of np.ndarray): Positions of the tasks restricted by each task.
+        completed (np.ndarray): True for completed tasks.
+        completed_ids (list): IDs of the completed tasks, in completion order.
+        indegree (np.ndarray): Number of predecessors not yet completed of each task.
+        ready_queue (deque): Tasks released (indegree reached 0) and not yet consumed.
+    """
+
+    NO_PREDECESSOR = -1
+    UNKNOWN_PREDECESSOR = -2
+
+    def __init__(self, task_ids, restrictions):
+        """
+        Build the graph.
+
+        Args:
+            task_ids (list): ID of each task.
+            restrictions (list): Task ID restriction of each task, None if the task is not restricted by a task.
+        """
+        self.task_ids = list(task_ids)
+
+        positions = {task_id: position for position, task_id in enumerate(self.task_ids)}
+
+        self.predecessors = np.full(len(self.task_ids), self.NO_PREDECESSOR, dtype=np.int64)
+
+        for position, restriction in enumerate(restrictions):
+            if restriction is None:
+                continue
+
+            self.predecessors[position] = positions.get(restriction, self.UNKNOWN_PREDECESSOR)
+
+        self._build_successors()
+        self.reset(np.zeros(len(self.task_ids), dtype=bool))
+
+    def _build_successors(self):
+        """Build the successors of each task from the predecessors."""
+        restricted = np.flatnonzero(self.predecessors >= 0)
+        restricted = restricted[np.argsort(self.predecessors[restricted], kind='stable')]
+        successor_counts = np.bincount(self.predecessors[restricted], minlength=len(self.task_ids))
+
+        self.successors = np.split(restricted, np.cumsum(successor_counts)[:-1]) if self.task_ids else []
+
+    def copy(self):
+        """
+        Copy the graph with its completion state. The predecessors and successors, which are not modified once built,
+        are shared with the copy.
+
+        Returns:
+            TaskDependencyGraph: The copy.
+        """
+        graph = TaskDependencyGraph.__new__(TaskDependencyGraph)
+        graph.task_ids = self.task_ids
+        graph.predecessors = self.predecessors
+        graph.successors = self.successors
+        graph.completed = self.completed.copy()
+        graph.completed_ids = list(self.completed_ids)
+        graph.indegree = self.indegree.copy()
+        graph.ready_queue = deque(self.ready_queue)
+
+        return graph
+
+    def subgraph(self, positions):
+        """
+        Build the graph of a subset of the tasks, in the given order, with its completion state.
+
+        Predecessors out of the subset are handled as unknown (the task is never released).
+
+        Args:
+            positions (np.ndarray): Positions of the tasks of the subset.
+
+        Returns:
+            TaskDependencyGraph: The graph of the subset.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+
+        local_positions = np.full(len(self.task_ids), self.UNKNOWN_PREDECESSOR, dtype=np.int64)
+        local_positions[positions] = np.arange(positions.size)
+
+        predecessors = self.predecessors[positions]
+
+        graph = TaskDependencyGraph([self.task_ids[position] for position in positions], [None] * positions.size)
+        graph.predecessors = np.where(predecessors >= 0, local_positions[np.maximum(predecessors, 0)], predecessors)
+        graph._build_successors()
+        graph.reset(self.completed[positions])
+
+        return graph
+
+    def reset(self, completed):
+        """
+        Reset the state of the graph.
+
+        Args:
+            completed (np.ndarray): True for the tasks already completed.
+        """
+        self.completed = np.asarray(completed, dtype=bool).copy()
+        self.completed_ids = [self.task_ids[position] for position in np.flatnonzero(self.completed)]
+
+        has_predecessor = self.predecessors >= 0
+
+        self.indegree = (self.predecessors == self.UNKNOWN_PREDECESSOR).astype(np.int64)
+        self.indegree[has_predecessor] = ~self.completed[self.predecessors[has_predecessor]]
+
+        # Tasks already completed are never released
+        self.indegree[self.completed] = 0
+
+        self.ready_queue = deque()
+
+    def complete(self, position):
+        """
+        Mark a task as completed and release its successors. Successors already completed are not released.
+
+        Args:
+            position (int): Position of the completed task.
+
+        Returns:
+            list of int: Positions of the released tasks (also added to the ready queue).
+        """
+        if self.completed[position]:
+            return []
+
+        self.completed[position] = True
+        self.completed_ids.append(self.task_ids[position])
+
+        released = []
+
+        for successor in self.successors[position]:
+            if self.completed[successor]:
+                continue
+
+            self.indegree[successor] -= 1
+
+            if self.indegree[successor] == 0:
+                released.append(int(successor))
+
+        self.ready_queue.extend(released)
+
+        return released
+
+    def pop_ready(self):
+        """
+        Consume the ready queue.
+
+        Returns:
+            list of int: Positions of the tasks released since the last call.
+        """
+        released = list(self.ready_queue)
+        self.ready_queue.clear()
+
+        return released
@@ -24,22 +24,31 @@
 import scheduler.pandas_conf
 
 import json
+import time
 import numpy as np
 import pandas as pd
 import datetime
 
-from utils.date_utils import safe_to_datetime
+from utils.date_utils import safe_to_datetime, safe_to_datetime_series
 
 from utils.logger import create_logger
 logger = create_logger(__name__) 
 
-from utils.util_constants import CONF_HOLIDAYS
-from utils.app_config import AppConfig
-
 from scheduler.project_scheduler_constants import (
     TASK_AUX_ALLOCATABLE_RESOURCES, TASK_AUX_RESPONSIBILITY_DICT, TASK_BLOCKED_DAYS, TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, 
-    TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE, TASK_AUX_WEIGHT, TASK_AUX_RESPONSIBILITY_KEY, TASK_GOAL
+    TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE, TASK_AUX_WEIGHT, TASK_AUX_RESPONSIBILITY_KEY, TASK_GOAL,
+    TASK_ESTIMATED, USED_RESOURCE_GOAL, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT, RESOLUTION_MONTH, RESOLUTION_QUARTER, CONF_PERIOD_AUTO
+)
+from scheduler.project_matrix_engine import MatrixScheduleEngine, distribute_effort
+from scheduler.project_partition import connected_components, run_partitions, PartitionedSchedule
+from scheduler.project_schedule_state import ScheduleState, column_fingerprints, partition_fingerprint, partition_key
+from scheduler.project_checkpoint import save_checkpoint, load_checkpoint, remove_checkpoint
+from scheduler.project_schedule_options import ScheduleOptions
+from scheduler.project_task_dependencies import TaskDependencyGraph
+from scheduler.project_fixed_point import (
+    to_fixed_point, from_fixed_point, resource_scale, resource_days_multiple, FIXED_POINT_INFINITY
 )
+from scheduler.project_core import load_holidays, configured_holidays
 
 class TaskManager:
     """
@@ -77,17 +86,32 @@ class TaskManager:
         Args:
             tasks_df (pd.DataFrame): DataFrame containing the task schedule. 
             resource_manager (ProjectResourceManager): An initialized resource manager instance.
-            period_days_available (int): Number of days to consider for the available resources. Default is 5 days.
+            period_days_available (int or str): Number of days to consider for the available resources. Default is 5 days.
+                'auto' calculates the working days of each date from the dates spacing and the holidays (see period_days).
 
         Raises:
-            ValueError: If any required column is missing from the tasks DataFrame.
+            ValueError: If any required column is missing from the tasks DataFrame, or the period is not valid.
         """                        
         logger.info("Initializing TaskManager...")
         logger.debug(f"Tasks DataFrame: {tasks_df}")
 
+        if isinstance(period_days_available, str) and period_days_available != CONF_PERIOD_AUTO:
+            try:
+                period_days_available = float(period_days_available)
+            except ValueError:
+                raise ValueError(f"Invalid period: {period_days_available}. Possible values: number of days or '{CONF_PERIOD_AUTO}'")
+
+        if period_days_available != CONF_PERIOD_AUTO and not period_days_available > 0:
+            raise ValueError(f"Invalid period: {period_days_available}. Possible values: number of days or '{CONF_PERIOD_AUTO}'")
+
         self.tasks_df = tasks_df
         self.resource_manager = resource_manager
         self.period_days_available = period_days_available
+        self.date_period_days = {}
+        self.dependency_graph = None
+        self.restriction_dates = None
+        self.schedule_summary = None
+        self.schedule_state = None
                    
         # Define the columns that are required
         required_columns = [TASK_PRIORITY, TASK_REMAINING, TASK_ID, TASK_GOAL, TASK_RESOURCES_MAX]
@@ -250,62 +274,1169 @@ class TaskManager:
                     
         logger.info("Task schedule check completed successfully.")
 
-    def update_task_schedule(self, dates):
+    def update_task_schedule(self, dates, options = None, **option_values):
         """
         Update the task schedule based on available resources, following restrictions and priority.
 
+        Dates before today and dates out of the planning horizon are discarded before processing. 
+        Processing stops as soon as no task has remaining work. A summary of the run is stored in schedule_summary.
+
         Args:
             dates ([str]): Dates (as defined in the resource_manager) to be processed             
+            options (ScheduleOptions, optional): Engine and run options (see ScheduleOptions). 
+            **option_values: The options as keyword arguments (e.g. engine='matrix', effort_scale=1000), when options 
+                is not provided.
 
         Returns:
             pd.DataFrame: Updated tasks DataFrame with updated start and end dates and adjusted resources.
+
+        Raises:
+            ValueError: If options and keyword options are both provided, the options or their combination are not valid 
+                (see ScheduleOptions.validate), or the horizon or resolution are not valid.
         """
         logger.info("Updating task schedule...")
 
+        if options is None:
+            options = ScheduleOptions(**option_values)
+        elif option_values:
+            raise ValueError(f"Options must be given as a ScheduleOptions or as keyword arguments, not both: {', '.join(option_values)}")
+
+        options.validate()
+
+        date_indexes = self.select_horizon_dates(dates, options.horizon_start, options.horizon_end, options.max_periods)
+        periods = self.select_resolution_periods(dates, date_indexes, options.resolution_cutoff, options.coarse_resolution)
+        self.date_period_days = dict(zip(dates, self.period_days(dates)))
+
         # Clean used resources for dates after today
         self.resource_manager.clean_resources(datetime.datetime.now())
 
+        self.restriction_dates = self.parse_restriction_dates(self.tasks_df)
+        self.dependency_graph = self.build_dependency_graph(self.tasks_df, self.restriction_dates)
+
+        if options.engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            return self._update_task_schedule_matrix(dates, date_indexes, periods, options)
+
         grouped = self.tasks_df.groupby([TASK_PRIORITY, TASK_AUX_RESPONSIBILITY_KEY])
 
-        for current_date in dates:            
+        self.dependency_graph.reset(self.tasks_df[TASK_REMAINING].to_numpy() == 0)
+
+        # Task positions and restriction dates of each group, to check readiness on the dependency graph arrays
+        group_positions = grouped.indices
+        group_restriction_dates = {
+            group_key: self.restriction_dates.to_numpy(dtype='datetime64[ns]')[positions] for group_key, positions in group_positions.items()
+        }
+
+        processed_dates = []
+
+        for date_index in date_indexes:
+
+            # Stop when there is no remaining work
+            if self.dependency_graph.completed.all():
+                logger.info("All tasks completed. Stopping schedule update.")
+                break
+
+            current_date = dates[date_index]
+            processed_dates.append(current_date)
 
             logger.info(f"Processing tasks for date: {current_date}")
 
-            # Continue if date is before today
-            if safe_to_datetime(current_date, errors='coerce') < datetime.datetime.now():
-                continue          
-            
+            current_date_value = safe_to_datetime(current_date)
+
+            # Tasks released after their group was processed, by group
+            released_tasks = {}
+            processed_groups = set()
+
             for (priority, resp_key), tasks in grouped:
-                # Completed tasks calcualted inside the loop to get possible tasks finished with lower priority
-                # Problem: task blocked by task with lower priority will be planned one period later
-                # Blocked taks should have always less priority
-                completed_tasks = self.tasks_df[self.tasks_df[TASK_REMAINING] == 0][TASK_ID].tolist()
+                processed_groups.add((priority, resp_key))
+
+                # Completion and task ID restrictions are kept up to date by the dependency graph, including tasks 
+                # finished with lower priority
+                positions = group_positions[(priority, resp_key)]
+                ready = ~self.dependency_graph.completed[positions] & (self.dependency_graph.indegree[positions] == 0)
 
-                filtered_tasks = TaskManager.filter_tasks_by_restriction(tasks, completed_tasks, current_date)
+                filtered_tasks = TaskManager.filter_ready_tasks(
+                    tasks, ready, current_date_value, group_restriction_dates[(priority, resp_key)])
 
                 if filtered_tasks.empty:
                     continue
                 
                 logger.debug(f"Processing tasks for priority {priority} and responsibility key {resp_key}")                
-            
-                resp_dict = filtered_tasks.iloc[0][TASK_AUX_RESPONSIBILITY_DICT]
 
-                available_effort = self.resource_manager.obtain_goal_resources(current_date, **resp_dict) * self.period_days_available         
+                self._allocate_group_tasks(filtered_tasks, current_date)
+                self._collect_released_tasks(released_tasks, processed_groups)
 
-                if available_effort == 0:                                           
-                    continue
+            # Tasks released by a task finished in this period are planned in this period too, in group order
+            while released_tasks:
+                group_key = min(released_tasks)
+                positions = sorted(released_tasks.pop(group_key))
+
+                logger.debug(f"Processing released tasks for priority {group_key[0]} and responsibility key {group_key[1]}")
+
+                self._allocate_group_tasks(self.tasks_df.iloc[positions], current_date)
+                self._collect_released_tasks(released_tasks, processed_groups)
+
+        self._store_schedule_summary(dates, date_indexes, processed_dates)
+
+        logger.info("Task schedule update completed.")
+        return self.tasks_df
+
+    def iter_schedule(self, dates, options = None, **option_values):
+        """
+        Update the task schedule as update_task_schedule, yielding one record per date as soon as its allocations are final.
+
+        Records are yielded in date order, from the first date of the planning horizon to the last date with allocations.
+        With the 'event' engine, the dates skipped by the event-driven time advance are yielded too. With multi-resolution 
+        periods, one record is yielded per planning period. Each record is a dict with:
+
+        - date: The date (the first date of the planning period).
+        - dates: The dates of the planning period (only the date without multi-resolution periods).
+        - allocations: Effort allocated to each task on the date, by Task ID.
+        - remaining: Remaining work of each allocated task after the date, by Task ID.
+        - started: IDs of the tasks whose Start Date is set to the date.
+        - completed: IDs of the tasks finished on the date (their End Date is the last of the dates).
+
+        The consumer can stop iterating at any time: the allocation loop stops too, the DataFrames are not updated and 
+        the used resources cleaned for the run are restored. When the generator is consumed to the end, the tasks and 
+        used resources DataFrames and schedule_summary are updated as with update_task_schedule. The tasks DataFrame can 
+        also be rebuilt from the records (see reduce_schedule).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager) to be processed.
+            options (ScheduleOptions, optional): Engine and run options (see ScheduleOptions). The engine must be 'matrix' 
+                or 'event', and partitions, incremental runs, checkpoints and time budgets are not available. Effort 
+                values of the records are floats also with an effort scale.
+            **option_values: The options as keyword arguments, when options is not provided. Default engine: 'matrix'.
+
+        Yields:
+            dict: The record of each date.
+
+        Raises:
+            ValueError: If options and keyword options are both provided, the options are not valid for streaming 
+                (see ScheduleOptions.validate), or the horizon or resolution are not valid.
+        """
+        if options is None:
+            options = ScheduleOptions(**{"engine": ENGINE_MATRIX, **option_values})
+        elif option_values:
+            raise ValueError(f"Options must be given as a ScheduleOptions or as keyword arguments, not both: {', '.join(option_values)}")
+
+        options.validate(streaming=True)
+
+        logger.info("Streaming task schedule...")
+
+        date_indexes = self.select_horizon_dates(dates, options.horizon_start, options.horizon_end, options.max_periods)
+        periods = self.select_resolution_periods(dates, date_indexes, options.resolution_cutoff, options.coarse_resolution)
+        self.date_period_days = dict(zip(dates, self.period_days(dates)))
+
+        effort_scale = options.effort_scale
+
+        # Used resources before the run, restored if the consumer stops early
+        used_manager = self.resource_manager.used_resources_manager
+        used_resources_df = used_manager.used_resources_df.copy()
+        finished = False
+
+        try:
+            # Clean used resources for dates after today
+            self.resource_manager.clean_resources(datetime.datetime.now())
+
+            self.restriction_dates = self.parse_restriction_dates(self.tasks_df)
+            self.dependency_graph = self.build_dependency_graph(self.tasks_df, self.restriction_dates)
+
+            matrix_engine = MatrixScheduleEngine(
+                **self.matrix_engine_inputs(dates, date_indexes, effort_scale, periods), record_allocations=True)
+
+            task_ids = self.tasks_df[TASK_ID].tolist()
+
+            def effort_values(values):
+                values = np.asarray(values)
+                return values.astype(float) if effort_scale is None else from_fixed_point(values, effort_scale)
+
+            def record(column):
+                allocations = matrix_engine.allocation_log.pop(column, [])
+                tasks = [task for task, _, _ in allocations]
+
+                return {
+                    "date": dates[periods[column][0]],
+                    "dates": [dates[date_index] for date_index in periods[column]],
+                    "allocations": dict(zip([task_ids[task] for task in tasks], effort_values([effort for _, effort, _ in allocations]).tolist())),
+                    "remaining": dict(zip([task_ids[task] for task in tasks], effort_values([remaining for _, _, remaining in allocations]).tolist())),
+                    "started": [task_ids[task] for task in np.flatnonzero(matrix_engine.start_indexes == column)],
+                    "completed": [task_ids[task] for task in np.flatnonzero(matrix_engine.end_indexes == column)]
+                }
+
+            processed_columns = []
+            next_column = 0
+
+            for column in matrix_engine.iter_run(range(len(periods)), event_driven=options.event_driven):
+                processed_columns.append(column)
+
+                # Allocations of the previous columns are final
+                while next_column <= column:
+                    yield record(next_column)
+                    next_column += 1
+
+            # Isolated tasks can be allocated after the last processed date
+            last_column = max(matrix_engine.allocation_log, default=-1)
+
+            while next_column <= last_column:
+                yield record(next_column)
+                next_column += 1
+
+            self._store_matrix_engine(matrix_engine, dates, date_indexes, periods)
+            self._store_schedule_summary(dates, date_indexes, [dates[periods[column][0]] for column in processed_columns])
+            finished = True
+        finally:
+            if not finished:
+                used_manager.used_resources_df = used_resources_df
+
+        logger.info("Task schedule streaming completed.")
+
+    def reduce_schedule(self, records):
+        """
+        Build the updated tasks DataFrame from the records of iter_schedule (for example, records saved to disk), 
+        without the engine. The result is the DataFrame update_task_schedule would return.
+
+        It must be called on a TaskManager built from the same tasks as the one that produced the records.
+
+        Args:
+            records (iterable of dict): Records of iter_schedule, in date order.
+
+        Returns:
+            pd.DataFrame: A copy of the tasks DataFrame with updated remaining work, start and end dates.
+        """
+        positions = {task_id: position for position, task_id in enumerate(self.tasks_df[TASK_ID])}
+
+        remaining = {}
+        start_dates = {}
+        end_dates = {}
+
+        for record in records:
+            remaining.update(record["remaining"])
+            start_dates.update((task_id, record["date"]) for task_id in record["started"])
+            end_dates.update((task_id, record.get("dates", [record["date"]])[-1]) for task_id in record["completed"])
+
+        task_ids = sorted(remaining, key=positions.get)
+        tasks_df = self.tasks_df.copy()
+
+        self._store_task_changes(
+            tasks_df, np.array([positions[task_id] for task_id in task_ids], dtype=np.int64), 
+            np.array([remaining[task_id] for task_id in task_ids], dtype=float), 
+            [start_dates.get(task_id) for task_id in task_ids], [end_dates.get(task_id) for task_id in task_ids])
+
+        return tasks_df
+
+    def select_horizon_dates(self, dates, horizon_start = None, horizon_end = None, max_periods = None):
+        """
+        Select the dates to process: dates not before today and inside the planning horizon, in their original order. 
+        Dates are parsed once, in a single vectorized call. 
+
+        The counts of discarded dates are kept in schedule_summary.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            horizon_start (str or datetime, optional): Dates before it are discarded.
+            horizon_end (str or datetime, optional): Dates after it are discarded.
+            max_periods (int, optional): Maximum number of dates to select.
+
+        Returns:
+            [int]: Indexes of the selected dates.
+
+        Raises:
+            ValueError: If a horizon date is not valid or max_periods is not a positive integer.
+        """
+        date_values = safe_to_datetime_series(dates)
+
+        # Invalid dates are kept, so that the resource managers report them
+        past_mask = (date_values < pd.Timestamp(datetime.datetime.now())).to_numpy()
+        horizon_mask = ~past_mask
+
+        if horizon_start is not None:
+            start = safe_to_datetime(horizon_start, errors='coerce')
+
+            if start is pd.NaT:
+                raise ValueError(f"Invalid horizon start date: {horizon_start}")
+
+            horizon_mask &= ~(date_values < start).to_numpy()
+
+        if horizon_end is not None:
+            end = safe_to_datetime(horizon_end, errors='coerce')
+
+            if end is pd.NaT:
+                raise ValueError(f"Invalid horizon end date: {horizon_end}")
+
+            horizon_mask &= ~(date_values > end).to_numpy()
+
+        date_indexes = np.flatnonzero(horizon_mask).tolist()
+
+        if max_periods is not None:
+            if not isinstance(max_periods, (int, np.integer)) or isinstance(max_periods, bool) or max_periods <= 0:
+                raise ValueError(f"Invalid max periods: {max_periods}. It must be a positive integer.")
+
+            date_indexes = date_indexes[:max_periods]
+
+        self.schedule_summary = {
+            "dates": len(dates),
+            "past_dates": int(past_mask.sum()),
+            "horizon_dates": len(date_indexes)
+        }
+
+        return date_indexes
+
+    def period_days(self, dates):
+        """
+        Calculate the number of days to consider for the available resources of each date.
+
+        With period 'auto', they are the working days (weekdays that are not holidays) from each date to the next one. 
+        The last date takes the spacing of the previous one (a week if there is only one date).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+
+        Returns:
+            np.ndarray: Period days of each date.
+        """
+        if self.period_days_available == CONF_PERIOD_AUTO:
+            return TaskManager.calculate_working_days(dates, configured_holidays())
+
+        return np.full(len(dates), self.period_days_available, dtype=float)
+
+    def _date_period_days(self, current_date):
+        """
+        Period days of a date, as calculated for the dates of the last update_task_schedule call.
+
+        Args:
+            current_date (str): The date (as defined in the resource_manager).
 
-                filtered_tasks = TaskManager._distribute_resources_same_priority_and_responsible_tasks(filtered_tasks, available_effort, self.period_days_available)
+        Returns:
+            int or float: The period days of the date.
+        """
+        if self.period_days_available != CONF_PERIOD_AUTO:
+            return self.period_days_available
+
+        if current_date in self.date_period_days:
+            return self.date_period_days[current_date]
+
+        return self.period_days([current_date])[0]
+
+    @staticmethod
+    def select_resolution_periods(dates, date_indexes, resolution_cutoff = None, coarse_resolution = RESOLUTION_MONTH):
+        """
+        Group the dates to process into planning periods: each date up to the cutoff is a period, later consecutive dates 
+        of the same month (or quarter) are merged into a single period.
+
+        The resources of a merged period are the sum of the resources of its dates. Tasks starting in a merged period start
+        on its first date and tasks finishing in it end on its last date.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates to process, in order.
+            resolution_cutoff (str or datetime, optional): Last date with its own period. If None, dates are not merged.
+            coarse_resolution (str): Resolution of the merged periods: 'month' or 'quarter'.
+
+        Returns:
+            [[int]]: Date indexes of each period, in order.
+
+        Raises:
+            ValueError: If the cutoff is not a valid date or the resolution is unknown.
+        """
+        if resolution_cutoff is None:
+            return [[date_index] for date_index in date_indexes]
+
+        cutoff = safe_to_datetime(resolution_cutoff, errors='coerce')
+
+        if cutoff is pd.NaT:
+            raise ValueError(f"Invalid resolution cutoff date: {resolution_cutoff}")
+
+        if coarse_resolution not in [RESOLUTION_MONTH, RESOLUTION_QUARTER]:
+            raise ValueError(f"Invalid coarse resolution: {coarse_resolution}. Possible values: {RESOLUTION_MONTH}, {RESOLUTION_QUARTER}")
+
+        date_values = safe_to_datetime_series([dates[date_index] for date_index in date_indexes])
+        months_per_period = 1 if coarse_resolution == RESOLUTION_MONTH else 3
+
+        periods = []
+        previous_key = None
+
+        for date_index, date_value in zip(date_indexes, date_values):
+            if pd.isnull(date_value) or date_value <= cutoff:
+                periods.append([date_index])
+                previous_key = None
+                continue
+
+            key = (date_value.year, (date_value.month - 1) // months_per_period)
+
+            if key == previous_key:
+                periods[-1].append(date_index)
+            else:
+                periods.append([date_index])
+                previous_key = key
+
+        logger.info(f"{len(date_indexes)} dates grouped into {len(periods)} planning periods.")
+
+        return periods
+
+    def _store_schedule_summary(self, dates, date_indexes, processed_dates):
+        """
+        Complete and log the summary of a schedule update.
+
+        schedule_summary keys:
+
+        - dates: Number of dates received.
+        - past_dates: Dates discarded for being before today.
+        - horizon_dates: Dates inside the planning horizon (including the max periods limit).
+        - processed_dates: Dates (or planning periods, with multi-resolution) actually processed.
+        - first_date, last_date: First and last processed dates (None if no date was processed).
+        - completed: True if no task has remaining work.
+        - replanned_tasks: IDs of the tasks re-planned (incremental runs only, see update_task_schedule).
+        - estimated_tasks: IDs of the tasks whose dates were estimated (time-budget runs only, see update_task_schedule).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates inside the planning horizon.
+            processed_dates ([str]): Dates actually processed.
+        """
+        self.schedule_summary.update({
+            "processed_dates": len(processed_dates),
+            "first_date": processed_dates[0] if processed_dates else None,
+            "last_date": processed_dates[-1] if processed_dates else None,
+            "completed": bool(self.dependency_graph.completed.all())
+        })
+
+        logger.info(f"Schedule summary: {self.schedule_summary}")
+
+    def _allocate_group_tasks(self, filtered_tasks, current_date):
+        """
+        Distribute the available resources of a date among ready tasks of the same priority and responsibility,
+        allocate them and mark the tasks finished in the dependency graph.
+
+        Args:
+            filtered_tasks (pd.DataFrame): Ready tasks of the same priority and responsibility key.
+            current_date (str): The date being processed.
+        """
+        resp_dict = filtered_tasks.iloc[0][TASK_AUX_RESPONSIBILITY_DICT]
+
+        period_days = self._date_period_days(current_date)
+        available_effort = self.resource_manager.obtain_goal_resources(current_date, **resp_dict) * period_days
+
+        if available_effort == 0:                                           
+            return
+
+        filtered_tasks = TaskManager._distribute_resources_same_priority_and_responsible_tasks(filtered_tasks, available_effort, period_days)
+
+        allocations = []
+
+        filtered_tasks = filtered_tasks.apply(lambda task: self.allocate_resources(task, task[TASK_AUX_ALLOCATABLE_RESOURCES], current_date, allocations), axis=1)
+
+        # The used resources of the group are updated in one batch
+        self.resource_manager.update_goal_resources_batch(
+            current_date, [goal_filter for goal_filter, _ in allocations], [resources_used for _, resources_used in allocations])
+
+        logger.debug(f"Tasks allocated for date {current_date}.")
+
+        # Update the original DataFrame with changes
+        self.tasks_df.update(filtered_tasks)
+
+        positions = self.tasks_df.index.get_indexer(filtered_tasks.index)
+        positions = positions[positions >= 0]
+
+        for position in positions[self.tasks_df[TASK_REMAINING].to_numpy()[positions] == 0]:
+            self.dependency_graph.complete(position)
+
+    def _collect_released_tasks(self, released_tasks, processed_groups):
+        """
+        Consume the tasks released in the dependency graph, keeping the ones whose group was already processed for the date.
+
+        Args:
+            released_tasks (dict): Released task positions by (priority, responsibility key), updated in place.
+            processed_groups (set): (priority, responsibility key) of the groups already processed for the date.
+        """
+        for position in self.dependency_graph.pop_ready():
+            if self.dependency_graph.completed[position]:
+                continue
+
+            task = self.tasks_df.iloc[position]
+            group_key = (task[TASK_PRIORITY], task[TASK_AUX_RESPONSIBILITY_KEY])
+
+            if group_key in processed_groups:
+                released_tasks.setdefault(group_key, []).append(position)
 
-                filtered_tasks = filtered_tasks.apply(lambda task: self.allocate_resources(task, task[TASK_AUX_ALLOCATABLE_RESOURCES], current_date), axis=1)
+    def _update_task_schedule_matrix(self, dates, date_indexes, periods, options):
+        """
+        Update the task schedule using the MatrixScheduleEngine.
+
+        Depending on the options, a single engine is run (optionally with checkpoints or a time budget, see 
+        _run_matrix_checkpoints and _run_matrix_time_budget), or independent partitions of the tasks are scheduled on 
+        worker processes, on the workers of a coordinator or incrementally (see _run_matrix_partitions).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager)
+            date_indexes ([int]): Indexes of the dates to be processed.
+            periods ([[int]]): Date indexes of each planning period (see select_resolution_periods).
+            options (ScheduleOptions): Validated options of the run.
+
+        Returns:
+            pd.DataFrame: Updated tasks DataFrame with updated start and end dates and adjusted resources.
+        """
+        event_driven = options.event_driven
+        effort_scale = options.effort_scale
+
+        if options.checkpoint_path is not None:
+            inputs = self.matrix_engine_inputs(dates, date_indexes, effort_scale, periods)
+            engine, processed_periods = self._run_matrix_checkpoints(
+                inputs, len(periods), event_driven, options.checkpoint_path, options.checkpoint_interval)
+        elif options.time_budget is not None:
+            engine = self._load_matrix_engine(dates, date_indexes, effort_scale, periods)
+            processed_periods, estimated = self._run_matrix_time_budget(engine, len(periods), event_driven, options.time_budget)
+        elif not options.partitioned:
+            engine = self._load_matrix_engine(dates, date_indexes, effort_scale, periods)
+            processed_periods = engine.run(range(len(periods)), event_driven=event_driven)
+        else:
+            engine = self._run_matrix_partitions(
+                dates, date_indexes, event_driven, effort_scale, periods, options.workers, options.coordinator, 
+                options.previous_state)
+            processed_periods = engine.processed_indexes
 
-                logger.debug(f"Tasks allocated for date {current_date}.")
+        self._store_matrix_engine(engine, dates, date_indexes, periods)
 
-                # Update the original DataFrame with changes
-                self.tasks_df.update(filtered_tasks)
+        if options.time_budget is not None:
+            self._store_estimated_tasks(estimated)
+
+        self._store_schedule_summary(dates, date_indexes, [dates[periods[period][0]] for period in processed_periods])
 
         logger.info("Task schedule update completed.")
         return self.tasks_df
+
+    def _run_matrix_time_budget(self, engine, column_count, event_driven, time_budget):
+        """
+        Run a MatrixScheduleEngine until its dates are processed or the time budget is spent, and estimate the dates 
+        of the tasks not completed on the remaining dates (see MatrixScheduleEngine.estimate_dates).
+
+        The budget is checked after each processed date, so at least one date is planned exactly. The estimated 
+        start and end indexes are set in the engine, and the estimated tasks marked as allocated to be stored.
+
+        Args:
+            engine (MatrixScheduleEngine): Engine loaded with the inputs.
+            column_count (int): Number of date columns of the engine.
+            event_driven (bool): If True, only the dates where an allocation can happen are processed.
+            time_budget (float): Maximum time in seconds of the allocation loop.
+
+        Returns:
+            tuple: Column indexes of the dates processed exactly (list of int) and mask of the estimated tasks (np.ndarray).
+        """
+        deadline = time.monotonic() + time_budget
+        processed_periods = []
+        exhausted = True
+
+        for period in engine.iter_run(range(column_count), event_driven=event_driven):
+            processed_periods.append(period)
+
+            if time.monotonic() >= deadline:
+                exhausted = False
+                break
+
+        if exhausted or engine.dependencies.completed.all():
+            return processed_periods, np.zeros(engine.remaining.size, dtype=bool)
+
+        logger.info(f"Time budget of {time_budget} s spent after {len(processed_periods)} dates. Estimating the remaining dates...")
+
+        start_indexes, end_indexes = engine.estimate_dates(np.arange(processed_periods[-1] + 1, column_count))
+
+        estimated = ~engine.dependencies.completed
+        not_started = estimated & (engine.start_indexes < 0) & ~engine.has_start_date
+
+        engine.start_indexes[not_started] = start_indexes[not_started]
+        engine.end_indexes[estimated] = end_indexes[estimated]
+        engine.allocated |= estimated
+
+        return processed_periods, estimated
+
+    def _store_estimated_tasks(self, estimated):
+        """
+        Write the Estimated column (True for the tasks whose dates were estimated on a time-budget run) to the tasks 
+        DataFrame, and their IDs to schedule_summary['estimated_tasks'].
+
+        Args:
+            estimated (np.ndarray): Mask of the estimated tasks (in the order of the tasks DataFrame).
+        """
+        self.tasks_df[TASK_ESTIMATED] = estimated
+        self.schedule_summary["estimated_tasks"] = self.tasks_df[TASK_ID].to_numpy()[estimated].tolist()
+
+        logger.info(f"{len(self.schedule_summary['estimated_tasks'])} tasks with estimated dates.")
+
+    def _run_matrix_partitions(self, dates, date_indexes, event_driven, effort_scale, periods, workers, coordinator = None,
+                               previous_state = None):
+        """
+        Run one MatrixScheduleEngine per partition of the tasks (see matrix_partitions) on worker processes, or on the 
+        workers of a coordinator.
+
+        With a previous state, the partitions whose inputs did not change reuse their previous results, and only the 
+        other ones are scheduled. The state of this run is stored in schedule_state.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates to be processed.
+            event_driven (bool): If True, only the dates where an allocation can happen are processed.
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+            periods ([[int]]): Date indexes of each planning period.
+            workers (int): Number of worker processes (1 if None).
+            coordinator (ScheduleCoordinator, optional): If provided, the partitions are scheduled by its workers.
+            previous_state (ScheduleState, optional): State of the previous run.
+
+        Returns:
+            PartitionedSchedule: The merged results of the partitions.
+        """
+        inputs = self.matrix_engine_inputs(dates, date_indexes, effort_scale, periods)
+        partitions = self.matrix_partitions(inputs)
+        available, used = inputs["available"], inputs["used"]
+
+        reused = {}
+
+        if previous_state is not None:
+            task_ids, used_keys, settings = self._fingerprint_keys(inputs, event_driven)
+            column_dates = self._column_dates(inputs)
+
+            fingerprints = [
+                partition_key(
+                    partition, [task_ids[task] for task in partition["tasks"]], [used_keys[row] for row in partition["used_rows"]], 
+                    settings)
+                for partition in partitions
+            ]
+            columns = [
+                column_fingerprints(column_dates, available[partition["available_rows"]], used[partition["used_rows"]])
+                for partition in partitions
+            ]
+            initial_used = used.copy()
+
+            for index, partition in enumerate(partitions):
+                stored = previous_state.reuse(
+                    fingerprints[index], column_dates, columns[index], partition["tasks"], partition["has_start_date"], 
+                    used[partition["used_rows"]])
+
+                if stored is not None:
+                    reused[index] = stored
+
+            replanned_tasks = [task_ids[task] for index, partition in enumerate(partitions) if index not in reused for task in partition["tasks"]]
+            self.schedule_summary["replanned_tasks"] = replanned_tasks
+
+            logger.info(f"{len(reused)} of {len(partitions)} partitions reused, {len(replanned_tasks)} tasks to re-plan.")
+
+        pending = [index for index in range(len(partitions)) if index not in reused]
+        pending_partitions = [partitions[index] for index in pending]
+
+        if coordinator is not None:
+            logger.info(f"Scheduling {len(pending_partitions)} partitions on the coordinator workers...")
+
+            pending_results, used = coordinator.run_partitions(
+                pending_partitions, available, used, len(periods), event_driven=event_driven)
+        else:
+            logger.info(f"Scheduling {len(pending_partitions)} partitions on {workers or 1} process(es)...")
+
+            pending_results, used = run_partitions(
+                pending_partitions, available, used, len(periods), workers or 1, event_driven=event_driven)
+
+        results = [None] * len(partitions)
+
+        for index, result in zip(pending, pending_results):
+            results[index] = result
+
+        for index, (result, used_rows) in reused.items():
+            used[partitions[index]["used_rows"]] = used_rows
+            results[index] = result
+
+        if previous_state is not None:
+            self.schedule_state = ScheduleState()
+
+            for index, partition in enumerate(partitions):
+                self.schedule_state.record(
+                    fingerprints[index], column_dates, columns[index], [task_ids[task] for task in partition["tasks"]], 
+                    partition["has_start_date"], results[index], initial_used[partition["used_rows"]], used[partition["used_rows"]])
+
+        resource_days = resource_days_multiple(inputs["period_days_available"]) if effort_scale is not None else None
+        schedule = PartitionedSchedule(
+            len(inputs["remaining"]), used, effort_scale, resource_days, 
+            **{key: inputs[key] for key in ["group_tasks", "group_rows", "row_used", "task_used"]})
+
+        for result in results:
+            schedule.merge(result)
+
+        return schedule
+
+    def _fingerprint_keys(self, inputs, event_driven):
+        """
+        Obtain the task IDs, used resources row keys and engine settings that identify the inputs of a matrix engine run 
+        (see partition_key). The dates are not part of the settings (see _column_dates).
+
+        Args:
+            inputs (dict): MatrixScheduleEngine arguments (see matrix_engine_inputs).
+            event_driven (bool): If True, the run uses event-driven time advance.
+
+        Returns:
+            tuple: Task ID of each task, key of each used resources row and settings tuple.
+        """
+        task_ids = self.tasks_df[TASK_ID].tolist()
+        used_df = self.resource_manager.used_resources_manager.info_df
+        used_keys = used_df[self.resource_manager.responsible_attr_names + [USED_RESOURCE_GOAL]].astype(str).values.tolist()
+        resource_days = resource_days_multiple(inputs["period_days_available"]) if inputs["effort_scale"] is not None else None
+        settings = (inputs["effort_scale"], resource_days, event_driven)
+
+        return task_ids, used_keys, settings
+
+    @staticmethod
+    def _column_dates(inputs):
+        """
+        Obtain the key of each matrix column date: its date, period days and number of merged dates.
+
+        Args:
+            inputs (dict): MatrixScheduleEngine arguments (see matrix_engine_inputs).
+
+        Returns:
+            list of str: Key of each column.
+        """
+        return [
+            f"{date} {days} {length}"
+            for date, days, length in zip(inputs["date_values"], np.asarray(inputs["period_days_available"]).tolist(), inputs["period_lengths"])
+        ]
+
+    def _run_matrix_checkpoints(self, inputs, column_count, event_driven, checkpoint_path, checkpoint_interval):
+        """
+        Run a MatrixScheduleEngine saving a checkpoint every checkpoint_interval processed dates. If the checkpoint file 
+        holds the state of an interrupted run with the same inputs, the run is resumed from it, with the same result as 
+        an uninterrupted run. The checkpoint file is removed when the run finishes.
+
+        Args:
+            inputs (dict): MatrixScheduleEngine arguments (see matrix_engine_inputs).
+            column_count (int): Number of matrix columns to process.
+            event_driven (bool): If True, only the dates where an allocation can happen are processed.
+            checkpoint_path (str): Path of the checkpoint file.
+            checkpoint_interval (int): Number of processed dates between checkpoints.
+
+        Returns:
+            tuple: The engine after running and the column indexes of the processed dates.
+        """
+        task_ids, used_keys, settings = self._fingerprint_keys(inputs, event_driven)
+        fingerprint = partition_fingerprint(
+            inputs, inputs["available"], inputs["used"], task_ids, used_keys, 
+            settings + (self._column_dates(inputs), inputs["has_start_date"].tolist()))
+
+        engine = MatrixScheduleEngine(**inputs)
+        checkpoint = load_checkpoint(checkpoint_path, fingerprint)
+
+        start = 0
+        processed = []
+
+        if checkpoint is not None:
+            engine.restore_state(checkpoint)
+            start = checkpoint["next_position"]
+            processed = checkpoint["processed"]
+
+        for count, column in enumerate(engine.iter_run(range(column_count), event_driven=event_driven, start=start), 1):
+            processed.append(column)
+
+            if count % checkpoint_interval == 0:
+                save_checkpoint(checkpoint_path, fingerprint, engine.checkpoint_state(), column + 1, processed)
+
+        remove_checkpoint(checkpoint_path)
+
+        return engine, processed
+
+    def matrix_partitions(self, inputs):
+        """
+        Split the MatrixScheduleEngine arguments into partitions that can be scheduled independently.
+
+        Tasks are in the same partition when they share available or used resources rows (directly or through the 
+        resource components of ProjectResourceManager.resource_components), belong to the same group, or are linked 
+        by a Task ID restriction. Groups and tasks keep their processing order inside each partition.
+
+        Args:
+            inputs (dict): MatrixScheduleEngine arguments (see matrix_engine_inputs).
+
+        Returns:
+            list of dict: Engine arguments of each partition (see run_partitions), ordered by their first task.
+        """
+        task_count = len(inputs["remaining"])
+        available_components, used_components = self.resource_manager.resource_components(inputs["row_used"])
+        component_count = max(available_components.max(initial=-1), used_components.max(initial=-1)) + 1
+
+        # Nodes: tasks, then resource components
+        edges = []
+        for group, tasks in enumerate(inputs["group_tasks"]):
+            for task in tasks:
+                edges.append((task, tasks[0]))
+                edges.extend((task, task_count + component) for component in available_components[inputs["group_rows"][group]])
+                edges.extend((task, task_count + component) for component in used_components[inputs["task_used"][task]])
+
+        predecessors = inputs["dependencies"].predecessors
+        edges.extend((task, predecessor) for task, predecessor in enumerate(predecessors) if predecessor >= 0)
+
+        labels = connected_components(task_count + component_count, edges)
+        task_labels = labels[:task_count]
+        available_labels = labels[task_count + available_components]
+        used_labels = labels[task_count + used_components]
+
+        group_labels = np.array([task_labels[tasks[0]] for tasks in inputs["group_tasks"]], dtype=np.int64)
+        task_groups = [np.flatnonzero(group_labels == label) for label in range(labels.max(initial=-1) + 1)]
+
+        partitions = []
+
+        for label in np.unique(task_labels):
+            tasks = np.flatnonzero(task_labels == label)
+            available_rows = np.flatnonzero(available_labels == label)
+            used_rows = np.flatnonzero(used_labels == label)
+
+            local_tasks = np.full(task_count, -1, dtype=np.int64)
+            local_tasks[tasks] = np.arange(tasks.size)
+            local_available = np.full(available_labels.size, -1, dtype=np.int64)
+            local_available[available_rows] = np.arange(available_rows.size)
+            local_used = np.full(used_labels.size, -1, dtype=np.int64)
+            local_used[used_rows] = np.arange(used_rows.size)
+
+            partitions.append(dict(
+                tasks=tasks,
+                available_rows=available_rows,
+                used_rows=used_rows,
+                remaining=inputs["remaining"][tasks],
+                resources_max=inputs["resources_max"][tasks],
+                dependencies=inputs["dependencies"].subgraph(tasks),
+                restriction_dates=inputs["restriction_dates"][tasks],
+                has_start_date=inputs["has_start_date"][tasks],
+                group_tasks=[local_tasks[inputs["group_tasks"][group]] for group in task_groups[label]],
+                group_rows=[local_available[inputs["group_rows"][group]] for group in task_groups[label]],
+                row_used=[local_used[inputs["row_used"][row]] for row in available_rows],
+                task_used=[local_used[inputs["task_used"][task]] for task in tasks],
+                date_values=inputs["date_values"],
+                period_days_available=inputs["period_days_available"],
+                effort_scale=inputs["effort_scale"],
+                period_lengths=inputs["period_lengths"]))
+
+        return partitions
+
+    def _load_matrix_engine(self, dates, date_indexes, effort_scale = None, periods = None):
+        """
+        Load tasks, available resources and used resources into a MatrixScheduleEngine, with one matrix column per 
+        planning period.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates that will be processed.
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+            periods ([[int]], optional): Date indexes of each planning period. Default: one period per date.
+
+        Returns:
+            MatrixScheduleEngine: The engine ready to run.
+
+        Raises:
+            ValueError: If a date to be processed is missing in available or used resources.
+        """
+        return MatrixScheduleEngine(**self.matrix_engine_inputs(dates, date_indexes, effort_scale, periods))
+
+    def matrix_engine_inputs(self, dates, date_indexes, effort_scale = None, periods = None):
+        """
+        Build the MatrixScheduleEngine arguments from the tasks, available resources and used resources, with one matrix 
+        column per planning period. The arguments can be reused to build several engines: each engine copies the arrays 
+        and the dependency graph it updates.
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates that will be processed.
+            effort_scale (int, optional): If provided, effort is handled as fixed-point units of 1 / effort_scale person-day.
+            periods ([[int]], optional): Date indexes of each planning period. Resources of merged dates are added up, 
+                weighted by their period days (see _merge_period_columns). Default: one period per date.
+
+        Returns:
+            dict: MatrixScheduleEngine keyword arguments.
+
+        Raises:
+            ValueError: If a date to be processed is missing in available or used resources.
+        """
+        logger.info("Loading tasks and resources into the matrix engine...")
+
+        used_manager = self.resource_manager.used_resources_manager
+        used_df = used_manager.info_df
+        responsible_attr_names = self.resource_manager.responsible_attr_names
+
+        if periods is None:
+            periods = [[date_index] for date_index in date_indexes]
+
+        period_days = self._column_period_days(dates, periods, effort_scale)
+
+        # Resources of the dates to be processed, added up by period
+        period_dates = [dates[date_index] for period in periods for date_index in period]
+        scale = resource_scale(effort_scale, resource_days_multiple(period_days)) if effort_scale is not None else None
+
+        available = self.resource_manager.available_resources_matrix(period_dates, scale)
+        used = used_manager.used_resources_matrix(period_dates, scale)
+
+        if len(period_dates) > len(periods):
+            weights = self._period_date_weights(period_dates, periods, period_days)
+            available = self._merge_period_columns(available, weights, periods)
+            used = self._merge_period_columns(used, weights, periods)
+
+        date_values = safe_to_datetime_series([dates[period[0]] for period in periods]).to_numpy(dtype='datetime64[ns]')
+
+        # Groups in the same order as the pandas groupby, tasks in DataFrame order inside each group
+        group_numbers = self.tasks_df.groupby([TASK_PRIORITY, TASK_AUX_RESPONSIBILITY_KEY]).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        group_count = group_numbers.max() + 1 if group_numbers.size else 0
+        group_tasks = [np.flatnonzero(group_numbers == group) for group in range(group_count)]
+
+        responsibility_dicts = self.tasks_df[TASK_AUX_RESPONSIBILITY_DICT].tolist()
+
+        group_rows = [
+            np.flatnonzero(self.resource_manager.goal_resources_mask(**responsibility_dicts[tasks[0]]).to_numpy())
+            for tasks in group_tasks
+        ]
+
+        row_filter_columns = responsible_attr_names + [USED_RESOURCE_GOAL]
+        row_used = self.resource_manager.available_used_rows()
+
+        # Matching masks are calculated once per column and value, as many tasks share responsibility values
+        column_masks = {}
+
+        def match_mask(col, value):
+            key = (col, value)
+            if key not in column_masks:
+                column_masks[key] = used_manager.match_resources_mask(**{col: value}).to_numpy()
+            return column_masks[key]
+
+        task_filter_columns = [col for col in row_filter_columns if col in self.tasks_df.columns]
+        task_used = []
+
+        for task in self.tasks_df[task_filter_columns].itertuples(index=False):
+            mask = np.ones(used_df.shape[0], dtype=bool)
+            for col, value in zip(task_filter_columns, task):
+                mask &= match_mask(col, value)
+            task_used.append(np.flatnonzero(mask))
+
+        restriction_dates = self.restriction_dates if self.restriction_dates is not None else self.parse_restriction_dates(self.tasks_df)
+
+        if TASK_START_DATE in self.tasks_df.columns:
+            has_start_date = self.tasks_df[TASK_START_DATE].notna().to_numpy()
+        else:
+            has_start_date = np.zeros(self.tasks_df.shape[0], dtype=bool)
+
+        return dict(
+            remaining=self.tasks_df[TASK_REMAINING].to_numpy(dtype=float),
+            resources_max=self.tasks_df[TASK_RESOURCES_MAX].to_numpy(dtype=float),
+            dependencies=self.dependency_graph,
+            # Task ID restrictions are handled by the dependency graph, date restrictions by the engine
+            restriction_dates=restriction_dates.to_numpy(dtype='datetime64[ns]'),
+            has_start_date=has_start_date,
+            group_tasks=group_tasks,
+            group_rows=group_rows,
+            row_used=row_used,
+            task_used=task_used,
+            available=available,
+            used=used,
+            date_values=date_values,
+            period_days_available=period_days,
+            effort_scale=effort_scale,
+            period_lengths=[len(period) for period in periods])
+
+    def _column_period_days(self, dates, periods, effort_scale = None):
+        """
+        Period days of each matrix column: the mean of the days of its dates (rounded to whole days in fixed-point).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager).
+            periods ([[int]]): Date indexes of each planning period.
+            effort_scale (int, optional): Effort units per person-day in fixed-point mode.
+
+        Returns:
+            np.ndarray: Period days of each column.
+        """
+        period_days = np.array([np.mean([self._date_period_days(dates[date_index]) for date_index in period]) for period in periods])
+
+        return period_days if effort_scale is None else np.rint(period_days)
+
+    def _period_date_weights(self, period_dates, periods, period_days):
+        """
+        Weight of each date of the planning periods in its matrix column: its period days over the period days of the 
+        column, so that the effort of a merged period (resources x column days) is the sum of resources x days of its dates.
+
+        Args:
+            period_dates ([str]): Dates of the planning periods, in order.
+            periods ([[int]]): Date indexes of each planning period.
+            period_days (np.ndarray): Period days of each column.
+
+        Returns:
+            np.ndarray: Weight of each date (1 for dates with the days of their column).
+        """
+        date_days = np.array([self._date_period_days(date) for date in period_dates], dtype=float)
+        column_days = np.repeat(np.asarray(period_days, dtype=float), [len(period) for period in periods])
+
+        return np.divide(date_days, column_days, out=np.zeros_like(date_days), where=column_days > 0)
+
+    @staticmethod
+    def _merge_period_columns(values, weights, periods):
+        """
+        Add up the resources of the dates of each planning period, weighted by the days of each date (see _period_date_weights).
+
+        Args:
+            values (np.ndarray): Resources of each date (rows x period dates), floats or fixed-point units.
+            weights (np.ndarray): Weight of each date.
+            periods ([[int]]): Date indexes of each planning period.
+
+        Returns:
+            np.ndarray: Resources of each period (rows x periods), in the type of the values.
+        """
+        period_starts = np.cumsum([0] + [len(period) for period in periods])[:-1]
+
+        # Dates with the days of their column are added up exactly (also in fixed-point)
+        if np.all(weights == 1):
+            return np.add.reduceat(values, period_starts, axis=1)
+
+        merged = np.add.reduceat(values * weights, period_starts, axis=1)
+
+        if values.dtype.kind != 'i':
+            return merged
+
+        return np.clip(np.rint(merged), -FIXED_POINT_INFINITY, FIXED_POINT_INFINITY).astype(np.int64)
+
+    def _store_matrix_engine(self, engine, dates, date_indexes, periods = None):
+        """
+        Write the results of a MatrixScheduleEngine run back to the tasks and used resources DataFrames.
+
+        The resources used in a merged period are spread over its dates (see _spread_merged_periods).
+
+        Args:
+            engine (MatrixScheduleEngine): The engine after running.
+            dates ([str]): Dates (as defined in the resource_manager).
+            date_indexes ([int]): Indexes of the dates that were processed.
+            periods ([[int]], optional): Date indexes of each planning period (one per matrix column). 
+                Default: one period per date.
+        """
+        if periods is None:
+            periods = [[date_index] for date_index in date_indexes]
+
+        used_manager = self.resource_manager.used_resources_manager
+        scale = resource_scale(engine.effort_scale, engine.resource_days) if engine.effort_scale is not None else None
+        engine_used = engine.used if scale is None else from_fixed_point(engine.used, scale)
+
+        period_dates = [dates[date_index] for period in periods for date_index in period]
+        used = np.array(used_manager.used_resources_matrix(period_dates), dtype=float)
+
+        if len(period_dates) > len(periods):
+            column_days = self._column_period_days(dates, periods, engine.effort_scale)
+            self._spread_merged_periods(engine, used, engine_used, column_days, period_dates, periods, scale)
+        else:
+            used[:] = engine_used
+
+        used_manager.store_used_resources_matrix(period_dates, used)
+
+        remaining = engine.remaining if engine.effort_scale is None else from_fixed_point(engine.remaining, engine.effort_scale)
+
+        positions = np.flatnonzero(engine.allocated)
+
+        start_dates = [dates[periods[index][0]] if index >= 0 else None for index in engine.start_indexes[positions]]
+        end_dates = [dates[periods[index][-1]] if index >= 0 else None for index in engine.end_indexes[positions]]
+
+        self._store_task_changes(self.tasks_df, positions, remaining[positions], start_dates, end_dates)
+
+        # The engines work on copies of the dependency graph
+        self.dependency_graph.reset(engine.remaining == 0)
+
+    def _spread_merged_periods(self, engine, used, engine_used, column_days, period_dates, periods, scale = None):
+        """
+        Write the used resources of the matrix columns to the dates of the planning periods. 
+
+        The effort added to a used resources row in a merged period is spread over its working dates proportionally to 
+        resources x days, taking as resources of each date the lowest available resources of the rows that constrain 
+        the used resources row: the available rows that consume it or, for the rows of the tasks, the rows of their 
+        groups. A row gets no usage on the dates where one of them has no resources (if all the dates are so, or 
+        nothing constrains the row, the effort is spread by days).
+
+        Args:
+            engine (MatrixScheduleEngine): The engine after running (or the merged results of its partitions).
+            used (np.ndarray): Used resources of the period dates before the run (rows x period dates). Updated in place.
+            engine_used (np.ndarray): Used resources of each column after the run (rows x columns).
+            column_days (np.ndarray): Period days of each column.
+            period_dates ([str]): Dates of the planning periods, in order.
+            periods ([[int]]): Date indexes of each planning period.
+            scale (int, optional): Fixed-point scale of the engine resources, None for floats.
+        """
+        weights = self._period_date_weights(period_dates, periods, column_days)
+        date_days = np.repeat(np.asarray(column_days, dtype=float), [len(period) for period in periods]) * weights
+
+        # Used resources of each column before the run, as loaded into the engine
+        if scale is None:
+            initial_used = self._merge_period_columns(used, weights, periods)
+        else:
+            initial_used = from_fixed_point(self._merge_period_columns(to_fixed_point(used, scale), weights, periods), scale)
+
+        available = np.maximum(np.nan_to_num(self.resource_manager.available_resources_matrix(period_dates)), 0)
+
+        # Available resources rows constraining each used resources row
+        constraints = np.zeros((available.shape[0], used.shape[0]), dtype=bool)
+        for row, used_rows in enumerate(engine.row_used):
+            constraints[row, used_rows] = True
+
+        consumed = constraints.any(axis=0)
+
+        for group, tasks in enumerate(engine.group_tasks):
+            for task in tasks:
+                task_rows = engine.task_used[task][~consumed[engine.task_used[task]]]
+                constraints[np.ix_(engine.group_rows[group], task_rows)] = True
+
+        # Resources of each used resources row on each date: the lowest of its constraining rows
+        row_resources = np.full(used.shape, np.inf)
+        for row in range(available.shape[0]):
+            used_rows = np.flatnonzero(constraints[row])
+            row_resources[used_rows] = np.minimum(row_resources[used_rows], available[row])
+
+        column = 0
+
+        for period_index, period in enumerate(periods):
+            columns = slice(column, column + len(period))
+            column += len(period)
+
+            if len(period) == 1:
+                used[:, columns.start] = engine_used[:, period_index]
+                continue
+
+            days = date_days[columns]
+            effort = (engine_used[:, period_index] - initial_used[:, period_index]) * column_days[period_index]
+
+            if days.sum() == 0:
+                continue
+
+            # Resources added on each working date: effort x row resources / sum of row resources x days
+            working = days > 0
+            rates = np.where(working, row_resources[:, columns], 0)
+            totals = rates @ days
+            by_days = ~(np.isfinite(totals) & (totals > 0))
+
+            rates[by_days] = working
+            totals[by_days] = days.sum()
+
+            used[:, columns] += effort[:, None] * rates / totals[:, None]
+
+    def _store_task_changes(self, tasks_df, positions, remaining, start_dates, end_dates):
+        """
+        Write the remaining work, Start Date and End Date of the allocated tasks to a tasks DataFrame. 
+        Blocked days are added to the End Dates.
+
+        Args:
+            tasks_df (pd.DataFrame): Tasks DataFrame to update (in the order of the task positions).
+            positions (np.ndarray): Positions of the allocated tasks.
+            remaining (np.ndarray): Remaining work of each allocated task.
+            start_dates (list): Start Date of each allocated task (None if not set during the run).
+            end_dates (list): End Date of each allocated task, without blocked days (None if not finished).
+        """
+        if len(positions) == 0:
+            return
+
+        holidays = configured_holidays()
+
+        changes = pd.DataFrame({TASK_REMAINING: remaining}, index=tasks_df.index[positions])
+
+        if TASK_START_DATE in tasks_df.columns:
+            changes[TASK_START_DATE] = start_dates
+
+        blocked_days = tasks_df[TASK_BLOCKED_DAYS].to_numpy()[positions]
+
+        changes[TASK_END_DATE] = [
+            TaskManager.calculate_end_date_with_block(end_date, blocked, holidays) if end_date is not None and blocked > 0 else end_date
+            for end_date, blocked in zip(end_dates, blocked_days)
+        ]
+
+        tasks_df.update(changes)
     
     @staticmethod
     def _distribute_resources_same_priority_and_responsible_tasks(tasks, available_effort, period_days_available = 5):
@@ -314,10 +1445,9 @@ class TaskManager:
         resource limits, and resources already used, specifically for tasks of the same priority
         and responsibility.
 
-        This method iteratively allocates resources to tasks until no more resources can be distributed.
-        The allocation considers the maximum resources available, maximum resources per task, and
-        remaining work for each task. It ensures that tasks are proportionally allocated resources based on
-        their remaining needs.
+        Tasks are proportionally allocated resources based on their remaining needs, capped by the maximum 
+        resources per task and their remaining work. The resources a capped task cannot use are distributed among 
+        the other tasks (see project_matrix_engine.distribute_effort).
 
         Args:
             tasks (pd.DataFrame): DataFrame of tasks at the same priority and responsibility key.
@@ -327,58 +1457,26 @@ class TaskManager:
         Returns:
             pd.DataFrame: The updated tasks DataFrame with allocated resources noted.
         """
-        max_available = available_effort
-        
-        if max_available == 0:
+        if available_effort == 0:
             tasks[TASK_AUX_ALLOCATABLE_RESOURCES] = 0            
             return tasks
-
-        results = pd.DataFrame()
         
-        logger.debug(f"Allocating resources for {tasks.shape[0]} tasks with {max_available} resources available.")
+        logger.debug(f"Allocating resources for {tasks.shape[0]} tasks with {available_effort} resources available.")
 
-        while not tasks.empty:
-            if tasks.shape[0] == 1:
-                first_task = tasks.iloc[0]                                
-                
-                logger.debug(f"Allocating {min(first_task[TASK_RESOURCES_MAX], max_available, first_task[TASK_REMAINING])} resources for task {first_task[TASK_ID]}.")
+        remaining = tasks[TASK_REMAINING].to_numpy(dtype=float)
+        capacities = tasks[TASK_RESOURCES_MAX].to_numpy(dtype=float) * period_days_available
 
-                allocatable_resources = min(first_task[TASK_RESOURCES_MAX] * period_days_available, max_available, first_task[TASK_REMAINING])
-                tasks[TASK_AUX_ALLOCATABLE_RESOURCES] = allocatable_resources
-                results = pd.concat([results, tasks])
-                break
-            
-            logger.debug("Tasks before allocation:")
-            logger.debug(f"Tasks: {tasks[TASK_ID].tolist()}")     
-            logger.debug(f"Period: {period_days_available} days")                   
-            logger.debug(f"Resources maximum (per period): {tasks[TASK_RESOURCES_MAX].tolist()} (*resources per period*)")
-            logger.debug(f"Resources remaining: {tasks[TASK_REMAINING].tolist()} (*days*)")             
+        if tasks.shape[0] > 1:
+            tasks[TASK_AUX_WEIGHT] = remaining / remaining.sum()
 
-            tasks[TASK_AUX_WEIGHT] = tasks[TASK_REMAINING] / tasks[TASK_REMAINING].sum()
+        tasks[TASK_AUX_ALLOCATABLE_RESOURCES] = distribute_effort(remaining, capacities, available_effort)
 
-            logger.debug(f"Calculated Weight: {tasks[TASK_AUX_WEIGHT].tolist()}")               
-
-            tasks[TASK_AUX_ALLOCATABLE_RESOURCES] = tasks.apply(
-                lambda task: min(max_available * task[TASK_AUX_WEIGHT], task[TASK_RESOURCES_MAX] * period_days_available, task[TASK_REMAINING]), axis=1
-            )
-
-            logger.debug(f"Calculated Allocatable Resources: {tasks[TASK_AUX_ALLOCATABLE_RESOURCES].tolist()}")
-
-            fully_allocated_mask = tasks[TASK_AUX_ALLOCATABLE_RESOURCES] < (tasks[TASK_AUX_WEIGHT] * max_available)
-            max_available -= tasks[fully_allocated_mask][TASK_AUX_ALLOCATABLE_RESOURCES].sum()
-
-            fully_allocated_tasks = tasks[fully_allocated_mask]
-            if fully_allocated_tasks.empty:
-                results = pd.concat([results, tasks])
-                break
-            
-            results = pd.concat([results, fully_allocated_tasks])
+        logger.debug(f"Calculated Allocatable Resources: {tasks[TASK_AUX_ALLOCATABLE_RESOURCES].tolist()}")
 
-            tasks = tasks[~fully_allocated_mask]
-        return results
+        return tasks
                     
             
-    def allocate_resources(self, task, available_effort, current_date): 
+    def allocate_resources(self, task, available_effort, current_date, batch = None): 
         """
         Allocate resources for a specific task on a given date.
 
@@ -386,9 +1484,18 @@ class TaskManager:
             task (pd.Series): The task for which resources are being allocated.
             available_effort (float): The total available effort for the task.
             current_date (str): The date for which resources are being allocated.
+            batch (list, optional): If provided, the used resources update is appended to it as a (task values, resources) 
+                pair to be applied with ProjectResourceManager.update_goal_resources_batch, instead of being applied now.
         """        
         self.update_task_attributes(task, available_effort, current_date)        
-        self.resource_manager.update_goal_resources(current_date, available_effort / 5, **task)
+
+        resources_used = available_effort / self._date_period_days(current_date)
+
+        if batch is None:
+            self.resource_manager.update_goal_resources(current_date, resources_used, **task)
+        else:
+            # apply may reuse the task Series for the next row: its values are copied
+            batch.append((task.to_dict(), resources_used))
 
         return task
 
@@ -415,7 +1522,7 @@ class TaskManager:
         if task[TASK_REMAINING] <= 0:
             task[TASK_REMAINING] = 0
             
-            holidays = AppConfig()[CONF_HOLIDAYS] if CONF_HOLIDAYS in AppConfig() else []
+            holidays = configured_holidays()
             
             if TASK_END_DATE not in task or pd.isnull(task[TASK_END_DATE]):         
                 if TASK_BLOCKED_DAYS in task and task[TASK_BLOCKED_DAYS] > 0:
@@ -430,14 +1537,86 @@ class TaskManager:
         logger.debug(f"Task {task[TASK_ID]} updated. Remaining: {task[TASK_REMAINING]} Start: {start_date} End: {end_date}")
 
     @staticmethod
-    def filter_tasks_by_restriction(tasks_df, completed_tasks, current_date):
+    def parse_restriction_dates(tasks_df):
+        """
+        Parse the date restrictions of the tasks in one vectorized call. Each restriction is parsed independently, so 
+        task ID restrictions do not invalidate the date restrictions of other tasks. The IDs of tasks of the schedule 
+        are task ID restrictions even if they look like dates (see build_dependency_graph).
+
+        Args:
+            tasks_df (pd.DataFrame): The DataFrame containing the task schedule.
+
+        Returns:
+            pd.Series: Restriction date of each task (NaT if none, or if it is a task ID), with the index of tasks_df.
+        """
+        restrictions = tasks_df[TASK_RESTRICTION]
+
+        restriction_dates = safe_to_datetime_series(restrictions.tolist()).to_numpy(dtype='datetime64[ns]', copy=True)
+        restriction_dates[restrictions.isin(set(tasks_df[TASK_ID])).to_numpy()] = np.datetime64('NaT')
+
+        return pd.Series(restriction_dates, index=tasks_df.index)
+
+    @staticmethod
+    def build_dependency_graph(tasks_df, restriction_dates = None):
+        """
+        Build the dependency graph of the task ID restrictions, with tasks in DataFrame order.
+
+        A restriction is a task ID restriction if it is the ID of a task of the schedule, or if it is not a valid date
+        (an unknown task ID: the task will never be released).
+
+        Args:
+            tasks_df (pd.DataFrame): The DataFrame containing the task schedule.
+            restriction_dates (pd.Series, optional): Restriction dates of the tasks (see parse_restriction_dates).
+                Parsed from tasks_df if not provided.
+
+        Returns:
+            TaskDependencyGraph: The dependency graph of the tasks.
+        """
+        if restriction_dates is None:
+            restriction_dates = TaskManager.parse_restriction_dates(tasks_df)
+
+        task_ids = tasks_df[TASK_ID].tolist()
+        known_ids = set(task_ids)
+
+        restrictions = [
+            restriction if pd.notnull(restriction) and (restriction in known_ids or pd.isna(restriction_date)) else None
+            for restriction, restriction_date in zip(tasks_df[TASK_RESTRICTION], restriction_dates)
+        ]
+
+        return TaskDependencyGraph(task_ids, restrictions)
+
+    @staticmethod
+    def filter_ready_tasks(tasks_df, ready, current_date, restriction_dates):
+        """
+        Filters the tasks ready on the dependency graph by their date restrictions.
+
+        Completion and task ID restrictions are only checked on the dependency graph (see TaskDependencyGraph), so the
+        date restrictions are the only ones left.
+
+        Args:
+            tasks_df (pd.DataFrame): The DataFrame containing the tasks.
+            ready (np.ndarray): True for the tasks not completed and not waiting for another task, aligned with tasks_df.
+            current_date (pd.Timestamp): The current date being processed.
+            restriction_dates (np.ndarray): Restriction dates of the tasks (see parse_restriction_dates), aligned with tasks_df.
+
+        Returns:
+            pd.DataFrame: Filtered DataFrame containing only tasks that are ready for processing.
+        """
+        return tasks_df[ready & ~(np.asarray(restriction_dates, dtype='datetime64[ns]') > current_date.to_datetime64())]
+
+    @staticmethod
+    def filter_tasks_by_restriction(tasks_df, completed_tasks, current_date, restriction_dates = None):
         """
         Filters tasks based on their restrictions.
 
+        The schedule update checks readiness on the dependency graph instead (see filter_ready_tasks).
+
         Args:
             tasks_df (pd.DataFrame): The DataFrame containing the task schedule.        
             completed_tasks (list): A list of task IDs that are already complete.
             current_date (datetime): The current date being processed.
+            restriction_dates (pd.Series, optional): Restriction dates (see parse_restriction_dates), indexed as the tasks. 
+                Parsed from tasks_df if not provided.
             
         Returns:
             pd.DataFrame: Filtered DataFrame containing only tasks that are ready for processing.
@@ -451,9 +1630,14 @@ class TaskManager:
         elif isinstance(current_date, datetime.date):
             current_date = safe_to_datetime(current_date)
         
+        if restriction_dates is None:
+            restriction_dates = TaskManager.parse_restriction_dates(tasks_df)
+        else:
+            restriction_dates = restriction_dates.loc[tasks_df.index]
+
         mask = tasks_df[TASK_RESTRICTION].isna()
         mask |= (tasks_df[TASK_RESTRICTION].isin(completed_tasks))
-        mask |= (safe_to_datetime(tasks_df[TASK_RESTRICTION], errors='coerce')) <= current_date
+        mask |= restriction_dates <= current_date
         mask &= ~tasks_df[TASK_ID].isin(completed_tasks)
 
         return tasks_df[mask]
@@ -475,6 +1659,40 @@ class TaskManager:
         mask = tasks[TASK_REMAINING] > 0
         tasks.loc[mask, TASK_END_DATE] = None       
 
+    @staticmethod
+    def calculate_working_days(dates, holidays = []):
+        """
+        Calculates the working days (weekdays that are not holidays) from each date to the next one.
+
+        The last date takes the spacing of the previous one (a week if there is only one date).
+
+        Args:
+            dates ([str]): Dates (as defined in the resource_manager), in order.
+            holidays (list, str): Dates that are holidays (see load_holidays).
+
+        Returns:
+            np.ndarray: Working days of each date.
+
+        Raises:
+            ValueError: If a date or a holiday is not valid.
+        """
+        if len(dates) == 0:
+            return np.zeros(0)
+
+        date_values = safe_to_datetime_series(dates)
+
+        if date_values.isna().any():
+            raise ValueError(f"Invalid date: {dates[int(np.flatnonzero(date_values.isna())[0])]}")
+
+        date_values = date_values.to_numpy(dtype='datetime64[D]')
+
+        spacing = date_values[-1] - date_values[-2] if date_values.size > 1 else np.timedelta64(7, 'D')
+        next_dates = np.append(date_values[1:], date_values[-1:] + spacing)
+
+        holiday_values = np.array(load_holidays(holidays), dtype='datetime64[D]')
+
+        return np.abs(np.busday_count(date_values, next_dates, holidays=holiday_values)).astype(float)
+
     @staticmethod
     def calculate_end_date_with_block(start_date, block_days, holidays = []):
         """
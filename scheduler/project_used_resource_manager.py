@@ -24,25 +24,73 @@
 import scheduler.pandas_conf
 
 import re
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 
 from utils.date_utils import safe_to_datetime
 from utils.app_config import AppConfig
 
 from scheduler.project_scheduler_constants import ACCUMULATED_SYNONYMS
+from scheduler.project_fixed_point import to_fixed_point, from_fixed_point
 
 from utils.logger import create_logger
 logger = create_logger(__name__) 
 
+@lru_cache(maxsize=None)
+def compiled_pattern(pattern):
+    """
+    Compiles a used resources responsibility value as a regexp, once per distinct value.
+
+    Args:
+        pattern (str): The responsibility value of a used resources row.
+
+    Returns:
+        re.Pattern: The compiled regexp, or None if the value is not a valid regexp.
+    """
+    try:
+        return re.compile(pattern)
+    except re.error:
+        return None
+
+def match_pattern(pattern, value):
+    """
+    Checks if a used resources responsibility value matches a filter value: wildcards, equal values or regexp.
+
+    Args:
+        pattern: The responsibility value of a used resources row.
+        value: The filter value.
+
+    Returns:
+        bool: True if the row value matches the filter value.
+    """
+    if pattern in ACCUMULATED_SYNONYMS or value == pattern:
+        return True
+
+    regex = compiled_pattern(str(pattern))
+
+    return regex is not None and bool(regex.match(value))
+
 class ProjectUsedResourceManager:
     """ 
     Class to manage the used resources for a project, updating the used resources DataFrame with the resources allocated to tasks.
 
     This class allows the user to update the used resources DataFrame with the resources allocated to tasks, considering the date and filters provided.
 
+    The date columns are stored as a dense float matrix (used_values) and the other columns in a side table (info_df), so 
+    updates are array operations. The DataFrame is built from them when used_resources_df is accessed. As the caller may 
+    change the DataFrame it obtains, it is loaded back into the matrix before the next operation of the manager if it 
+    was changed (see sync).
+
     Attributes:
         used_resources_df (pd.DataFrame): DataFrame containing the used resources with specific columns for dates and other categories such as team or project.
+        info_df (pd.DataFrame): Columns of the used resources that are not dates. It must not be modified.
+        used_values (np.ndarray): Used resources (used resources rows x date columns).
+        date_positions (dict): Column of each date in used_values.
+        row_positions (dict): Row of each used resources DataFrame index label in used_values.
+        match_index (dict): Rows matched by each filter used in update_used_resources (filter items tuple -> boolean mask). It is refreshed when rows are added.
+        values_version (int): Incremented each time the used resources values are changed by the manager or loaded from the DataFrame.
     """ 
     
     def __init__(self, used_resources_df):        
@@ -61,7 +109,127 @@ class ProjectUsedResourceManager:
         Args:
             used_resources_df (pd.DataFrame): DataFrame containing the used resources with specific columns for dates and other categories such as team or project.
         """        
+        self._date_columns = {}
+        self._loaded_df = None
+        self.values_version = 0
+
         self.used_resources_df = used_resources_df.fillna(0)              
+
+        self._load_used_resources()
+
+    @property
+    def used_resources_df(self):
+        """
+        The used resources DataFrame, built from info_df and used_values the first time it is accessed after a change.
+        """
+        if self._used_resources_df is None:
+            self._used_resources_df = self._build_used_resources_df()
+            self._loaded_df = self._used_resources_df
+
+        self._used_resources_df_shared = True
+
+        return self._used_resources_df
+
+    @used_resources_df.setter
+    def used_resources_df(self, used_resources_df):
+        self._used_resources_df = used_resources_df
+        self._used_resources_df_shared = True
+
+    def _is_date_column(self, column):
+        if column not in self._date_columns:
+            self._date_columns[column] = safe_to_datetime(column, errors='coerce') is not pd.NaT
+
+        return self._date_columns[column]
+
+    def _load_used_resources(self):
+        """
+        Loads the used resources DataFrame into info_df and used_values if it was handed out or replaced since the last load.
+        """
+        if not self._used_resources_df_shared:
+            return
+
+        used_resources_df = self._used_resources_df
+        self._used_resources_df_shared = False
+
+        # A handed-out DataFrame that was not changed keeps the loaded values and the match index
+        if used_resources_df is self._loaded_df and self._matches_loaded_values(used_resources_df):
+            return
+
+        dates = [col for col in used_resources_df.columns if self._is_date_column(col)]
+
+        self._columns = list(used_resources_df.columns)
+        self._date_dtypes = {date: used_resources_df[date].dtype for date in dates}
+
+        self.info_df = used_resources_df[[col for col in self._columns if col not in self._date_dtypes]].copy()
+        self.used_values = np.array(used_resources_df[dates].to_numpy(dtype=float).reshape(used_resources_df.shape[0], len(dates)))
+        self.date_positions = {date: position for position, date in enumerate(dates)}
+        self.row_positions = {label: position for position, label in enumerate(used_resources_df.index)}
+
+        self._loaded_df = used_resources_df
+        self.values_version += 1
+
+        self.refresh_match_index()
+
+    def _matches_loaded_values(self, used_resources_df):
+        if list(used_resources_df.columns) != self._columns or not used_resources_df.index.equals(self.info_df.index):
+            return False
+
+        dates = list(self.date_positions)
+
+        if any(used_resources_df[date].dtype != dtype for date, dtype in self._date_dtypes.items()):
+            return False
+
+        return (used_resources_df[list(self.info_df.columns)].equals(self.info_df) and 
+                np.array_equal(used_resources_df[dates].to_numpy(dtype=float), self.used_values))
+
+    def sync(self):
+        """
+        Loads the changes made to the used resources DataFrame since it was handed out or replaced.
+
+        The manager loads them before each read or update of the values. Callers that keep their own copy of the values 
+        (e.g. the capacity ledger) call it before comparing values_version.
+        """
+        self._load_used_resources()
+
+    def _build_used_resources_df(self):
+        dates = list(self.date_positions)
+        date_df = pd.DataFrame(self.used_values, index=self.info_df.index, columns=dates)
+
+        # Integer date columns stay integer while their values are whole, as pandas does on assignment
+        for date, dtype in self._date_dtypes.items():
+            if dtype != date_df[date].dtype:
+                date_df[date] = date_df[date].astype(dtype)
+
+        return pd.concat([self.info_df, date_df], axis=1)[self._columns]
+
+    def _values_changed(self, dates, dtype = None):
+        for date in dates:
+            if dtype is not None:
+                self._date_dtypes[date] = dtype
+            elif self._date_dtypes[date].kind in 'iu' and np.any(np.mod(self.used_values[:, self.date_positions[date]], 1) != 0):
+                self._date_dtypes[date] = np.dtype(float)
+
+        self._used_resources_df = None
+        self.values_version += 1
+
+    def _date_position(self, date):
+        self._load_used_resources()
+
+        if date not in self.date_positions:
+            logger.error("The date column %s is not valid or does not exist in the Used Resources DataFrame.", date)
+            raise ValueError(f"The date column {date} is not valid or does not exist in the Used Resources DataFrame.")
+
+        return self.date_positions[date]
+
+    def refresh_match_index(self):
+        """
+        Clears the precomputed rows of update_used_resources filters. 
+
+        It is called automatically when the used resources DataFrame is loaded (after it was accessed or replaced).
+        """
+        self.match_index = {}
+        self._match_rows = {}
+        self._column_masks = {}
         
     
     def clean_used_resources(self, clean_date):
@@ -90,13 +258,15 @@ class ProjectUsedResourceManager:
         """
         if isinstance(clean_date, str):
             clean_date = safe_to_datetime(clean_date)
+
+        self._load_used_resources()
         
-        date_columns = [col for col in self.used_resources_df.columns if safe_to_datetime(col, errors='coerce') is not pd.NaT]
-        
-        future_dates = [date for date in date_columns if safe_to_datetime(date) >= clean_date]
+        future_dates = [date for date in self.date_positions if safe_to_datetime(date) >= clean_date]
 
         for date in future_dates:
-            self.used_resources_df[date] = 0.0
+            self.used_values[:, self.date_positions[date]] = 0.0
+
+        self._values_changed(future_dates, np.dtype(float))
 
         logger.info("Resources cleaned for dates after: %s", clean_date.strftime('%d/%m/%Y'))
 
@@ -115,20 +285,73 @@ class ProjectUsedResourceManager:
         Raises:
             ValueError: If the date column is invalid or does not exist.
         """
-        if date not in self.used_resources_df.columns or safe_to_datetime(date, errors='coerce') is pd.NaT:
-            raise ValueError(f"The date column {date} is not valid or does not exist in the Used Resources DataFrame.")
-        
-        filtered_df = self.used_resources_df
+        position = self._date_position(date)
+
+        return self.used_values[self.goal_resources_mask(**filter_conditions).to_numpy(), position].sum()
+
+    def used_resources_matrix(self, dates, scale = None):
+        """
+        Retrieves the used resources of several dates as a matrix (used resources rows x dates).
+
+        Args:
+            dates ([str]): Date columns to retrieve.
+            scale (int, optional): If provided, the resources are returned as int64 fixed-point units of 1 / scale.
+
+        Returns:
+            np.ndarray: The used resources matrix.
+
+        Raises:
+            ValueError: If a date column is invalid or does not exist.
+        """
+        positions = [self._date_position(date) for date in dates]
+
+        values = self.used_values[:, positions]
+
+        return values if scale is None else to_fixed_point(values, scale)
+
+    def store_used_resources_matrix(self, dates, values, scale = None):
+        """
+        Sets the used resources of several dates from a matrix (used resources rows x dates).
+
+        Args:
+            dates ([str]): Date columns to set.
+            values (np.ndarray): The used resources matrix.
+            scale (int, optional): If provided, values are int64 fixed-point units of 1 / scale and are converted to floats.
+
+        Raises:
+            ValueError: If a date column is invalid or does not exist.
+        """
+        if scale is not None:
+            values = from_fixed_point(values, scale)
+
+        values = np.asarray(values)
+
+        for position, date in enumerate(dates):
+            self.used_values[:, self._date_position(date)] = values[:, position]
+
+        self._values_changed(dates, values.dtype)
+
+    def goal_resources_mask(self, **filter_conditions):
+        """
+        Builds the row selection used by obtain_used_goal_resources. Note: '*' are treated as actual values, not wildcards.
+
+        Args:
+            **filter_conditions (dict): Filters to apply on the DataFrame columns.
+
+        Returns:
+            pd.Series: Boolean mask over the used resources rows.
+        """
+        self._load_used_resources()
+
+        mask = pd.Series(True, index=self.info_df.index)
 
         for col, val in filter_conditions.items():
-            if val in ACCUMULATED_SYNONYMS:                                        
-                filtered_df = filtered_df[filtered_df[col].isin(ACCUMULATED_SYNONYMS)]
+            if val in ACCUMULATED_SYNONYMS:
+                mask &= self.info_df[col].isin(ACCUMULATED_SYNONYMS)
             else:
-                filtered_df = filtered_df[filtered_df[col] == val]
-
-        used_resources = filtered_df[date].sum()
+                mask &= self.info_df[col] == val
 
-        return used_resources
+        return mask
         
     def update_used_resources(self, current_date, resources_used, increase = True, **filters):
         """
@@ -145,33 +368,138 @@ class ProjectUsedResourceManager:
         """
         logger.debug("Updating used resources for date %s", current_date)
 
-        if current_date not in self.used_resources_df.columns:
-            logger.error("The date column %s is not valid or does not exist in the Used Resources DataFrame.", current_date)
-            raise ValueError(f"The date column {current_date} is not valid or does not exist in the Used Resources DataFrame.")
+        position = self._date_position(current_date)
 
-        mask = pd.Series(True, index=self.used_resources_df.index)
-
-        def is_valid_regex(pattern):
-            try:
-                re.compile(str(pattern))
-                return True
-            except:
-                return False
-        
-        def match_regex(pattern, value):
+        mask = self.match_index_mask(**filters)
             
-            return pattern in ACCUMULATED_SYNONYMS or value == pattern or (is_valid_regex(str(pattern)) and bool(re.match(str(pattern), value)))
+        if increase:                                        
+            self.used_values[mask, position] += resources_used
+        else:
+            self.used_values[mask, position] = resources_used
+
+        self._values_changed([current_date])
+
+        logger.debug("Resources updated successfully.") 
+
+    def update_used_resources_batch(self, current_date, filters_list, resources_used):
+        """
+        Adds several usages of a date at once, with the same result as calling update_used_resources for each of them in order.
+
+        The rows matched by each filter are taken from the match index, and the usages are added with one scatter-add 
+        over the date column, in the order of the filters.
+
+        Args:
+            current_date (str): Date column in which to update the resources.
+            filters_list (list of dict): Filters of each usage, as in update_used_resources.
+            resources_used (list of float): Amount of resources of each usage.
+
+        Raises:
+            ValueError: If the date column is invalid or does not exist, if a filter column does not exist or if the 
+                number of filters and amounts differ.
+        """
+        if len(filters_list) != len(resources_used):
+            raise ValueError(f"{len(filters_list)} filters and {len(resources_used)} amounts of used resources provided.")
+
+        position = self._date_position(current_date)
+
+        rows = [self._matched_rows(filters) for filters in filters_list]
+
+        if rows:
+            amounts = np.repeat(np.asarray(resources_used, dtype=float), [len(usage_rows) for usage_rows in rows])
+            np.add.at(self.used_values[:, position], np.concatenate(rows), amounts)
+
+        self._values_changed([current_date])
+
+        logger.debug(f"{len(filters_list)} used resources updates applied for date {current_date}.")
+
+    def _matched_rows(self, filters):
+        try:
+            key = tuple(filters.items())
+            hash(key)
+        except TypeError:
+            return np.flatnonzero(self.match_index_mask(**filters))
+
+        if key not in self._match_rows:
+            self._match_rows[key] = np.flatnonzero(self.match_index_mask(**filters))
+
+        return self._match_rows[key]
+
+    def match_resources_mask(self, **filters):
+        """
+        Builds the row selection used by update_used_resources, considering regexp and wildcards in the DataFrame rows.
+
+        Args:
+            **filters (dict): Filters defining which rows to select. '*' values in the DataFrame act as wildcards.
+
+        Returns:
+            pd.Series: Boolean mask over the used resources rows.
+
+        Raises:
+            ValueError: If a filter column does not exist.
+        """
+        mask = self.match_index_mask(**filters)
+
+        return pd.Series(mask, index=self.info_df.index, copy=True)
+
+    def match_index_mask(self, **filters):
+        """
+        Retrieves the rows matched by a filter from the match index, calculating them the first time the filter is used.
+
+        Args:
+            **filters (dict): Filters defining which rows to select. '*' values in the DataFrame act as wildcards.
+
+        Returns:
+            np.ndarray: Boolean mask over the used resources rows. It must not be modified.
+
+        Raises:
+            ValueError: If a filter column does not exist.
+        """
+        self._load_used_resources()
+
+        try:
+            key = tuple(filters.items())
+            hash(key)
+        except TypeError:
+            return self._filters_mask(filters)
+
+        if key not in self.match_index:
+            self.match_index[key] = self._filters_mask(filters)
+
+        return self.match_index[key]
+
+    def _filters_mask(self, filters):
+        mask = np.ones(self.info_df.shape[0], dtype=bool)
 
         for key, value in filters.items():
-            if key not in self.used_resources_df.columns:
+            if key not in self.info_df.columns:
                 logger.error("The column %s is not valid or does not exist in the Used Resources DataFrame.", key)
                 raise ValueError(f"The column {key} is not valid or does not exist in the Used Resources DataFrame.")
-            
-            mask &= self.used_resources_df[key].apply(lambda x: match_regex(x, value))
-            
-        if increase:                                        
-                self.used_resources_df.loc[mask, current_date] += resources_used
-        else:
-            self.used_resources_df.loc[mask, current_date] = resources_used
 
-        logger.debug("Resources updated successfully.") 
\ No newline at end of file
+            mask &= self._column_mask(key, value)
+
+        return mask
+
+    def _column_mask(self, column, value):
+        try:
+            key = (column, value)
+            hash(key)
+        except TypeError:
+            return np.array([match_pattern(pattern, value) for pattern in self.info_df[column]], dtype=bool)
+
+        if key not in self._column_masks:
+            # Many rows share their responsibility values: each distinct value is matched once
+            matches = {}
+            column_mask = np.empty(self.info_df.shape[0], dtype=bool)
+
+            for position, pattern in enumerate(self.info_df[column]):
+                try:
+                    pattern_key = (type(pattern), pattern)
+                    if pattern_key not in matches:
+                        matches[pattern_key] = match_pattern(pattern, value)
+                    column_mask[position] = matches[pattern_key]
+                except TypeError:
+                    column_mask[position] = match_pattern(pattern, value)
+
+            self._column_masks[key] = column_mask
+
+        return self._column_masks[key]
@@ -0,0 +1,84 @@
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+
+TODAY = "2024-05-13"
+
+class TaskScheduleTestCase(unittest.TestCase):
+    """Base of the update_task_schedule tests: builds the inputs from the data each test case varies and runs the schedule."""
+
+    period = 5
+
+    def set_inputs(self, dates, tasks, available, used):
+        """
+        Set the dates and the tasks, available resources and used resources DataFrames.
+
+        Args:
+            dates ([str]): Dates of the resources.
+            tasks (dict): Values of each task column. Task IDs are '1', '2'..., goals 'Goal<ID>', and restrictions,
+                Start Dates and End Dates are empty unless given.
+            available (dict): Available resources of each team (Goal '*') on every date.
+            used (list of tuple): Goal, team and used resources on every date of each used resources row.
+        """
+        count = len(tasks[TASK_REMAINING])
+        task_ids = [str(task_id) for task_id in range(1, count + 1)]
+
+        self.dates = dates
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: task_ids,
+            TASK_GOAL: [f"Goal{task_id}" for task_id in task_ids],
+            TASK_PRIORITY: tasks[TASK_PRIORITY],
+            TASK_RESOURCES_MAX: tasks[TASK_RESOURCES_MAX],
+            TASK_RESTRICTION: [None] * count,
+            TASK_REMAINING: tasks[TASK_REMAINING],
+            TASK_START_DATE: [None] * count,
+            TASK_END_DATE: [None] * count,
+            **tasks
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': list(available),
+            'Goal': ['*'] * len(available),
+            **{date: list(available.values()) for date in dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': [goal for goal, _, _ in used],
+            'Team': [team for _, team, _ in used],
+            **{date: [value for _, _, value in used] for date in dates}
+        })
+
+    def _task_manager(self, tasks_df = None, available_resources_df = None, period = None):
+        tasks_df = (self.tasks_df if tasks_df is None else tasks_df).copy()
+        available_resources_df = (self.available_resources_df if available_resources_df is None else available_resources_df).copy()
+
+        resource_manager = ProjectResourceManager(available_resources_df, self.used_resources_df.copy(), tasks_df)
+
+        return TaskManager(tasks_df, resource_manager, period_days_available=self.period if period is None else period)
+
+    def _update_task_schedule(self, engine = None, tasks_df = None, available_resources_df = None, period = None, today = TODAY,
+                              **options):
+        """
+        Run update_task_schedule on a copy of the inputs.
+
+        Returns:
+            tuple: The scheduled tasks DataFrame, the used resources DataFrame and the TaskManager.
+        """
+        task_manager = self._task_manager(tasks_df, available_resources_df, period)
+
+        if engine is not None:
+            options["engine"] = engine
+
+        with freeze_time(today):
+            result = task_manager.update_task_schedule(self.dates, **options)
+
+        return result, task_manager.resource_manager.used_resources_manager.used_resources_df, task_manager
@@ -0,0 +1,150 @@
+import unittest
+
+from freezegun import freeze_time
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_task_dependencies import TaskDependencyGraph
+
+class TestTaskDependencyGraph(unittest.TestCase):
+
+    def setUp(self):
+        # 1 <- 2 <- 3, 1 <- 4, 5 restricted by an unknown task
+        self.graph = TaskDependencyGraph(['1', '2', '3', '4', '5'], [None, '1', '2', '1', '99'])
+
+    def test_predecessors_and_successors(self):
+        np.testing.assert_array_equal(self.graph.predecessors, [-1, 0, 1, 0, TaskDependencyGraph.UNKNOWN_PREDECESSOR])
+        np.testing.assert_array_equal(self.graph.successors[0], [1, 3])
+        np.testing.assert_array_equal(self.graph.successors[1], [2])
+        self.assertEqual(self.graph.successors[4].size, 0)
+
+    def test_reset_with_completed_tasks(self):
+        self.graph.reset(np.array([True, False, False, False, False]))
+
+        np.testing.assert_array_equal(self.graph.indegree, [0, 0, 1, 0, 1])
+        self.assertEqual(self.graph.completed_ids, ['1'])
+
+    def test_complete_releases_successors(self):
+        released = self.graph.complete(0)
+
+        self.assertEqual(released, [1, 3])
+        self.assertEqual(self.graph.pop_ready(), [1, 3])
+        self.assertEqual(self.graph.pop_ready(), [])
+
+        # Completing twice does not release again
+        self.assertEqual(self.graph.complete(0), [])
+
+        self.graph.complete(1)
+
+        self.assertEqual(self.graph.pop_ready(), [2])
+        self.assertEqual(self.graph.completed_ids, ['1', '2'])
+        self.assertEqual(self.graph.indegree[4], 1)
+
+    def test_copy(self):
+        self.graph.complete(0)
+
+        graph = self.graph.copy()
+        graph.complete(1)
+
+        self.assertEqual(graph.completed_ids, ['1', '2'])
+        self.assertEqual(self.graph.completed_ids, ['1'])
+        self.assertEqual(self.graph.indegree[2], 1)
+        self.assertEqual(self.graph.pop_ready(), [1, 3])
+
+    def test_completed_successors_not_released(self):
+        self.graph.reset(np.array([False, True, False, False, False]))
+
+        np.testing.assert_array_equal(self.graph.indegree, [0, 0, 0, 1, 1])
+
+        # 2 was completed at load: only 4 is released
+        self.assertEqual(self.graph.complete(0), [3])
+        self.assertEqual(self.graph.indegree[1], 0)
+
+class TestTaskScheduleSamePeriodRelease(unittest.TestCase):
+    """A task restricted by a task of lower priority starts in the period its blocker finishes."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2'],
+            TASK_GOAL: ['Goal1', 'Goal2'],
+            TASK_PRIORITY: [1, 2],
+            TASK_RESOURCES_MAX: [1, ''],
+            TASK_RESTRICTION: ['2', None],
+            TASK_REMAINING: [10, 2],
+            TASK_START_DATE: [None, None],
+            TASK_END_DATE: [None, None],
+            'Team': ['Team A', 'Team A']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A'],
+            'Goal': ['*'],
+            **{date: [2] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, engine):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        return task_manager.update_task_schedule(self.dates, engine=engine)
+
+    def test_released_task_starts_same_period(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX]:
+            with self.subTest(engine=engine):
+                result = self._update_task_schedule(engine)
+
+                task1 = result.loc[result[TASK_ID] == '1'].iloc[0]
+                task2 = result.loc[result[TASK_ID] == '2'].iloc[0]
+
+                self.assertEqual(task2[TASK_END_DATE], '13/05/2024')
+                self.assertEqual(task1[TASK_START_DATE], '13/05/2024')
+                self.assertEqual(task1[TASK_END_DATE], '20/05/2024')
+
+    def test_finished_successor_not_allocated(self):
+        """ A task finished at load is not allocated when its predecessor finishes """
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2'],
+            TASK_GOAL: ['Goal1', 'Goal2'],
+            TASK_PRIORITY: [1, 1],
+            TASK_RESOURCES_MAX: ['', ''],
+            TASK_RESTRICTION: [None, '1'],
+            TASK_REMAINING: [3, 0],
+            TASK_START_DATE: [None, None],
+            TASK_END_DATE: [None, None],
+            'Team': ['Team A', 'Team A']
+        })
+        self.available_resources_df[self.dates] = 1
+
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result = self._update_task_schedule(engine)
+
+                task2 = result.loc[result[TASK_ID] == '2'].iloc[0]
+
+                self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '13/05/2024')
+                self.assertTrue(pd.isna(task2[TASK_START_DATE]))
+                self.assertEqual(task2[TASK_REMAINING], 0)
+
+if __name__ == '__main__':
+    unittest.main()
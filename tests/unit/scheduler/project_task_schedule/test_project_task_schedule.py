@@ -37,7 +37,7 @@ class TestTaskManager(unittest.TestCase):
     @freeze_time("2024-05-10")        
     @patch.object(TaskManager, 'allocate_resources')
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
+    @patch.object(TaskManager, 'filter_ready_tasks')
     def test_clean_used_resources_called(self, mock_filter_tasks, mock_distribute_resources, mock_allocate_resources):
         ''' Check that once update_task_schedule is called, clean_used_resources from ProjectUsedResourceManager is called with today date'''
         dates = ['12-05-2024', '19-05-2024']
@@ -58,23 +58,25 @@ class TestTaskManager(unittest.TestCase):
     @freeze_time("2024-05-10")
     @patch.object(TaskManager, 'allocate_resources')
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
-    def test_filter_tasks_by_restriction_called(self, mock_filter_tasks, mock_distribute_resources, mock_allocate_resources):
+    @patch.object(TaskManager, 'filter_ready_tasks')
+    def test_filter_ready_tasks_called(self, mock_filter_tasks, mock_distribute_resources, mock_allocate_resources):
         dates = ['12-05-2024', '19-05-2024']
                 
         mock_filter_tasks.return_value = self.tasks_df        
         self.task_manager_week_period.update_task_schedule(dates)
 
-        # Remember: TASK ID is changed to string in the TaskManager initialization
-        completed_tasks = self.tasks_df.loc[self.tasks_df[TASK_ID] == "2", TASK_ID].tolist()
+        self.assertEqual(mock_filter_tasks.call_count, 4)
 
-        self.assertEqual(mock_filter_tasks.call_count, 4)        
-        mock_filter_tasks.assert_any_call(unittest.mock.ANY, completed_tasks, '12-05-2024')
-        mock_filter_tasks.assert_any_call(unittest.mock.ANY, completed_tasks, '19-05-2024')
+        # Groups in priority order on each date: task 2 (completed, not ready), then tasks 1 and 3
+        calls = mock_filter_tasks.call_args_list
+
+        self.assertEqual([call[0][0][TASK_ID].tolist() for call in calls], [['2'], ['1', '3']] * 2)
+        self.assertEqual([call[0][1].tolist() for call in calls], [[False], [True, True]] * 2)
+        self.assertEqual([call[0][2] for call in calls], [pd.Timestamp(2024, 5, 12)] * 2 + [pd.Timestamp(2024, 5, 19)] * 2)
 
     @freeze_time("2024-05-10")
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
+    @patch.object(TaskManager, 'filter_ready_tasks')
     def test_distribute_resources_called_week_period(self, mock_filter_tasks, mock_distribute_resources):
         dates = ['12-05-2024', '19-05-2024']
         self.mock_resource_manager.obtain_goal_resources.return_value = 3
@@ -98,7 +100,7 @@ class TestTaskManager(unittest.TestCase):
 
     @freeze_time("2024-05-10")
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
+    @patch.object(TaskManager, 'filter_ready_tasks')
     def test_distribute_resources_called_day_period(self, mock_filter_tasks, mock_distribute_resources):        
 
         dates = ['12-05-2024', '19-05-2024']
@@ -124,7 +126,7 @@ class TestTaskManager(unittest.TestCase):
     @freeze_time("2024-05-10")
     @patch.object(TaskManager, 'allocate_resources')
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
+    @patch.object(TaskManager, 'filter_ready_tasks')
     def test_allocate_resources_called(self, mock_filter_tasks, mock_distribute_resources, mock_allocate_resources):
         dates = ['12-05-2024', '19-05-2024']
         mock_filter_tasks.return_value = self.tasks_df
@@ -158,7 +160,7 @@ class TestTaskManager(unittest.TestCase):
 
 
     @freeze_time("2024-05-10")
-    @patch.object(TaskManager, 'filter_tasks_by_restriction')
+    @patch.object(TaskManager, 'filter_ready_tasks')
     @patch.object(TaskManager, '_distribute_resources_same_priority_and_responsible_tasks')
     @patch.object(TaskManager, 'allocate_resources')
     def test_update_task_schedule_output(self, mock_allocate_resources, mock_distribute_resources, mock_filter_tasks):
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskScheduleCheckpoint(TaskScheduleTestCase):
+    """Test the checkpoints of the matrix engines and the resume of interrupted runs."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024', '24/06/2024'],
+            {TASK_PRIORITY: [1, 2, 1, 1], TASK_RESOURCES_MAX: [1, '', '', 0.5], TASK_RESTRICTION: [None, '1', '27/05/2024', None],
+             TASK_REMAINING: [8, 14, 9, 12], 'Team': ['Team A', 'Team A', 'Team A', 'Team B']},
+            {'Team A': 1.5, 'Team B': 1},
+            [('Goal1', 'Team A', 0)])
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, "checkpoint.npz")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _interrupted_run(self, calls, **options):
+        process_date = MatrixScheduleEngine.process_date
+        count = [0]
+
+        def failing_process_date(engine, date_index):
+            count[0] += 1
+            if count[0] > calls:
+                raise RuntimeError("Interrupted")
+            process_date(engine, date_index)
+
+        with patch.object(MatrixScheduleEngine, 'process_date', failing_process_date):
+            with self.assertRaises(RuntimeError):
+                self._update_task_schedule(checkpoint_path=self.checkpoint_path, **options)
+
+    def test_resume_same_result(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            for effort_scale in [None, 1000]:
+                with self.subTest(engine=engine, effort_scale=effort_scale):
+                    expected = self._update_task_schedule(engine=engine, effort_scale=effort_scale)
+
+                    self._interrupted_run(3, engine=engine, effort_scale=effort_scale, checkpoint_interval=2)
+                    self.assertTrue(os.path.exists(self.checkpoint_path))
+
+                    result = self._update_task_schedule(
+                        engine=engine, effort_scale=effort_scale, checkpoint_path=self.checkpoint_path, checkpoint_interval=2)
+
+                    pd.testing.assert_frame_equal(result[0], expected[0])
+                    pd.testing.assert_frame_equal(result[1], expected[1])
+                    self.assertEqual(result[2].schedule_summary, expected[2].schedule_summary)
+
+                    # The checkpoint of a finished run is removed
+                    self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_resume_from_last_checkpoint(self):
+        self._interrupted_run(3, engine=ENGINE_MATRIX, checkpoint_interval=2)
+
+        resumed_dates = []
+        process_date = MatrixScheduleEngine.process_date
+
+        def tracking_process_date(engine, date_index):
+            resumed_dates.append(date_index)
+            process_date(engine, date_index)
+
+        with patch.object(MatrixScheduleEngine, 'process_date', tracking_process_date):
+            self._update_task_schedule(engine=ENGINE_MATRIX, checkpoint_path=self.checkpoint_path, checkpoint_interval=2)
+
+        # Dates 0 and 1 are in the checkpoint
+        self.assertEqual(resumed_dates[0], 2)
+
+    def test_checkpoint_of_other_inputs_ignored(self):
+        self._interrupted_run(3, engine=ENGINE_MATRIX, checkpoint_interval=1)
+
+        self.tasks_df.loc[0, TASK_REMAINING] = 4
+
+        expected = self._update_task_schedule(engine=ENGINE_MATRIX)
+        result = self._update_task_schedule(engine=ENGINE_MATRIX, checkpoint_path=self.checkpoint_path)
+
+        pd.testing.assert_frame_equal(result[0], expected[0])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_PANDAS, checkpoint_path=self.checkpoint_path)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_MATRIX, checkpoint_path=self.checkpoint_path, workers=2)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_MATRIX, checkpoint_path=self.checkpoint_path, checkpoint_interval=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+
+class TestTaskScheduleEventEngine(unittest.TestCase):
+    """Test that the event-driven time advance skips idle dates and produces the same schedule."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024', '24/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4'],
+            TASK_PRIORITY: [1, 2, 1, 2],
+            TASK_RESOURCES_MAX: [1, '', 2, ''],
+            TASK_RESTRICTION: ['10/06/2024', '1', None, '3'],
+            TASK_REMAINING: [5, 8, 6, 4],
+            TASK_START_DATE: [None] * 4,
+            TASK_END_DATE: [None] * 4,
+            'Team': ['Team A', 'Team A', 'Team B', 'Team B']
+        })
+
+        # Team B has no resources until 03/06/2024
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B'],
+            'Goal': ['*', '*'],
+            **{date: values for date, values in zip(self.dates, [[2, 0], [2, 0], [2, 0], [2, 2], [2, 2], [0, 2], [2, 2]])}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, engine):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, engine=engine)
+
+        return result, resource_manager.used_resources_manager.used_resources_df
+
+    def test_event_engine_same_schedule_as_pandas(self):
+        pandas_tasks, pandas_used = self._update_task_schedule(ENGINE_PANDAS)
+        event_tasks, event_used = self._update_task_schedule(ENGINE_EVENT)
+
+        pd.testing.assert_frame_equal(event_tasks, pandas_tasks, check_dtype=False)
+        pd.testing.assert_frame_equal(event_used, pandas_used, check_dtype=False)
+
+    def test_event_engine_skips_idle_dates(self):
+        with patch.object(MatrixScheduleEngine, 'process_date', autospec=True, side_effect=MatrixScheduleEngine.process_date) as mock_process_date:
+            result, _ = self._update_task_schedule(ENGINE_EVENT)
+
+        processed_dates = [self.dates[call[0][1]] for call in mock_process_date.call_args_list]
+
+        # Nothing can be allocated before 03/06/2024 (Team B without resources, Task 1 restricted to 10/06/2024)
+        self.assertEqual(processed_dates, ['03/06/2024', '10/06/2024', '24/06/2024'])
+
+        task4 = result.loc[result[TASK_ID] == '4'].iloc[0]
+        self.assertEqual(task4[TASK_END_DATE], '03/06/2024')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+from freezegun import freeze_time
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_matrix_engine import distribute_effort_fixed_point
+from scheduler.project_fixed_point import to_fixed_point, from_fixed_point, FIXED_POINT_INFINITY
+
+class TestTaskScheduleFixedPoint(unittest.TestCase):
+    """Test the fixed-point effort option of the matrix engines."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3'],
+            TASK_PRIORITY: [1, 2, 2],
+            TASK_RESOURCES_MAX: [0.02, 1, ''],
+            TASK_RESTRICTION: [None, None, None],
+            TASK_REMAINING: [0.4, 7.3, 3.1],
+            TASK_START_DATE: [None] * 3,
+            TASK_END_DATE: [None] * 3,
+            'Team': ['Team A', 'Team A', 'Team A']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A'],
+            'Goal': ['*'],
+            **{date: [0.7] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, engine, effort_scale = None):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, engine=engine, effort_scale=effort_scale)
+
+        return result, resource_manager.used_resources_manager.used_resources_df
+
+    def test_exact_completion(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, _ = self._update_task_schedule(engine, effort_scale=1000)
+
+                task1 = result.loc[result[TASK_ID] == '1'].iloc[0]
+
+                # 0.4 days at 0.1 days per period: exactly 4 periods
+                self.assertEqual(task1[TASK_START_DATE], '13/05/2024')
+                self.assertEqual(task1[TASK_END_DATE], '03/06/2024')
+                self.assertEqual(task1[TASK_REMAINING], 0)
+
+    def test_close_to_float_schedule(self):
+        float_tasks, float_used = self._update_task_schedule(ENGINE_PANDAS)
+        fixed_tasks, fixed_used = self._update_task_schedule(ENGINE_MATRIX, effort_scale=1000)
+
+        for task_id in ['2', '3']:
+            float_task = float_tasks.loc[float_tasks[TASK_ID] == task_id].iloc[0]
+            fixed_task = fixed_tasks.loc[fixed_tasks[TASK_ID] == task_id].iloc[0]
+
+            self.assertEqual(fixed_task[TASK_START_DATE], float_task[TASK_START_DATE])
+            self.assertEqual(fixed_task[TASK_END_DATE], float_task[TASK_END_DATE])
+
+        np.testing.assert_allclose(fixed_used[self.dates].to_numpy(dtype=float), float_used[self.dates].to_numpy(dtype=float), atol=1e-3)
+
+    def test_invalid_effort_scale(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_MATRIX, effort_scale=0)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_PANDAS, effort_scale=1000)
+
+    def test_fixed_point_conversion(self):
+        units = to_fixed_point([0.4, 1.0005, np.inf, np.nan], 1000)
+
+        np.testing.assert_array_equal(units, [400, 1000, FIXED_POINT_INFINITY, 0])
+        np.testing.assert_array_equal(from_fixed_point(units, 1000), [0.4, 1.0, np.inf, 0])
+
+    def test_distribute_effort_fixed_point(self):
+        remaining = np.array([10, 30, 1, 1, 1])
+        capacities = np.array([5, 30, 10, 10, 10])
+
+        allocations = distribute_effort_fixed_point(remaining, capacities, [30, 2], [0, 2, 5])
+
+        # Capped task redistribution, and units left given to the largest fractional parts
+        np.testing.assert_array_equal(allocations, [5, 25, 1, 1, 0])
+
+    def test_distribute_effort_fixed_point_finished_tasks(self):
+        # A finished task gets no units left, even when the other tasks are capped
+        allocations = distribute_effort_fixed_point([1, 0], [10, 10], 3)
+
+        np.testing.assert_array_equal(allocations, [1, 0])
+
+        rng = np.random.default_rng(11)
+
+        for _ in range(200):
+            remaining = rng.integers(0, 5, 6) * rng.integers(0, 2, 6)
+            capacities = rng.integers(0, 10, 6)
+
+            allocations = distribute_effort_fixed_point(remaining, capacities, rng.integers(0, 20, 2), [0, 3, 6])
+
+            self.assertTrue(np.all(allocations >= 0))
+            self.assertTrue(np.all(allocations <= np.minimum(remaining, capacities)))
+
+    def test_remaining_never_negative(self):
+        self.tasks_df[TASK_REMAINING] = [0.4, 0, 0]
+        self.tasks_df[TASK_RESOURCES_MAX] = [0.02, '', '']
+
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, _ = self._update_task_schedule(engine, effort_scale=1000)
+
+                self.assertTrue((result[TASK_REMAINING] >= 0).all())
+                self.assertTrue(result.loc[result[TASK_ID] != '1', TASK_START_DATE].isna().all())
+
+if __name__ == '__main__':
+    unittest.main()
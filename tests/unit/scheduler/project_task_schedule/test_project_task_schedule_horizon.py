@@ -0,0 +1,68 @@
+import unittest
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskScheduleHorizon(TaskScheduleTestCase):
+    """Test the planning horizon options and the early termination of update_task_schedule."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['06/05/2024', '13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024'],
+            {TASK_PRIORITY: [1, 2], TASK_RESOURCES_MAX: [1, 1], TASK_REMAINING: [5, 10], 'Team': ['Team A', 'Team A']},
+            {'Team A': 2},
+            [('Goal1', 'Team A', 0)])
+
+    def test_early_termination(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, _, task_manager = self._update_task_schedule(engine)
+                summary = task_manager.schedule_summary
+
+                # Task 2 finishes on 20/05/2024: later dates are not processed
+                self.assertEqual(result.loc[result[TASK_ID] == '2', TASK_END_DATE].iloc[0], '20/05/2024')
+                self.assertEqual(summary["dates"], 6)
+                self.assertEqual(summary["past_dates"], 1)
+                self.assertEqual(summary["horizon_dates"], 5)
+                self.assertEqual(summary["processed_dates"], 2)
+                self.assertEqual(summary["first_date"], '13/05/2024')
+                self.assertEqual(summary["last_date"], '20/05/2024')
+                self.assertTrue(summary["completed"])
+
+    def test_horizon_start_and_end(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX]:
+            with self.subTest(engine=engine):
+                result, _, task_manager = self._update_task_schedule(engine, horizon_start='20/05/2024', horizon_end='26/05/2024')
+                summary = task_manager.schedule_summary
+
+                self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_START_DATE].iloc[0], '20/05/2024')
+                self.assertEqual(result.loc[result[TASK_ID] == '2', TASK_REMAINING].iloc[0], 5)
+                self.assertEqual(summary["horizon_dates"], 1)
+                self.assertEqual(summary["processed_dates"], 1)
+                self.assertFalse(summary["completed"])
+
+    def test_max_periods(self):
+        result, _, task_manager = self._update_task_schedule(ENGINE_PANDAS, max_periods=1)
+        summary = task_manager.schedule_summary
+
+        self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_REMAINING].iloc[0], 0)
+        self.assertEqual(result.loc[result[TASK_ID] == '2', TASK_REMAINING].iloc[0], 5)
+        self.assertEqual(summary["processed_dates"], 1)
+        self.assertEqual(summary["last_date"], '13/05/2024')
+
+    def test_invalid_horizon(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_PANDAS, horizon_start='not a date')
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_PANDAS, max_periods=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_schedule_state import ScheduleState
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskScheduleIncremental(TaskScheduleTestCase):
+    """Test the incremental re-scheduling from the state of a previous run."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024'],
+            {TASK_PRIORITY: [1, 2, 1, 2, 1], TASK_RESOURCES_MAX: [1, '', '', 1, ''], TASK_RESTRICTION: [None, '1', None, None, None],
+             TASK_REMAINING: [8, 10, 12, 6, 4], 'Team': ['Team A', 'Team A', 'Team B', 'Team B', 'Team C']},
+            {'Team A': 2, 'Team B': 1.5, 'Team C': 1},
+            [('Goal1', 'Team A', 0), ('Goal3', 'Team B', 0.5)])
+
+    def _assert_same_schedule(self, incremental, full):
+        pd.testing.assert_frame_equal(incremental[0], full[0])
+        pd.testing.assert_frame_equal(incremental[1], full[1])
+
+        summary = {key: value for key, value in incremental[2].schedule_summary.items() if key != "replanned_tasks"}
+        self.assertEqual(summary, full[2].schedule_summary)
+
+    def test_first_run(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                incremental = self._update_task_schedule(engine=engine, previous_state=ScheduleState())
+
+                self._assert_same_schedule(incremental, self._update_task_schedule(engine=engine))
+                self.assertEqual(sorted(incremental[2].schedule_summary["replanned_tasks"]), ['1', '2', '3', '4', '5'])
+
+    def test_unchanged_inputs(self):
+        _, _, task_manager = self._update_task_schedule(engine=ENGINE_MATRIX, previous_state=ScheduleState())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.json")
+            task_manager.schedule_state.save(path)
+
+            incremental = self._update_task_schedule(engine=ENGINE_MATRIX, previous_state=ScheduleState.load(path))
+
+        self._assert_same_schedule(incremental, self._update_task_schedule(engine=ENGINE_MATRIX))
+        self.assertEqual(incremental[2].schedule_summary["replanned_tasks"], [])
+
+    def test_changed_inputs(self):
+        _, _, task_manager = self._update_task_schedule(engine=ENGINE_MATRIX, previous_state=ScheduleState())
+
+        available_resources_df = self.available_resources_df.copy()
+        available_resources_df.loc[1, self.dates[1]] = 3
+
+        tasks_df = self.tasks_df.copy()
+        tasks_df.loc[4, TASK_REMAINING] = 2
+
+        incremental = self._update_task_schedule(
+            ENGINE_MATRIX, tasks_df, available_resources_df, previous_state=task_manager.schedule_state)
+        full = self._update_task_schedule(ENGINE_MATRIX, tasks_df, available_resources_df)
+
+        # Team A tasks reuse their previous allocations
+        self._assert_same_schedule(incremental, full)
+        self.assertEqual(sorted(incremental[2].schedule_summary["replanned_tasks"]), ['3', '4', '5'])
+
+    def test_start_dates_of_previous_run(self):
+        result, _, task_manager = self._update_task_schedule(engine=ENGINE_MATRIX, previous_state=ScheduleState())
+
+        # Rerun on the previous output (as the Excel update, only Start and End Dates are written back)
+        tasks_df = self.tasks_df.copy()
+        tasks_df[[TASK_START_DATE, TASK_END_DATE]] = result.sort_index()[[TASK_START_DATE, TASK_END_DATE]]
+
+        incremental = self._update_task_schedule(ENGINE_MATRIX, tasks_df, previous_state=task_manager.schedule_state)
+
+        self._assert_same_schedule(incremental, self._update_task_schedule(ENGINE_MATRIX, tasks_df))
+        self.assertEqual(incremental[2].schedule_summary["replanned_tasks"], [])
+
+    def test_later_run(self):
+        # Team D has no resources on the first date, so its task does not depend on it
+        tasks_df = pd.concat([self.tasks_df, pd.DataFrame({
+            TASK_ID: ['6'], TASK_GOAL: ['Goal6'], TASK_PRIORITY: [1], TASK_RESOURCES_MAX: [''], TASK_RESTRICTION: [None], 
+            TASK_REMAINING: [3], TASK_START_DATE: [None], TASK_END_DATE: [None], 'Team': ['Team D']
+        })], ignore_index=True)
+
+        available_resources_df = pd.concat([self.available_resources_df, pd.DataFrame({
+            'Team': ['Team D'], 'Goal': ['*'], **{date: [0 if date == self.dates[0] else 1] for date in self.dates}
+        })], ignore_index=True)
+
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                _, _, task_manager = self._update_task_schedule(
+                    engine, tasks_df, available_resources_df, previous_state=ScheduleState())
+
+                incremental = self._update_task_schedule(
+                    engine, tasks_df, available_resources_df, today="2024-05-20", previous_state=task_manager.schedule_state)
+                full = self._update_task_schedule(engine, tasks_df, available_resources_df, today="2024-05-20")
+
+                self._assert_same_schedule(incremental, full)
+                self.assertEqual(sorted(incremental[2].schedule_summary["replanned_tasks"]), ['1', '2', '3', '4', '5'])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_PANDAS, previous_state=ScheduleState())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "state.json")
+
+            with open(path, 'w') as file:
+                file.write("[]")
+
+            with self.assertRaises(ValueError):
+                ScheduleState.load(path)
+
+if __name__ == '__main__':
+    unittest.main()
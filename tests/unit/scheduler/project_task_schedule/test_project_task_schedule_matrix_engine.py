@@ -0,0 +1,196 @@
+import unittest
+
+from freezegun import freeze_time
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, TASK_BLOCKED_DAYS, ENGINE_PANDAS, ENGINE_MATRIX
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_matrix_engine import distribute_effort
+
+class TestTaskScheduleMatrixEngine(unittest.TestCase):
+    """Test that the matrix engine produces the same schedule as the pandas engine."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4', '5', '6', '7', '8'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4', 'Goal5', 'Goal6', 'Goal7', 'Goal8'],
+            TASK_PRIORITY: [1, 1, 2, 2, 3, 1, 2, 4],
+            TASK_RESOURCES_MAX: [2, 1, '', 3, 2, 1, 1, ''],
+            TASK_RESTRICTION: [None, None, '1', '27/05/2024', None, None, '6', '99'],
+            TASK_REMAINING: [12, 8, 10, 6, 15, 4, 5, 3],
+            TASK_START_DATE: [None] * 8,
+            TASK_END_DATE: [None] * 8,
+            TASK_BLOCKED_DAYS: [0, 0, 0, 2, 0, 0, 0, 0],
+            'Team': ['Team A', 'Team A', 'Team A', 'Team B', 'Team B', 'Team B', 'Team A', 'Team A'],
+            'Project': ['Project X', 'Project X', '*', 'Project Y', 'Project Y', 'Project Z', 'Project X', 'Project X']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team A', 'Team B', 'Team B'],
+            'Project': ['*', 'Project X', '*', 'Project Y'],
+            'Goal': ['*', '*', '*', '*'],
+            **{date: values for date, values in zip(self.dates, [[3, 2, 2, 1], [2, 2, 3, 2], [0, 0, 3, 1], [4, 1, 2, 2], [3, 3, 1, 1], [2, 2, 2, 2]])}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            'Project': ['Project X'],
+            **{date: [1] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, engine):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, engine=engine)
+
+        return result, resource_manager.used_resources_manager.used_resources_df
+
+    def test_matrix_engine_same_schedule_as_pandas(self):
+        pandas_tasks, pandas_used = self._update_task_schedule(ENGINE_PANDAS)
+        matrix_tasks, matrix_used = self._update_task_schedule(ENGINE_MATRIX)
+
+        pd.testing.assert_frame_equal(matrix_tasks, pandas_tasks, check_dtype=False)
+        pd.testing.assert_frame_equal(matrix_used, pandas_used, check_dtype=False)
+
+    def test_matrix_engine_schedules_tasks(self):
+        matrix_tasks, _ = self._update_task_schedule(ENGINE_MATRIX)
+
+        task1 = matrix_tasks.loc[matrix_tasks[TASK_ID] == '1'].iloc[0]
+        task8 = matrix_tasks.loc[matrix_tasks[TASK_ID] == '8'].iloc[0]
+
+        self.assertEqual(task1[TASK_START_DATE], '13/05/2024')
+        self.assertEqual(task1[TASK_REMAINING], 0)
+        self.assertIsNotNone(task1[TASK_END_DATE])
+
+        # Task 8 is restricted by an unknown task, so it is never planned
+        self.assertIsNone(task8[TASK_START_DATE])
+        self.assertEqual(task8[TASK_REMAINING], 3)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule("unknown")
+
+    @freeze_time("2024-05-13")
+    def test_active_groups(self):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+        task_manager.dependency_graph = TaskManager.build_dependency_graph(task_manager.tasks_df)
+
+        date_indexes = list(range(len(self.dates)))
+        engine = task_manager._load_matrix_engine(self.dates, date_indexes)
+        task_ids = task_manager.tasks_df[TASK_ID].to_numpy()
+
+        def active_task_ids(date_index):
+            groups = engine.active_groups(engine.date_values[date_index])
+            return set(task_ids[np.concatenate([engine.group_tasks[group] for group in groups])])
+
+        # Tasks 3, 7 and 8 wait for other tasks, task 4 is dormant until 27/05/2024
+        self.assertEqual(active_task_ids(0), {'1', '2', '5', '6'})
+        self.assertEqual(active_task_ids(2), {'1', '2', '4', '5', '6'})
+
+        engine.run(date_indexes)
+
+        # Finished groups are retired
+        for group in engine.active_groups(engine.date_values[-1]):
+            self.assertFalse(engine.dependencies.completed[engine.group_tasks[group]].all())
+
+    def test_distribute_effort_redistributes_capped_tasks(self):
+        allocations = distribute_effort(np.array([10.0, 30.0]), np.array([5.0, 30.0]), 30)
+
+        np.testing.assert_array_equal(allocations, [5, 25])
+
+    def test_distribute_effort_several_groups(self):
+        remaining = np.array([10.0, 30.0, 2.0, 6.0, 5.0, 30.0])
+        capacities = np.array([5.0, 30.0, 5.0, 6.0, 40.0, 40.0])
+        offsets = np.array([0, 2, 4, 4, 6])
+
+        allocations = distribute_effort(remaining, capacities, [30, 2, 10, 40], offsets)
+
+        np.testing.assert_allclose(allocations, [5, 25, 0.5, 1.5, 5, 30])
+
+    def test_distribute_effort_no_effort(self):
+        allocations = distribute_effort(np.array([10.0, 30.0]), np.array([5.0, 30.0]), 0)
+
+        np.testing.assert_array_equal(allocations, [0, 0])
+
+class TestTaskScheduleMatrixEngineIsolatedGroups(unittest.TestCase):
+    """Test the closed-form allocation of isolated single-task groups."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4'],
+            TASK_PRIORITY: [1, 1, 2, 1],
+            TASK_RESOURCES_MAX: [1.5, 1, '', 2],
+            TASK_RESTRICTION: [None, None, None, None],
+            TASK_REMAINING: [13, 8, 10, 7],
+            TASK_START_DATE: [None] * 4,
+            TASK_END_DATE: [None] * 4,
+            TASK_BLOCKED_DAYS: [0, 0, 0, 2],
+            'Team': ['Team C', 'Team A', 'Team A', 'Team D']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team C', 'Team D'],
+            'Goal': ['*', '*', '*'],
+            **{date: values for date, values in zip(self.dates, [[2, 1, 0], [2, 2, 1], [1, 0, 2], [2, 3, 1], [2, 2, 1]])}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team C'],
+            **{date: [0.5] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, engine):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, engine=engine)
+
+        return result, resource_manager.used_resources_manager.used_resources_df
+
+    @freeze_time("2024-05-13")
+    def test_isolated_groups_detected(self):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+        task_manager.dependency_graph = TaskManager.build_dependency_graph(task_manager.tasks_df)
+
+        engine = task_manager._load_matrix_engine(self.dates, list(range(len(self.dates))))
+        task_ids = task_manager.tasks_df[TASK_ID].to_numpy()
+
+        isolated_task_ids = {task_ids[engine.group_tasks[group][0]] for group in engine.isolated_groups}
+
+        self.assertEqual(isolated_task_ids, {'1', '4'})
+
+    def test_isolated_groups_same_schedule_as_pandas(self):
+        pandas_tasks, pandas_used = self._update_task_schedule(ENGINE_PANDAS)
+        matrix_tasks, matrix_used = self._update_task_schedule(ENGINE_MATRIX)
+
+        pd.testing.assert_frame_equal(matrix_tasks, pandas_tasks, check_dtype=False)
+        pd.testing.assert_frame_equal(matrix_used, pandas_used, check_dtype=False)
+
+if __name__ == '__main__':
+    unittest.main()
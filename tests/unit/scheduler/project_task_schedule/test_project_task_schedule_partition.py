@@ -0,0 +1,145 @@
+import unittest
+
+from freezegun import freeze_time
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_matrix_engine import MatrixScheduleEngine
+from scheduler.project_partition import connected_components
+
+class TestTaskSchedulePartition(unittest.TestCase):
+    """Test the partition-parallel scheduling of tasks that share no resources nor restrictions."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4', '5'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4', 'Goal5'],
+            TASK_PRIORITY: [1, 2, 1, 2, 1],
+            TASK_RESOURCES_MAX: [1, '', '', 1, ''],
+            TASK_RESTRICTION: [None, '1', None, None, None],
+            TASK_REMAINING: [8, 10, 12, 6, 4],
+            TASK_START_DATE: [None] * 5,
+            TASK_END_DATE: [None] * 5,
+            'Team': ['Team A', 'Team A', 'Team B', 'Team B', 'Team C']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B', 'Team C'],
+            'Goal': ['*', '*', '*'],
+            **{date: [2, 1.5, 1] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1', 'Goal3'],
+            'Team': ['Team A', 'Team B'],
+            **{date: [0, 0.5] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, tasks_df = None, **options):
+        tasks_df = self.tasks_df.copy() if tasks_df is None else tasks_df
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, **options)
+
+        return result, resource_manager.used_resources_manager.used_resources_df, task_manager
+
+    def test_connected_components(self):
+        np.testing.assert_array_equal(connected_components(6, [(4, 1), (2, 5), (5, 4)]), [0, 1, 1, 2, 1, 1])
+        np.testing.assert_array_equal(connected_components(0, []), [])
+
+    def test_resource_components(self):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+
+        available_components, used_components = resource_manager.resource_components()
+
+        used_df = resource_manager.used_resources_manager.used_resources_df
+
+        # One component per team, with the accumulated used resources row of the team
+        self.assertEqual(len(np.unique(available_components)), 3)
+
+        for row, team in enumerate(self.available_resources_df['Team']):
+            total_row = np.flatnonzero(((used_df['Team'] == team) & (used_df['Goal'] == '*')).to_numpy())
+            self.assertEqual(used_components[total_row].tolist(), [available_components[row]])
+
+        # Goal rows are only joined to their team through the tasks
+        goal_rows = np.flatnonzero((used_df['Goal'] != '*').to_numpy())
+        self.assertFalse(np.isin(used_components[goal_rows], available_components).any())
+
+    def test_partitions(self):
+        _, _, task_manager = self._update_task_schedule(engine=ENGINE_MATRIX)
+
+        inputs = task_manager.matrix_engine_inputs(self.dates, list(range(len(self.dates))))
+        partitions = task_manager.matrix_partitions(inputs)
+
+        tasks = [task_manager.tasks_df[TASK_ID].iloc[partition["tasks"]].tolist() for partition in partitions]
+
+        self.assertEqual(sorted(sorted(partition_tasks) for partition_tasks in tasks), [['1', '2'], ['3', '4'], ['5']])
+
+    def test_restriction_joins_partitions(self):
+        tasks_df = self.tasks_df.copy()
+        tasks_df.loc[4, TASK_RESTRICTION] = '3'
+
+        _, _, task_manager = self._update_task_schedule(tasks_df, engine=ENGINE_MATRIX)
+
+        inputs = task_manager.matrix_engine_inputs(self.dates, list(range(len(self.dates))))
+
+        self.assertEqual(len(task_manager.matrix_partitions(inputs)), 2)
+
+    def test_inputs_shared_by_engines(self):
+        _, _, task_manager = self._update_task_schedule(engine=ENGINE_MATRIX, max_periods=2)
+
+        inputs = task_manager.matrix_engine_inputs(self.dates, list(range(len(self.dates))))
+        completed = task_manager.dependency_graph.completed.copy()
+
+        first_engine = MatrixScheduleEngine(**inputs)
+        first_engine.run(range(len(self.dates)))
+
+        second_engine = MatrixScheduleEngine(**inputs)
+        second_engine.run(range(len(self.dates)))
+
+        # Each engine completes the tasks in its own copy of the dependency graph
+        np.testing.assert_array_equal(task_manager.dependency_graph.completed, completed)
+        self.assertFalse(completed.all())
+        self.assertTrue(first_engine.dependencies.completed.all())
+        np.testing.assert_array_equal(second_engine.end_indexes, first_engine.end_indexes)
+        np.testing.assert_array_equal(second_engine.used, first_engine.used)
+
+    def test_same_schedule_as_single_engine(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            for effort_scale in [None, 1000]:
+                expected, expected_used, expected_manager = self._update_task_schedule(engine=engine, effort_scale=effort_scale)
+
+                for workers in [1, 2]:
+                    with self.subTest(engine=engine, effort_scale=effort_scale, workers=workers):
+                        result, used, task_manager = self._update_task_schedule(
+                            engine=engine, effort_scale=effort_scale, workers=workers)
+
+                        pd.testing.assert_frame_equal(result, expected)
+                        pd.testing.assert_frame_equal(used, expected_used)
+                        self.assertEqual(task_manager.schedule_summary, expected_manager.schedule_summary)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_PANDAS, workers=2)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_MATRIX, workers=0)
+
+if __name__ == '__main__':
+    unittest.main()
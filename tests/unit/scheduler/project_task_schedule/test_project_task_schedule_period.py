@@ -0,0 +1,121 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST, CONF_HOLIDAYS
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_REMAINING, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT,
+    CONF_PERIOD_AUTO
+)
+from scheduler.project_task_scheduler import TaskManager
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskSchedulePeriodAuto(TaskScheduleTestCase):
+    """Test the 'auto' period: working days of each date calculated from the dates spacing and the holidays."""
+
+    period = CONF_PERIOD_AUTO
+
+    def setUp(self):
+        # 1 working day, then 4 (Tuesday to Friday), then a week
+        self.set_inputs(
+            ['13/05/2024', '14/05/2024', '20/05/2024'],
+            {TASK_PRIORITY: [1], TASK_RESOURCES_MAX: [1], TASK_REMAINING: [6], 'Team': ['Team A']},
+            {'Team A': 1},
+            [('Goal1', 'Team A', 0)])
+
+        AppConfig()[CONF_HOLIDAYS] = []
+
+    def tearDown(self):
+        del AppConfig()[CONF_HOLIDAYS]
+
+    def test_calculate_working_days(self):
+        dates = ['13/05/2024', '20/05/2024', '22/05/2024', '27/05/2024']
+
+        working_days = TaskManager.calculate_working_days(dates, ['21/05/2024'])
+
+        # The last date takes the spacing of the previous one (5 days)
+        np.testing.assert_array_equal(working_days, [5, 1, 3, 5])
+
+    def test_auto_period_schedule(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, used, _ = self._update_task_schedule(engine)
+
+                task1 = result.loc[result[TASK_ID] == '1'].iloc[0]
+
+                self.assertEqual(task1[TASK_END_DATE], '20/05/2024')
+                np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[0], [1, 1, 0.2])
+
+    def test_auto_period_fixed_point(self):
+        result, used, _ = self._update_task_schedule(ENGINE_MATRIX, effort_scale=1000)
+
+        self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '20/05/2024')
+        np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[0], [1, 1, 0.2])
+
+    def test_fixed_period_schedule(self):
+        result, _, _ = self._update_task_schedule(ENGINE_PANDAS, period=5)
+
+        self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '14/05/2024')
+
+    def test_holidays(self):
+        AppConfig()[CONF_HOLIDAYS] = ['16/05/2024', '17/05/2024']
+
+        result, used, _ = self._update_task_schedule(ENGINE_MATRIX)
+
+        # 1 + 2 days of effort before 20/05/2024: 3 days left
+        self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '20/05/2024')
+        np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[0], [1, 1, 0.6])
+
+    def test_holidays_from_json(self):
+        dates = ['07/01/2030', '14/01/2030', '21/01/2030']
+
+        with tempfile.TemporaryDirectory() as directory:
+            holidays_path = os.path.join(directory, 'holidays.json')
+
+            with open(holidays_path, 'w', encoding='utf-8') as holidays_file:
+                holidays_file.write('["2030-01-08"]')
+
+            # The -v/--holidays option is kept as given: a list in JSON format or the path to a JSON file
+            for holidays in ['["2030-01-08"]', holidays_path]:
+                with self.subTest(holidays=holidays):
+                    AppConfig()[CONF_HOLIDAYS] = holidays
+                    task_manager = TaskManager(self.tasks_df, MagicMock(), period_days_available=CONF_PERIOD_AUTO)
+
+                    np.testing.assert_array_equal(task_manager.period_days(dates), [4, 5, 5])
+                    self.assertEqual(AppConfig()[CONF_HOLIDAYS], [datetime.date(2030, 1, 8)])
+
+    def test_invalid_holidays(self):
+        task_manager = TaskManager(self.tasks_df, MagicMock(), period_days_available=CONF_PERIOD_AUTO)
+
+        for holidays in ['["2030-01-08", "holiday"]', '2030-01-08', '["2030-02-30"]']:
+            with self.subTest(holidays=holidays):
+                AppConfig()[CONF_HOLIDAYS] = holidays
+
+                with self.assertRaises(ValueError):
+                    task_manager.period_days(['07/01/2030', '14/01/2030'])
+
+    def test_used_resources_updated_with_period_days(self):
+        resource_manager = MagicMock()
+        task_manager = TaskManager(self.tasks_df, resource_manager, period_days_available=1)
+
+        task = self.tasks_df.iloc[0]
+        task_manager.allocate_resources(task, 2, '13/05/2024')
+
+        resource_manager.update_goal_resources.assert_called_once_with('13/05/2024', 2, **task)
+
+    def test_invalid_period(self):
+        with self.assertRaises(ValueError):
+            TaskManager(self.tasks_df, MagicMock(), period_days_available='weekly')
+
+        with self.assertRaises(ValueError):
+            TaskManager(self.tasks_df, MagicMock(), period_days_available=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST, CONF_HOLIDAYS
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT, RESOLUTION_MONTH, RESOLUTION_QUARTER,
+    CONF_PERIOD_AUTO
+)
+from scheduler.project_task_scheduler import TaskManager
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskScheduleResolution(TaskScheduleTestCase):
+    """Test the multi-resolution periods of the matrix engines: weekly dates up to a cutoff, monthly periods after it."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024', '24/06/2024',
+             '01/07/2024', '08/07/2024'],
+            {TASK_PRIORITY: [1, 2], TASK_RESOURCES_MAX: [1, ''], TASK_RESTRICTION: [None, '1'], TASK_REMAINING: [30, 8],
+             'Team': ['Team A', 'Team A']},
+            {'Team A': 1},
+            [('Goal1', 'Team A', 0), ('Goal2', 'Team A', 0)])
+
+    def test_monthly_periods_after_cutoff(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, used, task_manager = self._update_task_schedule(engine, resolution_cutoff='27/05/2024')
+                summary = task_manager.schedule_summary
+
+                task1 = result.loc[result[TASK_ID] == '1'].iloc[0]
+                task2 = result.loc[result[TASK_ID] == '2'].iloc[0]
+
+                # Task 1 finishes in the June period (last date of the period), task 2 starts in it (first date)
+                self.assertEqual(task1[TASK_START_DATE], '13/05/2024')
+                self.assertEqual(task1[TASK_END_DATE], '24/06/2024')
+                self.assertEqual(task2[TASK_START_DATE], '03/06/2024')
+                self.assertEqual(task2[TASK_END_DATE], '08/07/2024')
+
+                # Resources used in merged periods are spread over their dates
+                np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[:2], [
+                    [1, 1, 1, 0.75, 0.75, 0.75, 0.75, 0, 0],
+                    [0, 0, 0, 0.25, 0.25, 0.25, 0.25, 0.3, 0.3]])
+
+                self.assertEqual(summary["processed_dates"], 5)
+                self.assertEqual(summary["last_date"], '01/07/2024')
+
+    def test_no_usage_in_weeks_without_resources(self):
+        # Team A has no resources the week of 10/06/2024, Team B (without tasks) has
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B'],
+            'Goal': ['*', '*'],
+            **{date: [0 if date == '10/06/2024' else 1, 1] for date in self.dates}
+        })
+
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, used, _ = self._update_task_schedule(engine, resolution_cutoff='27/05/2024')
+
+                # Task 1 uses the 3 x 5 days of effort of Team A in June
+                self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '24/06/2024')
+
+                np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[:2], [
+                    [1, 1, 1, 1, 0, 1, 1, 0, 0],
+                    [0, 0, 0, 0, 0, 0, 0, 0.8, 0.8]])
+
+    def test_merged_period_effort_by_date_days(self):
+        # No working days the week of 10/06/2024, when Team A has 2 resources: June has 3 x 5 days of effort
+        self.available_resources_df[['10/06/2024']] = 2
+        AppConfig()[CONF_HOLIDAYS] = ['10/06/2024', '11/06/2024', '12/06/2024', '13/06/2024', '14/06/2024']
+
+        try:
+            result, used, _ = self._update_task_schedule(ENGINE_MATRIX, period=CONF_PERIOD_AUTO, resolution_cutoff='27/05/2024')
+        finally:
+            del AppConfig()[CONF_HOLIDAYS]
+
+        self.assertEqual(result.loc[result[TASK_ID] == '1', TASK_END_DATE].iloc[0], '24/06/2024')
+        self.assertEqual(result.loc[result[TASK_ID] == '2', TASK_START_DATE].iloc[0], '01/07/2024')
+
+        np.testing.assert_allclose(used[self.dates].to_numpy(dtype=float)[:2], [
+            [1, 1, 1, 1, 0, 1, 1, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0, 0.8, 0.8]])
+
+    def test_select_resolution_periods(self):
+        dates = ['20/05/2024', '27/05/2024', '03/06/2024', '01/07/2024', '05/08/2024']
+
+        self.assertEqual(TaskManager.select_resolution_periods(dates, [0, 1, 2, 3, 4]), [[0], [1], [2], [3], [4]])
+        self.assertEqual(
+            TaskManager.select_resolution_periods(dates, [0, 1, 2, 3, 4], '20/05/2024', RESOLUTION_MONTH),
+            [[0], [1], [2], [3], [4]])
+        self.assertEqual(
+            TaskManager.select_resolution_periods(dates, [0, 1, 2, 3, 4], '20/05/2024', RESOLUTION_QUARTER),
+            [[0], [1, 2], [3, 4]])
+
+    def test_invalid_resolution(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_PANDAS, resolution_cutoff='27/05/2024')
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_MATRIX, resolution_cutoff='not a date')
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_MATRIX, resolution_cutoff='27/05/2024', coarse_resolution='week')
+
+if __name__ == '__main__':
+    unittest.main()
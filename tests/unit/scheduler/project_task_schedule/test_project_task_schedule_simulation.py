@@ -0,0 +1,152 @@
+import unittest
+
+from freezegun import freeze_time
+
+import numpy as np
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, TASK_REMAINING_MIN, TASK_REMAINING_MAX, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_schedule_simulation import ScheduleSimulation
+
+class TestScheduleSimulation(unittest.TestCase):
+    """Test the Monte Carlo simulation of the End Date percentiles."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024', '24/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3'],
+            TASK_PRIORITY: [1, 2, 2],
+            TASK_RESOURCES_MAX: [1, '', 1],
+            TASK_RESTRICTION: [None, '1', None],
+            TASK_REMAINING: [8, 10, 0],
+            TASK_REMAINING_MIN: [4, None, None],
+            TASK_REMAINING_MAX: [20, None, None],
+            TASK_START_DATE: [None, None, '06/05/2024'],
+            TASK_END_DATE: [None, None, '06/05/2024'],
+            'Team': ['Team A', 'Team A', 'Team A']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A'],
+            'Goal': ['*'],
+            **{date: [2] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+    def _task_manager(self, tasks_df):
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        return TaskManager(tasks_df, resource_manager)
+
+    @freeze_time("2024-05-13")
+    def _simulate(self, tasks_df = None, spread = 0.2, **options):
+        tasks_df = self.tasks_df.copy() if tasks_df is None else tasks_df
+        simulation = ScheduleSimulation(self._task_manager(tasks_df), spread)
+
+        return simulation.run(self.dates, **options), simulation
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, tasks_df):
+        return self._task_manager(tasks_df).update_task_schedule(self.dates, engine=ENGINE_PANDAS)
+
+    def test_deterministic_samples(self):
+        tasks_df = self.tasks_df.drop(columns=[TASK_REMAINING_MIN, TASK_REMAINING_MAX])
+
+        expected = self._update_task_schedule(tasks_df.copy())
+
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, _ = self._simulate(tasks_df.copy(), spread=0, samples=5, engine=engine)
+
+                self.assertEqual(result[f"{TASK_END_DATE} P50"].tolist(), expected[TASK_END_DATE].tolist())
+                self.assertEqual(result[f"{TASK_END_DATE} P90"].tolist(), expected[TASK_END_DATE].tolist())
+
+    def test_percentiles(self):
+        result, simulation = self._simulate(samples=200, seed=1)
+
+        self.assertEqual(result.shape, (3, 3))
+        self.assertEqual(simulation.end_indexes.shape, (200, 3))
+
+        # Task 1 needs 1 to 4 dates, task 2 starts when it finishes
+        p50 = [self.dates.index(date) for date in result[f"{TASK_END_DATE} P50"][:2]]
+        p90 = [self.dates.index(date) for date in result[f"{TASK_END_DATE} P90"][:2]]
+
+        self.assertTrue(all(low <= high for low, high in zip(p50, p90)))
+        self.assertLess(p50[0], p50[1])
+
+        # Completed tasks keep their End Date
+        self.assertEqual(result[f"{TASK_END_DATE} P90"].iloc[2], '06/05/2024')
+
+    def test_sample_remaining(self):
+        simulation = ScheduleSimulation(self._task_manager(self.tasks_df.copy()))
+
+        samples = simulation.sample_remaining(5000, np.random.default_rng(0))
+
+        self.assertTrue(np.all((samples[:, 0] >= 4) & (samples[:, 0] <= 20)))
+        self.assertTrue(np.all((samples[:, 1] >= 8) & (samples[:, 1] <= 12)))
+        self.assertTrue(np.all(samples[:, 2] == 0))
+
+        # Triangular distribution mean: (min + mode + max) / 3
+        self.assertAlmostEqual(samples[:, 0].mean(), 32 / 3, delta=0.2)
+
+    def test_workers_same_result(self):
+        sequential, _ = self._simulate(samples=20, seed=3)
+        parallel, _ = self._simulate(samples=20, seed=3, workers=2)
+
+        pd.testing.assert_frame_equal(parallel, sequential)
+
+    def test_dataframes_not_updated(self):
+        tasks_df = self.tasks_df.copy()
+
+        self._simulate(tasks_df, samples=5)
+
+        self.assertEqual(tasks_df[TASK_REMAINING].tolist(), [8, 10, 0])
+        self.assertTrue(tasks_df[TASK_END_DATE].iloc[:2].isna().all())
+
+    @freeze_time("2024-05-13")
+    def test_task_manager_not_changed(self):
+        # Future used resources are ignored by the simulation, as update_task_schedule cleans them
+        self.used_resources_df[self.dates] = 2
+        tasks_df = self.tasks_df.drop(columns=[TASK_REMAINING_MIN, TASK_REMAINING_MAX])
+
+        task_manager = self._task_manager(tasks_df.copy())
+        used_resources_df = task_manager.resource_manager.used_resources_manager.used_resources_df.copy()
+        state = (task_manager.date_period_days, task_manager.restriction_dates, task_manager.dependency_graph)
+
+        result = ScheduleSimulation(task_manager, spread=0).run(self.dates, samples=5)
+
+        expected = self._update_task_schedule(tasks_df.copy())
+        self.assertEqual(result[f"{TASK_END_DATE} P50"].tolist(), expected[TASK_END_DATE].tolist())
+
+        pd.testing.assert_frame_equal(task_manager.resource_manager.used_resources_manager.used_resources_df, used_resources_df)
+
+        for before, after in zip(state, (task_manager.date_period_days, task_manager.restriction_dates, task_manager.dependency_graph)):
+            self.assertIs(after, before)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self._simulate(engine=ENGINE_PANDAS)
+
+        with self.assertRaises(ValueError):
+            self._simulate(samples=0)
+
+        with self.assertRaises(ValueError):
+            ScheduleSimulation(self._task_manager(self.tasks_df.copy()), spread=-1)
+
+if __name__ == '__main__':
+    unittest.main()
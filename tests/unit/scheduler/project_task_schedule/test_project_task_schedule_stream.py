@@ -0,0 +1,122 @@
+import itertools
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_END_DATE, TASK_BLOCKED_DAYS,
+    ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_schedule_options import ScheduleOptions
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TODAY, TaskScheduleTestCase
+
+class TestTaskScheduleStream(TaskScheduleTestCase):
+    """Test the streaming of the schedule records per date."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024'],
+            {TASK_PRIORITY: [1, 2, 1, 1], TASK_RESOURCES_MAX: [1, '', '', 0.5], TASK_RESTRICTION: [None, '1', '27/05/2024', None],
+             TASK_REMAINING: [8, 10, 3, 6], TASK_BLOCKED_DAYS: [0, 2, 0, 0], 'Team': ['Team A', 'Team A', 'Team A', 'Team B']},
+            {'Team A': 2, 'Team B': 1},
+            [('Goal1', 'Team A', 0)])
+
+    @freeze_time(TODAY)
+    def _stream(self, count = None, **options):
+        task_manager = self._task_manager()
+        records = list(itertools.islice(task_manager.iter_schedule(self.dates, **options), count))
+
+        return records, task_manager
+
+    def test_same_schedule_as_update(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            for effort_scale in [None, 1000]:
+                with self.subTest(engine=engine, effort_scale=effort_scale):
+                    expected, expected_used, expected_manager = self._update_task_schedule(engine=engine, effort_scale=effort_scale)
+                    records, task_manager = self._stream(engine=engine, effort_scale=effort_scale)
+
+                    pd.testing.assert_frame_equal(task_manager.tasks_df, expected)
+                    pd.testing.assert_frame_equal(
+                        task_manager.resource_manager.used_resources_manager.used_resources_df, expected_used)
+                    self.assertEqual(task_manager.schedule_summary, expected_manager.schedule_summary)
+
+                    # The tasks DataFrame is a reduction of the records
+                    pd.testing.assert_frame_equal(self._task_manager().reduce_schedule(records), expected)
+
+    def test_records(self):
+        records, _ = self._stream(engine=ENGINE_MATRIX)
+
+        self.assertEqual([record["date"] for record in records], self.dates[:len(records)])
+
+        # Task 1: 1 resource x 5 days per date
+        self.assertEqual(records[0]["allocations"]["1"], 5)
+        self.assertEqual(records[0]["remaining"]["1"], 3)
+        self.assertIn("1", records[0]["started"])
+        self.assertIn("1", records[1]["completed"])
+
+        # Task 2 is released when task 1 finishes
+        self.assertIn("2", records[1]["started"])
+
+        # Task 3 is restricted until 27/05/2024
+        self.assertTrue(all("3" not in record["allocations"] for record in records[:2]))
+
+        for task_id, remaining in zip(self.tasks_df[TASK_ID], self.tasks_df[TASK_REMAINING]):
+            allocated = sum(record["allocations"].get(task_id, 0) for record in records)
+            self.assertAlmostEqual(allocated, remaining)
+
+    def test_early_stop(self):
+        records, task_manager = self._stream(count=1, engine=ENGINE_EVENT)
+
+        self.assertEqual(len(records), 1)
+        self.assertTrue(task_manager.tasks_df[TASK_END_DATE].isna().all())
+
+    def test_early_stop_keeps_used_resources(self):
+        self.used_resources_df[self.dates] = 1
+        expected_used = self._task_manager().resource_manager.used_resources_manager.used_resources_df
+
+        records, task_manager = self._stream(count=1, engine=ENGINE_MATRIX)
+
+        self.assertEqual(len(records), 1)
+        pd.testing.assert_frame_equal(task_manager.resource_manager.used_resources_manager.used_resources_df, expected_used)
+
+    def test_options(self):
+        options = ScheduleOptions(engine=ENGINE_EVENT, max_periods=2, effort_scale=1000)
+
+        expected, expected_used, _ = self._update_task_schedule(options=options)
+        records, task_manager = self._stream(options=options)
+
+        pd.testing.assert_frame_equal(task_manager.tasks_df, expected)
+        pd.testing.assert_frame_equal(task_manager.resource_manager.used_resources_manager.used_resources_df, expected_used)
+        self.assertEqual([record["date"] for record in records], self.dates[:2])
+
+        with self.assertRaises(ValueError):
+            self._stream(options=options, engine=ENGINE_MATRIX)
+
+    def test_resolution(self):
+        expected, expected_used, _ = self._update_task_schedule(engine=ENGINE_MATRIX, resolution_cutoff='13/05/2024')
+        records, task_manager = self._stream(engine=ENGINE_MATRIX, resolution_cutoff='13/05/2024')
+
+        pd.testing.assert_frame_equal(task_manager.tasks_df, expected)
+        pd.testing.assert_frame_equal(task_manager.resource_manager.used_resources_manager.used_resources_df, expected_used)
+        pd.testing.assert_frame_equal(self._task_manager().reduce_schedule(records), expected)
+
+        # One record per planning period: the first date, then the May and June periods
+        self.assertEqual([record["dates"] for record in records][:2], [['13/05/2024'], ['20/05/2024', '27/05/2024']])
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self._stream(engine=ENGINE_PANDAS)
+
+        for options in [{"workers": 2}, {"checkpoint_path": "checkpoint.npz"}, {"time_budget": 1}]:
+            with self.subTest(**options):
+                with self.assertRaises(ValueError):
+                    self._stream(engine=ENGINE_MATRIX, **options)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    TASK_ESTIMATED, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from tests.unit.scheduler.project_task_schedule.task_schedule_test_case import TaskScheduleTestCase
+
+class TestTaskScheduleTimeBudget(TaskScheduleTestCase):
+    """Test the time-budgeted ('anytime') mode of the matrix engines: exact dates within the budget, estimated after it."""
+
+    def setUp(self):
+        self.set_inputs(
+            ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024', '24/06/2024', '01/07/2024'],
+            {TASK_PRIORITY: [1, 1, 2, 1], TASK_RESOURCES_MAX: ['', '', '', 0.5], TASK_RESTRICTION: [None, '1', None, None],
+             TASK_REMAINING: [3, 10, 8, 10], 'Team': ['Team A', 'Team A', 'Team A', 'Team B']},
+            {'Team A': 1, 'Team B': 1},
+            [('Goal1', 'Team A', 0)])
+
+    def test_large_budget_same_as_full_run(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                expected, _, _ = self._update_task_schedule(engine)
+                result, _, task_manager = self._update_task_schedule(engine, time_budget=3600)
+                summary = task_manager.schedule_summary
+
+                self.assertFalse(result[TASK_ESTIMATED].any())
+                self.assertEqual(summary["estimated_tasks"], [])
+
+                pd.testing.assert_frame_equal(result.drop(columns=[TASK_ESTIMATED]), expected)
+
+    def test_estimated_dates(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                result, _, task_manager = self._update_task_schedule(engine, time_budget=0)
+                summary = task_manager.schedule_summary
+                tasks = result.set_index(TASK_ID)
+
+                # Only the first date is planned exactly: task 1 finishes on it, task 4 (Team B only) is planned alone
+                self.assertEqual(summary["processed_dates"], 1)
+                self.assertEqual(summary["estimated_tasks"], ['2', '3'])
+                self.assertEqual(tasks[TASK_ESTIMATED].to_dict(), {'1': False, '2': True, '4': False, '3': True})
+
+                self.assertEqual(tasks.loc['1', TASK_END_DATE], '13/05/2024')
+                self.assertEqual(tasks.loc['4', TASK_END_DATE], '03/06/2024')
+
+                # Remaining work only includes the exact allocations (task 3 used the 2 days left by task 1)
+                self.assertEqual(tasks.loc['2', TASK_REMAINING], 10)
+                self.assertEqual(tasks.loc['3', TASK_REMAINING], 6)
+
+                # Team A burns 5 days per date: task 2 first (2 dates), then task 3
+                self.assertEqual(tasks.loc['2', TASK_START_DATE], '20/05/2024')
+                self.assertEqual(tasks.loc['2', TASK_END_DATE], '27/05/2024')
+                self.assertEqual(tasks.loc['3', TASK_START_DATE], '13/05/2024')
+                self.assertEqual(tasks.loc['3', TASK_END_DATE], '10/06/2024')
+
+    def test_invalid_time_budget(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_PANDAS, time_budget=1)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_MATRIX, time_budget=-1)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ENGINE_MATRIX, time_budget=1, workers=1)
+
+if __name__ == '__main__':
+    unittest.main()
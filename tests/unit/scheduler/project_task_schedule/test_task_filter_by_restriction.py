@@ -80,5 +80,50 @@ class TestTaskFilterByRestriction(unittest.TestCase):
         # Task3 has a past date restriction, so all tasks remain
         self.assertEqual(len(filtered_tasks_df), 3)
 
+    def test_restriction_by_id_and_date(self):
+        """Test a task ID restriction does not invalidate the date restrictions of the same tasks, parsed once."""
+        tasks_df = pd.DataFrame({
+            TASK_ID: ['Task1', '2024', 'Task3', 'Task4'],
+            TASK_RESTRICTION: [None, '01/05/2025', 'Task1', '2024'],
+            TASK_REMAINING: [5, 8, 3, 2]
+        })
+
+        restriction_dates = TaskManager.parse_restriction_dates(tasks_df)
+
+        # Task IDs are not dates, even if they look like one
+        self.assertEqual(restriction_dates.iloc[1], pd.Timestamp(2025, 5, 1))
+        self.assertTrue(restriction_dates.iloc[[0, 2, 3]].isna().all())
+
+        for dates in [None, restriction_dates]:
+            with self.subTest(precomputed=dates is not None):
+                filtered_tasks_df = TaskManager.filter_tasks_by_restriction(tasks_df, [], "01/06/2025", dates)
+                self.assertEqual(set(filtered_tasks_df[TASK_ID]), set(['Task1', '2024']))
+
+                # Precomputed dates are aligned with the tasks by index
+                filtered_tasks_df = TaskManager.filter_tasks_by_restriction(tasks_df.iloc[1:], ['Task1'], "01/04/2025", dates)
+                self.assertEqual(set(filtered_tasks_df[TASK_ID]), set(['Task3']))
+
+    def test_restriction_with_dependency_graph(self):
+        """Test the tasks ready on the dependency graph are filtered as with the completed task IDs."""
+        tasks_df = pd.DataFrame({
+            TASK_ID: ['Task1', 'Task2', 'Task3', 'Task4', 'Task5'],
+            TASK_RESTRICTION: [None, 'Task1', '01/05/2025', 'Task9', 'Task2'],
+            TASK_REMAINING: [0, 8, 3, 2, 0]
+        })
+
+        restriction_dates = TaskManager.parse_restriction_dates(tasks_df)
+        graph = TaskManager.build_dependency_graph(tasks_df, restriction_dates)
+        graph.reset(tasks_df[TASK_REMAINING].to_numpy() == 0)
+
+        for current_date in ["01/04/2025", "01/06/2025"]:
+            with self.subTest(current_date=current_date):
+                ready = ~graph.completed & (graph.indegree == 0)
+
+                expected = TaskManager.filter_tasks_by_restriction(tasks_df, graph.completed_ids, current_date)
+                filtered_tasks_df = TaskManager.filter_ready_tasks(
+                    tasks_df, ready, safe_to_datetime(current_date), restriction_dates.to_numpy())
+
+                pd.testing.assert_frame_equal(filtered_tasks_df, expected)
+
 if __name__ == '__main__':
     unittest.main()
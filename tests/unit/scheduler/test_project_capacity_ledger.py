@@ -0,0 +1,163 @@
+import unittest
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import USED_RESOURCE_GOAL
+from scheduler.project_resource_manager import ProjectResourceManager
+
+class TestCapacityLedger(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = ['11/10/2024', '18/10/2024']
+
+        # Team -> Project -> Group hierarchy with wildcard rollups
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team A', 'Team A', 'Team B', '*'],
+            'Project': ['*', 'Project X', 'Project X', '*', '*'],
+            'Group': ['*', '*', 'G1', '*', '*'],
+            'Goal': ['*', '*', '*', '*', '*'],
+            '11/10/2024': [5, 3, 2, 4, 8],
+            '18/10/2024': [6, 4, 2, 5, 8]
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B', 'Team/[C]', '*'],
+            'Project': ['Project X', 'Project Y', 'TOTAL', 'TOTAL'],
+            'Group': ['G1', 'G2', '*', '*'],
+            'Goal': ['Task1', 'Task2', '*', '*'],
+            '11/10/2024': [1, 1, 0, 2],
+            '18/10/2024': [0, 0, 0, 1]
+        })
+
+        self.tasks_df = pd.DataFrame({
+            'ID': ['Task1', 'Task2', 'Task3'],
+            'Team': ['Team A', 'Team B', 'Team/C'],
+            'Project': ['Project X', 'Project Y', 'Project Z'],
+            'Group': ['G1', 'G2', 'G3'],
+            'Goal': ['Task1', 'Task2', 'Task3'],
+            'Priority': [1, 2, 3],
+            'Remaining': [2, 1, 2]
+        })
+
+        self.resource_manager = ProjectResourceManager(self.available_resources_df, self.used_resources_df, self.tasks_df)
+
+    def _mask_remaining(self, current_date, **filters):
+        """ Remaining resources calculated from the DataFrames masks """
+        used_manager = self.resource_manager.used_resources_manager
+        filter_columns = self.resource_manager.responsible_attr_names + [USED_RESOURCE_GOAL]
+
+        remaining = [
+            row[current_date] - used_manager.obtain_used_goal_resources(current_date, **{col: row[col] for col in filter_columns})
+            for _, row in self.resource_manager.available_resources_df[self.resource_manager.goal_resources_mask(**filters)].iterrows()
+        ]
+
+        return max(min(remaining), 0) if remaining else 0
+
+    def _check_remaining(self):
+        for _, task in self.tasks_df.iterrows():
+            for date in self.dates:
+                with self.subTest(task=task['ID'], date=date):
+                    self.assertEqual(self.resource_manager.obtain_goal_resources(date, **task), self._mask_remaining(date, **task))
+
+    def test_remaining_same_as_masks(self):
+        self._check_remaining()
+
+        # Task1 is constrained by the G1 group (2 available, 1 used by the task)
+        self.assertEqual(self.resource_manager.obtain_goal_resources('11/10/2024', **self.tasks_df.iloc[0]), 1)
+
+    def test_updates_walk_wildcard_and_regexp_rows(self):
+        ledger = self.resource_manager.capacity_ledger()
+
+        for _, task in self.tasks_df.iterrows():
+            self.resource_manager.update_goal_resources('11/10/2024', 0.5, **task)
+
+        # The ledger followed the updates: it was not built again
+        self.assertIs(self.resource_manager.capacity_ledger(), ledger)
+        self._check_remaining()
+
+        used = self.resource_manager.used_resources_manager.used_resources_df['11/10/2024']
+
+        # The regexp row 'Team/[C]' accumulates Task3, the '*' row all the tasks
+        self.assertEqual(used.iloc[2], 0.5)
+        self.assertEqual(used.iloc[3], 3.5)
+
+    def test_batch_updates(self):
+        ledger = self.resource_manager.capacity_ledger()
+        sequential = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), self.tasks_df)
+
+        tasks = [task for _, task in self.tasks_df.iterrows()]
+
+        for task in tasks:
+            sequential.update_goal_resources('11/10/2024', 0.5, **task)
+
+        self.resource_manager.update_goal_resources_batch('11/10/2024', tasks, [0.5] * len(tasks))
+
+        self.assertIs(self.resource_manager.capacity_ledger(), ledger)
+        self._check_remaining()
+        pd.testing.assert_frame_equal(
+            self.resource_manager.used_resources_manager.used_resources_df, sequential.used_resources_manager.used_resources_df)
+
+    def test_rebuilt_when_used_resources_changed(self):
+        ledger = self.resource_manager.capacity_ledger()
+
+        self.resource_manager.used_resources_manager.update_used_resources('18/10/2024', 3, Team='Team A')
+
+        self.assertIsNot(self.resource_manager.capacity_ledger(), ledger)
+        self._check_remaining()
+
+    def test_updated_after_dataframe_changes(self):
+        ledger = self.resource_manager.capacity_ledger()
+        task = self.tasks_df.iloc[0]
+
+        # The '*' and 'TOTAL' rows use 5.5 + 1 of the 8 global resources: 1.5 left before the update
+        used_resources_df = self.resource_manager.used_resources_manager.used_resources_df
+        used_resources_df.loc[(used_resources_df['Team'] == '*') & (used_resources_df['Project'] == '*'), '18/10/2024'] = 5.5
+
+        self.resource_manager.update_goal_resources('18/10/2024', 0.5, **task)
+
+        self.assertIsNot(self.resource_manager.capacity_ledger(), ledger)
+        self.assertEqual(self.resource_manager.obtain_goal_resources('18/10/2024', **task), 0.5)
+        self._check_remaining()
+
+    def test_batch_updated_after_dataframe_changes(self):
+        task = self.tasks_df.iloc[0]
+        self.resource_manager.capacity_ledger()
+
+        used_resources_df = self.resource_manager.used_resources_manager.used_resources_df
+        used_resources_df.loc[(used_resources_df['Team'] == '*') & (used_resources_df['Project'] == '*'), '18/10/2024'] = 5.5
+
+        self.resource_manager.update_goal_resources_batch('18/10/2024', [task], [0.5])
+
+        self.assertEqual(self.resource_manager.obtain_goal_resources('18/10/2024', **task), 0.5)
+        self._check_remaining()
+
+    def test_remaining_matrix(self):
+        ledger = self.resource_manager.capacity_ledger()
+        task = self.tasks_df.iloc[0]
+
+        rows = ledger.responsibility_rows(**task)
+
+        # G1 (2 - 1), Project X (3 - 1), the global rows (8 - 2 - 4) and Team A (5 - 1) constrain Task1
+        self.assertEqual(sorted(ledger.remaining_matrix[rows, 0].tolist()), [1, 2, 2, 4])
+        self.assertIs(ledger.responsibility_rows(**task), rows)
+
+        self.resource_manager.update_goal_resources('11/10/2024', 1, **task)
+
+        # Updated in place: the two global used rows ('*' and 'TOTAL') are increased
+        self.assertEqual(sorted(ledger.remaining_matrix[rows, 0].tolist()), [0, 0, 1, 3])
+        self.assertEqual(self.resource_manager.obtain_goal_resources('11/10/2024', **task), 0)
+
+    def test_invalid_queries(self):
+        with self.assertRaises(ValueError):
+            self.resource_manager.obtain_goal_resources('11/10/2024', Team='Team A')
+
+        with self.assertRaises(ValueError):
+            self.resource_manager.obtain_goal_resources('Team', **self.tasks_df.iloc[0])
+
+if __name__ == '__main__':
+    unittest.main()
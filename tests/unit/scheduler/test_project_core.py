@@ -0,0 +1,140 @@
+import subprocess
+import sys
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    TASK_BLOCKED_DAYS, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_core import CoreScheduler, TaskRecord, CapacityRecord
+from scheduler.project_core_dataframes import core_from_dataframes, core_to_dataframes
+
+class TestCoreScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024', '17/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4', '5'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4', 'Goal5'],
+            TASK_PRIORITY: [1, 2, 1, 3, 2],
+            TASK_RESOURCES_MAX: [0.5, '', '', 1, ''],
+            TASK_RESTRICTION: [None, '1', None, '27/05/2024', None],
+            TASK_REMAINING: [5, 10, 12.5, 4, 0],
+            TASK_START_DATE: [None, None, None, None, '06/05/2024'],
+            TASK_END_DATE: [None, None, None, None, '06/05/2024'],
+            TASK_BLOCKED_DAYS: [0, 2, 0, 0, 0],
+            'Team': ['Team A', 'Team A', 'Team B', 'Team B', 'Team A'],
+            'Project': ['P1', '*', 'P2', 'P1', 'P1']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B', 'Team B'],
+            'Project': ['*', '*', 'P2'],
+            'Goal': ['*', '*', '*'],
+            **{date: [1, 2, 1] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            'Project': ['P1'],
+            **{date: [0.5] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-20")
+    def _update_task_schedule(self, engine, **options):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, engine=engine, **options)
+
+        return result.sort_index(), resource_manager.used_resources_manager.used_resources_df, task_manager.schedule_summary
+
+    @freeze_time("2024-05-20")
+    def _update_core_schedule(self, engine, **options):
+        core = core_from_dataframes(self.tasks_df.copy(), self.available_resources_df.copy(), self.used_resources_df.copy())
+        core.update_task_schedule(self.dates, engine=engine, **options)
+
+        tasks_df, used_resources_df = core_to_dataframes(core, self.tasks_df, self.used_resources_df)
+
+        return tasks_df, used_resources_df, core.schedule_summary
+
+    def test_same_as_task_manager(self):
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            for effort_scale in [None, 1000]:
+                with self.subTest(engine=engine, effort_scale=effort_scale):
+                    expected, expected_used, expected_summary = self._update_task_schedule(engine, effort_scale=effort_scale)
+                    result, used, summary = self._update_core_schedule(engine, effort_scale=effort_scale)
+
+                    columns = [TASK_ID, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE]
+                    pd.testing.assert_frame_equal(result[columns].astype(object), expected[columns].astype(object))
+
+                    pd.testing.assert_frame_equal(used[list(expected_used.columns)], expected_used.reset_index(drop=True), check_dtype=False)
+
+                    self.assertEqual(summary, expected_summary)
+
+    @freeze_time("2024-05-13")
+    def test_records(self):
+        dates = ['13/05/2024', '20/05/2024', '27/05/2024']
+
+        tasks = [
+            TaskRecord('T1', 'Goal1', 1, 8, {'Team': 'Team A'}),
+            TaskRecord('T2', 'Goal2', 2, 2, {'Team': 'Team A'}, restriction='T1', blocked_days=1),
+        ]
+        available = [CapacityRecord({'Team': 'Team A'}, '*', {date: 1 for date in dates})]
+        used = [CapacityRecord({'Team': 'Team A'}, 'Goal1', {date: 0 for date in dates})]
+
+        core = CoreScheduler(tasks, available, used)
+        result = core.update_task_schedule()
+
+        self.assertEqual([task.task_id for task in result], ['T1', 'T2'])
+        self.assertEqual((tasks[0].start_date, tasks[0].end_date), ('13/05/2024', '20/05/2024'))
+
+        # T2 uses the 2 days left by T1 and its blocked day is added to the End Date
+        self.assertEqual(tasks[1].remaining, 0)
+        self.assertEqual(str(tasks[1].end_date), '2024-05-21')
+
+        # Rows added for the tasks and the accumulated row
+        self.assertEqual([record.goal for record in core.used], ['Goal1', 'Goal2', '*'])
+        self.assertEqual(list(core.used[2].values.values()), [1, 1, 0])
+
+    def test_pandas_not_imported(self):
+        code = "import sys, scheduler.project_core; sys.exit('pandas' in sys.modules)"
+
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
+
+    def test_invalid_inputs(self):
+        core = core_from_dataframes(self.tasks_df.copy(), self.available_resources_df.copy(), self.used_resources_df.copy())
+
+        with self.assertRaises(ValueError):
+            core.update_task_schedule(self.dates, engine=ENGINE_PANDAS)
+
+        with self.assertRaises(ValueError):
+            core.update_task_schedule(['01/01/2030'])
+
+        with self.assertRaises(ValueError):
+            core_from_dataframes(
+                self.tasks_df.assign(**{TASK_ID: ['1', '1', '3', '4', '5']}), self.available_resources_df.copy(), self.used_resources_df.copy())
+
+        with self.assertRaises(ValueError):
+            core_from_dataframes(
+                self.tasks_df.copy(), self.available_resources_df.copy(), self.used_resources_df.drop(columns=[self.dates[0]]))
+
+        with self.assertRaises(ValueError):
+            CoreScheduler([], [], [], period_days_available=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import multiprocessing
+import threading
+import time
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_distributed import ScheduleCoordinator, run_schedule_worker
+
+class TestScheduleCoordinator(unittest.TestCase):
+    """Test the distributed scheduling of independent partitions with local worker processes."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024', '10/06/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2', '3', '4', '5'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3', 'Goal4', 'Goal5'],
+            TASK_PRIORITY: [1, 2, 1, 2, 1],
+            TASK_RESOURCES_MAX: [1, '', '', 1, ''],
+            TASK_RESTRICTION: [None, '1', None, None, None],
+            TASK_REMAINING: [8, 10, 12, 6, 4],
+            TASK_START_DATE: [None] * 5,
+            TASK_END_DATE: [None] * 5,
+            'Team': ['Team A', 'Team A', 'Team B', 'Team B', 'Team C']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B', 'Team C'],
+            'Goal': ['*', '*', '*'],
+            **{date: [2, 1.5, 1] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1', 'Goal3'],
+            'Team': ['Team A', 'Team B'],
+            **{date: [0, 0.5] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, **options):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        result = task_manager.update_task_schedule(self.dates, **options)
+
+        return result, resource_manager.used_resources_manager.used_resources_df
+
+    def test_same_schedule_as_single_engine(self):
+        with ScheduleCoordinator(authkey=b'test') as coordinator:
+            coordinator.start_local_workers(2)
+
+            for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+                with self.subTest(engine=engine):
+                    expected, expected_used = self._update_task_schedule(engine=engine)
+                    result, used = self._update_task_schedule(engine=engine, coordinator=coordinator)
+
+                    pd.testing.assert_frame_equal(result, expected)
+                    pd.testing.assert_frame_equal(used, expected_used)
+
+    def test_stale_results_discarded(self):
+        with ScheduleCoordinator(authkey=b'test') as coordinator:
+            # Results left by a previous failed run
+            coordinator.results.put(("previous-run", 0, "Partition failed"))
+            coordinator.results.put(("previous-run", 1, {"used": None}))
+
+            coordinator.start_local_workers(1)
+
+            expected, expected_used = self._update_task_schedule(engine=ENGINE_MATRIX)
+            result, used = self._update_task_schedule(engine=ENGINE_MATRIX, coordinator=coordinator)
+
+            pd.testing.assert_frame_equal(result, expected)
+            pd.testing.assert_frame_equal(used, expected_used)
+
+    def test_queues_drained_after_failure(self):
+        with ScheduleCoordinator(timeout=0.5) as coordinator:
+            with self.assertRaises(TimeoutError):
+                self._update_task_schedule(engine=ENGINE_MATRIX, coordinator=coordinator)
+
+            self.assertEqual(coordinator.jobs.qsize(), 0)
+            self.assertEqual(coordinator.results.qsize(), 0)
+
+    def test_shutdown_with_remote_worker(self):
+        coordinator = ScheduleCoordinator(authkey=b'test')
+        coordinator.start()
+
+        # A worker without stop signal, as started from another machine, waiting for jobs before the local one
+        remote_worker = multiprocessing.Process(target=run_schedule_worker, args=(coordinator.address, b'test'), daemon=True)
+        remote_worker.start()
+        time.sleep(1)
+
+        coordinator.start_local_workers(1)
+        local_worker = coordinator.local_workers[0]
+
+        shutdown = threading.Thread(target=coordinator.shutdown, daemon=True)
+        shutdown.start()
+        shutdown.join(30)
+
+        self.assertFalse(shutdown.is_alive())
+        self.assertFalse(local_worker.is_alive())
+
+        # The remote worker stops when the connection is closed
+        remote_worker.join(10)
+
+        if remote_worker.is_alive():
+            remote_worker.terminate()
+
+    def test_no_workers_timeout(self):
+        with ScheduleCoordinator(timeout=0.5) as coordinator:
+            with self.assertRaises(TimeoutError):
+                self._update_task_schedule(engine=ENGINE_MATRIX, coordinator=coordinator)
+
+    def test_invalid_options(self):
+        coordinator = ScheduleCoordinator()
+
+        with self.assertRaises(ValueError):
+            coordinator.start_local_workers(1)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_MATRIX, coordinator=coordinator)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(engine=ENGINE_PANDAS, coordinator=coordinator)
+
+        with self.assertRaises(ValueError):
+            ScheduleCoordinator(timeout=0)
+
+if __name__ == '__main__':
+    unittest.main()
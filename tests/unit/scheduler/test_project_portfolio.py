@@ -0,0 +1,138 @@
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    ENGINE_PANDAS, ENGINE_MATRIX, PORTFOLIO_PROJECT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_portfolio import PortfolioScheduler
+
+class TestPortfolioScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024', '03/06/2024']
+
+        # Both projects use the same IDs and Goals, and share the Team A pool
+        self.projects = {
+            "Alpha": self._project(['Team A', 'Team A'], [5, 5], [1, 1]),
+            "Beta": self._project(['Team A', 'Team B'], [5, 10], [2, 2], [None, None]),
+        }
+
+    def _project(self, teams, remaining, priorities, restrictions = (None, 'T1')):
+        tasks_df = pd.DataFrame({
+            TASK_ID: ['T1', 'T2'],
+            TASK_GOAL: ['Goal1', 'Goal2'],
+            TASK_PRIORITY: priorities,
+            TASK_RESOURCES_MAX: ['', ''],
+            TASK_RESTRICTION: list(restrictions),
+            TASK_REMAINING: remaining,
+            TASK_START_DATE: [None, None],
+            TASK_END_DATE: [None, None],
+            'Team': teams
+        })
+
+        available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B'],
+            'Goal': ['*', '*'],
+            **{date: [1, 1] for date in self.dates}
+        })
+
+        used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': [teams[0]],
+            **{date: [0] for date in self.dates}
+        })
+
+        return tasks_df, available_resources_df, used_resources_df
+
+    def _copy_projects(self):
+        return {name: tuple(frame.copy() for frame in frames) for name, frames in self.projects.items()}
+
+    @freeze_time("2024-05-13")
+    def _run(self, engine = ENGINE_PANDAS):
+        portfolio = PortfolioScheduler(self._copy_projects(), engine=engine)
+        return portfolio.run(), portfolio
+
+    @freeze_time("2024-05-13")
+    def _run_alone(self, name):
+        tasks_df, available_resources_df, used_resources_df = (frame.copy() for frame in self.projects[name])
+        resource_manager = ProjectResourceManager(available_resources_df, used_resources_df, tasks_df)
+
+        return TaskManager(tasks_df, resource_manager).update_task_schedule(self.dates).sort_index()
+
+    def test_merge(self):
+        tasks_df, available_resources_df, used_resources_df = PortfolioScheduler(self._copy_projects()).merge()
+
+        self.assertEqual(tasks_df[TASK_ID].tolist(), ['Alpha::T1', 'Alpha::T2', 'Beta::T1', 'Beta::T2'])
+        self.assertEqual(tasks_df[TASK_RESTRICTION].tolist(), [None, 'Alpha::T1', None, None])
+        self.assertEqual(tasks_df[PORTFOLIO_PROJECT].tolist(), ['Alpha', 'Alpha', 'Beta', 'Beta'])
+
+        # The pools are taken once
+        self.assertEqual(available_resources_df['Team'].tolist(), ['Team A', 'Team B'])
+        self.assertEqual(used_resources_df[TASK_GOAL].tolist(), ['Alpha::Goal1', 'Beta::Goal1'])
+
+    def test_shared_pool(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX]:
+            with self.subTest(engine=engine):
+                results, _ = self._run(engine)
+
+                alpha_tasks, alpha_used = results["Alpha"]
+                beta_tasks, beta_used = results["Beta"]
+
+                # Alpha (priority 1) takes Team A first: Beta T1 waits for it
+                self.assertEqual(alpha_tasks[TASK_END_DATE].tolist(), ['13/05/2024', '20/05/2024'])
+                self.assertEqual(beta_tasks[TASK_START_DATE].tolist(), ['27/05/2024', '13/05/2024'])
+                self.assertEqual(beta_tasks[TASK_END_DATE].tolist(), ['27/05/2024', '20/05/2024'])
+
+                # Original IDs, Goals and restrictions
+                self.assertEqual(beta_tasks[TASK_ID].tolist(), ['T1', 'T2'])
+                self.assertEqual(alpha_tasks[TASK_RESTRICTION].tolist(), [None, 'T1'])
+                self.assertNotIn(PORTFOLIO_PROJECT, beta_tasks.columns)
+
+                # Each project gets its Goals rows, and the accumulated rows of the whole portfolio
+                self.assertEqual(list(alpha_used.columns), list(self.projects["Alpha"][2].columns))
+
+                alpha_totals = alpha_used[alpha_used[TASK_GOAL] == '*'].set_index('Team')
+                beta_totals = beta_used[beta_used[TASK_GOAL] == '*'].set_index('Team')
+
+                self.assertEqual(alpha_totals.loc['Team A', self.dates].tolist(), [1, 1, 1, 0])
+                pd.testing.assert_frame_equal(alpha_totals, beta_totals)
+
+                self.assertEqual(beta_used.loc[beta_used[TASK_GOAL] != '*', TASK_GOAL].tolist(), ['Goal1', 'Goal2'])
+
+    def test_single_project_same_as_schedule(self):
+        self.projects = {"Alpha": self.projects["Alpha"]}
+
+        results, _ = self._run()
+
+        expected = self._run_alone("Alpha")
+
+        pd.testing.assert_frame_equal(results["Alpha"][0][expected.columns], expected)
+
+    def test_invalid_projects(self):
+        with self.assertRaises(ValueError):
+            PortfolioScheduler({})
+
+        with self.assertRaises(ValueError):
+            PortfolioScheduler({"Al::pha": self.projects["Alpha"]})
+
+        tasks_df, available_resources_df, used_resources_df = self.projects["Beta"]
+
+        with self.assertRaises(ValueError):
+            PortfolioScheduler({
+                "Alpha": self.projects["Alpha"], 
+                "Beta": (tasks_df, available_resources_df.drop(columns=[self.dates[-1]]), used_resources_df)
+            })
+
+if __name__ == '__main__':
+    unittest.main()
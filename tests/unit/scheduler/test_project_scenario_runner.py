@@ -0,0 +1,109 @@
+import unittest
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+
+from utils.util_constants import CONF_DAYFIRST, CONF_HOLIDAYS
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING, TASK_START_DATE, TASK_END_DATE,
+    SCENARIO_BASELINE, ENGINE_MATRIX
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_scenario_runner import ScenarioRunner
+
+class TestScenarioRunner(unittest.TestCase):
+
+    def setUp(self):
+        # Future dates: no date is discarded as past
+        self.dates = ['06/05/2030', '13/05/2030', '20/05/2030', '27/05/2030', '03/06/2030']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['T1', 'T2', 'T3'],
+            TASK_GOAL: ['Goal1', 'Goal2', 'Goal3'],
+            TASK_PRIORITY: [1, 2, 1],
+            TASK_RESOURCES_MAX: ['', '', ''],
+            TASK_RESTRICTION: [None, None, None],
+            TASK_REMAINING: [10, 10, 20],
+            TASK_START_DATE: [None] * 3,
+            TASK_END_DATE: [None] * 3,
+            'Team': ['Team A', 'Team A', 'Team B']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A', 'Team B'],
+            'Goal': ['*', '*'],
+            **{date: [1, 1] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+        self.runner = ScenarioRunner(self.tasks_df, self.available_resources_df, self.used_resources_df)
+
+    def test_baseline_same_as_schedule(self):
+        comparison = self.runner.run([])
+
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        expected = TaskManager(tasks_df, resource_manager).update_task_schedule(self.dates)
+
+        self.assertEqual(comparison[SCENARIO_BASELINE].tolist(), expected[TASK_END_DATE].sort_index().tolist())
+        self.assertEqual(comparison[TASK_ID].tolist(), ['T1', 'T2', 'T3'])
+
+    def test_scenarios(self):
+        comparison = self.runner.run([
+            {"name": "Team B +1", "capacity": [{"Team": "Team B", "delta": 1}]},
+            {"name": "T2 first", "priority": {"T2": 0}},
+            {"name": "Team A +1 from 13/05", "capacity": [{"Team": "Team A", "delta": 1, "from": "13/05/2030"}], "engine": ENGINE_MATRIX},
+        ])
+
+        self.assertEqual(comparison[SCENARIO_BASELINE].tolist(), ['13/05/2030', '27/05/2030', '27/05/2030'])
+        self.assertEqual(comparison["Team B +1"].tolist(), ['13/05/2030', '27/05/2030', '13/05/2030'])
+        self.assertEqual(comparison["T2 first"].tolist(), ['27/05/2030', '13/05/2030', '27/05/2030'])
+        self.assertEqual(comparison["Team A +1 from 13/05"].tolist(), ['13/05/2030', '20/05/2030', '27/05/2030'])
+
+        # The baseline DataFrames are not changed
+        self.assertEqual(self.tasks_df[TASK_PRIORITY].tolist(), [1, 2, 1])
+        self.assertEqual(self.available_resources_df[self.dates[0]].tolist(), [1, 1])
+
+    def test_holidays_and_period(self):
+        AppConfig()[CONF_HOLIDAYS] = []
+
+        comparison = self.runner.run([
+            {"name": "Holidays", "period": "auto", "holidays": ['07/05/2030', '08/05/2030', '09/05/2030', '10/05/2030']}
+        ])
+
+        # Only 1 working day on the first week: T1 needs 1 + 5 + 4 days
+        self.assertEqual(comparison["Holidays"].iloc[0], '20/05/2030')
+
+        # The configuration is restored
+        self.assertEqual(AppConfig()[CONF_HOLIDAYS], [])
+        del AppConfig()[CONF_HOLIDAYS]
+
+    def test_workers_same_result(self):
+        scenarios = [{"name": "Team B +1", "capacity": [{"Team": "Team B", "delta": 1}]}, {"name": "T2 first", "priority": {"T2": 0}}]
+
+        pd.testing.assert_frame_equal(self.runner.run(scenarios, workers=2), self.runner.run(scenarios))
+
+    def test_invalid_scenarios(self):
+        with self.assertRaises(ValueError):
+            self.runner.run([{"name": "Unknown task", "priority": {"T9": 1}}])
+
+        with self.assertRaises(ValueError):
+            self.runner.run([{"name": "Unknown team", "capacity": [{"Team": "Team C", "delta": 1}]}])
+
+        with self.assertRaises(ValueError):
+            self.runner.run([{"name": SCENARIO_BASELINE}])
+
+        with self.assertRaises(ValueError):
+            self.runner.run([], workers=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import unittest
+
+from freezegun import freeze_time
+
+import pandas as pd
+
+from utils.app_config import AppConfig
+from utils.util_constants import CONF_DAYFIRST
+AppConfig()[CONF_DAYFIRST] = True
+
+from scheduler.project_scheduler_constants import (
+    TASK_ID, TASK_GOAL, TASK_PRIORITY, TASK_RESOURCES_MAX, TASK_RESTRICTION, TASK_REMAINING,
+    TASK_START_DATE, TASK_END_DATE, ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT
+)
+from scheduler.project_resource_manager import ProjectResourceManager
+from scheduler.project_task_scheduler import TaskManager
+from scheduler.project_schedule_state import ScheduleState
+from scheduler.project_schedule_options import ScheduleOptions, MATRIX_ENGINE_OPTIONS
+
+class TestScheduleOptions(unittest.TestCase):
+    """Test the checks of the update_task_schedule options and of their combinations."""
+
+    # A valid value of each matrix engine option
+    OPTION_VALUES = {
+        "effort_scale": 1000,
+        "resolution_cutoff": "27/05/2024",
+        "workers": 2,
+        "coordinator": object(),
+        "previous_state": ScheduleState(),
+        "checkpoint_path": "schedule.npz",
+        "time_budget": 1.5
+    }
+
+    def test_valid_options(self):
+        ScheduleOptions().validate()
+
+        for engine in [ENGINE_MATRIX, ENGINE_EVENT]:
+            for option, value in self.OPTION_VALUES.items():
+                with self.subTest(engine=engine, option=option):
+                    ScheduleOptions(engine=engine, **{option: value}).validate()
+
+        ScheduleOptions(engine=ENGINE_MATRIX, effort_scale=1000, resolution_cutoff="27/05/2024", workers=2,
+                        previous_state=ScheduleState()).validate()
+
+    def test_matrix_engine_options(self):
+        self.assertEqual(set(MATRIX_ENGINE_OPTIONS), set(self.OPTION_VALUES))
+
+        for option, value in self.OPTION_VALUES.items():
+            with self.subTest(option=option):
+                with self.assertRaises(ValueError):
+                    ScheduleOptions(engine=ENGINE_PANDAS, **{option: value}).validate()
+
+    def test_single_engine_options(self):
+        conflicts = [
+            ("checkpoint_path", "workers"), ("checkpoint_path", "coordinator"), ("checkpoint_path", "previous_state"),
+            ("time_budget", "workers"), ("time_budget", "coordinator"), ("time_budget", "previous_state"), 
+            ("time_budget", "checkpoint_path")
+        ]
+
+        for option, other_option in conflicts:
+            with self.subTest(option=option, other_option=other_option):
+                options = ScheduleOptions(engine=ENGINE_MATRIX, **{
+                    option: self.OPTION_VALUES[option], other_option: self.OPTION_VALUES[other_option]})
+
+                with self.assertRaises(ValueError):
+                    options.validate()
+
+    def test_invalid_values(self):
+        invalid_options = [
+            dict(engine="numpy"),
+            dict(engine=ENGINE_MATRIX, effort_scale=0),
+            dict(engine=ENGINE_MATRIX, workers=0),
+            dict(engine=ENGINE_MATRIX, checkpoint_path="schedule.npz", checkpoint_interval=0),
+            dict(engine=ENGINE_MATRIX, time_budget=-1),
+            dict(engine=ENGINE_MATRIX, time_budget=True)
+        ]
+
+        for values in invalid_options:
+            with self.subTest(**{key: str(value) for key, value in values.items()}):
+                with self.assertRaises(ValueError):
+                    ScheduleOptions(**values).validate()
+
+        # The checkpoint interval is only checked with checkpoints
+        ScheduleOptions(engine=ENGINE_MATRIX, checkpoint_interval=0).validate()
+
+    def test_partitioned(self):
+        self.assertFalse(ScheduleOptions(engine=ENGINE_MATRIX).partitioned)
+        self.assertTrue(ScheduleOptions(engine=ENGINE_MATRIX, workers=2).partitioned)
+        self.assertTrue(ScheduleOptions(engine=ENGINE_MATRIX, previous_state=ScheduleState()).partitioned)
+        self.assertTrue(ScheduleOptions(engine=ENGINE_EVENT).event_driven)
+
+class TestUpdateTaskScheduleOptions(unittest.TestCase):
+    """Test update_task_schedule with a ScheduleOptions or keyword options."""
+
+    def setUp(self):
+        self.dates = ['13/05/2024', '20/05/2024', '27/05/2024']
+
+        self.tasks_df = pd.DataFrame({
+            TASK_ID: ['1', '2'],
+            TASK_GOAL: ['Goal1', 'Goal2'],
+            TASK_PRIORITY: [1, 2],
+            TASK_RESOURCES_MAX: [1, ''],
+            TASK_RESTRICTION: [None, '1'],
+            TASK_REMAINING: [6, 4],
+            TASK_START_DATE: [None, None],
+            TASK_END_DATE: [None, None],
+            'Team': ['Team A', 'Team A']
+        })
+
+        self.available_resources_df = pd.DataFrame({
+            'Team': ['Team A'],
+            'Goal': ['*'],
+            **{date: [2] for date in self.dates}
+        })
+
+        self.used_resources_df = pd.DataFrame({
+            'Goal': ['Goal1'],
+            'Team': ['Team A'],
+            **{date: [0] for date in self.dates}
+        })
+
+    @freeze_time("2024-05-13")
+    def _update_task_schedule(self, *args, **options):
+        tasks_df = self.tasks_df.copy()
+        resource_manager = ProjectResourceManager(self.available_resources_df.copy(), self.used_resources_df.copy(), tasks_df)
+        task_manager = TaskManager(tasks_df, resource_manager)
+
+        return task_manager.update_task_schedule(self.dates, *args, **options)
+
+    def test_options_object(self):
+        for engine in [ENGINE_PANDAS, ENGINE_MATRIX, ENGINE_EVENT]:
+            with self.subTest(engine=engine):
+                expected = self._update_task_schedule(engine=engine, max_periods=2)
+                result = self._update_task_schedule(ScheduleOptions(engine=engine, max_periods=2))
+
+                pd.testing.assert_frame_equal(result, expected)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ScheduleOptions(engine=ENGINE_MATRIX), effort_scale=1000)
+
+        with self.assertRaises(ValueError):
+            self._update_task_schedule(ScheduleOptions(engine=ENGINE_MATRIX, workers=2, checkpoint_path="schedule.npz"))
+
+        with self.assertRaises(TypeError):
+            self._update_task_schedule(engine=ENGINE_MATRIX, unknown_option=1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -148,5 +148,82 @@ class TestProjectUsedResourceManager(unittest.TestCase):
         expected = self.used_resources_data['18/10/2024'].fillna(0).copy()  # Debería ser igual ya que no hay coincidencias
         pd.testing.assert_series_equal(self.manager.used_resources_df['18/10/2024'], expected)
 
+    def test_match_index_reused(self):
+        """ The rows of a filter are calculated once and reused in the following updates """
+        self.manager.update_used_resources('18/10/2024', 1, Team='Team/B', Project='Project Y')
+        self.manager.update_used_resources('25/10/2024', 1, Team='Team/B', Project='Project Y')
+
+        self.assertEqual(list(self.manager.match_index), [(('Team', 'Team/B'), ('Project', 'Project Y'))])
+        self.assertEqual(self.manager.used_resources_df['Task'][self.manager.match_index_mask(Team='Team/B', Project='Project Y')].tolist(), ['B', 'C'])
+        self.assertEqual(self.manager.used_resources_df['25/10/2024'].tolist(), [2, 3, 5, 5, 4, 1])
+
+    def test_match_index_refreshed_when_rows_added(self):
+        """ Rows added to the used resources are matched by the filters already indexed """
+        self.manager.update_used_resources('18/10/2024', 1, Team='Team A')
+
+        self.manager.used_resources_df.loc[len(self.manager.used_resources_df)] = ['E', 'Team A', 'Project Z', 1, 0, 0, 0, 0]
+        self.manager.update_used_resources('18/10/2024', 1, Team='Team A')
+
+        self.assertEqual(self.manager.used_resources_df['18/10/2024'].tolist(), [4, 2, 0, 3, 5, 2, 1])
+
+    def test_dense_storage(self):
+        """ Updates are written in the date matrix, the DataFrame is built when it is accessed """
+        self.manager.update_used_resources('25/10/2024', 1.5, Task='D')
+
+        self.assertEqual(self.manager.used_values[self.manager.row_positions[3], self.manager.date_positions['25/10/2024']], 6.5)
+        self.assertEqual(list(self.manager.info_df.columns), ['Task', 'Team', 'Project', 'Priority'])
+
+        used_resources_df = self.manager.used_resources_df
+
+        self.assertEqual(list(used_resources_df.columns), list(self.used_resources_data.columns))
+        # The '*' Task row accumulates D
+        self.assertEqual(used_resources_df['25/10/2024'].tolist(), [2, 2, 4, 6.5, 5.5, 1])
+
+        # Whole values keep the integer columns
+        self.assertEqual(used_resources_df['1/11/2024'].dtype, self.used_resources_data['1/11/2024'].dtype)
+
+    def test_dataframe_changes_loaded(self):
+        """ Changes made to the DataFrame are loaded before the next update """
+        self.manager.used_resources_df.loc[0, '25/10/2024'] = 10
+
+        self.manager.update_used_resources('25/10/2024', 1, Task='A')
+
+        self.assertEqual(self.manager.used_resources_df['25/10/2024'].tolist(), [11, 2, 4, 5, 5, 1])
+
+    def test_unchanged_dataframe_not_loaded(self):
+        """ Reading the DataFrame keeps the loaded values and the match index if it was not changed """
+        self.manager.update_used_resources('25/10/2024', 1, Task='A')
+
+        match_index = self.manager.match_index
+        self.assertEqual(self.manager.used_resources_df['25/10/2024'].tolist(), [3, 2, 4, 5, 5, 1])
+        values_version = self.manager.values_version
+
+        self.manager.update_used_resources('25/10/2024', 1, Task='A')
+
+        self.assertIs(self.manager.match_index, match_index)
+        self.assertEqual(self.manager.values_version, values_version + 1)
+        self.assertEqual(self.manager.used_resources_df['25/10/2024'].tolist(), [4, 2, 4, 5, 6, 1])
+
+    def test_update_batch_same_as_sequential(self):
+        """ A batch gives the same result as the updates one by one, also when several usages match the same rows """
+        filters_list = [{'Team': 'Team A', 'Project': 'Project X'}, {'Team': 'Team/B'}, {'Task': 'A'}]
+        amounts = [0.1, 0.2, 0.3]
+
+        sequential = ProjectUsedResourceManager(self.used_resources_data)
+
+        for filters, amount in zip(filters_list, amounts):
+            sequential.update_used_resources('18/10/2024', amount, **filters)
+
+        self.manager.update_used_resources_batch('18/10/2024', filters_list, amounts)
+
+        pd.testing.assert_frame_equal(self.manager.used_resources_df, sequential.used_resources_df)
+
+        with self.assertRaises(ValueError):
+            self.manager.update_used_resources_batch('18/10/2024', filters_list, amounts[:2])
+
+    def test_match_index_invalid_column(self):
+        with self.assertRaises(ValueError):
+            self.manager.update_used_resources('18/10/2024', 1, Area='Area 1')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -38,4 +38,17 @@ def safe_to_datetime(val, errors='raise', dayfirst=DAY_FIRST):
         elif errors == 'ignore':
             return val
         else:
-            raise ValueError(f"Invalid value for 'errors' parameter: {errors}")
\ No newline at end of file
+            raise ValueError(f"Invalid value for 'errors' parameter: {errors}")
+
+def safe_to_datetime_series(values, dayfirst=DAY_FIRST):
+    """
+    Convert a list of values to datetimes in one vectorized call. Each value is parsed independently, as safe_to_datetime does.
+
+    Args:
+        values (list): Values to convert (strings, dates or datetimes).
+        dayfirst (bool): Parse dates with the day first.
+
+    Returns:
+        pd.Series: The converted values, NaT for the values that are not valid dates.
+    """
+    return pd.to_datetime(pd.Series(values, dtype=object), format='mixed', dayfirst=dayfirst, errors='coerce')